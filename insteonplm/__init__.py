@@ -5,18 +5,30 @@ Insteon Powerline modems like the 2413U and 2412S.
 """
 import asyncio
 import binascii
+import bisect
 from contextlib import suppress
 import logging
 import os
 
-import aiohttp
-from serial_asyncio import create_serial_connection
-
+from insteonplm.hubbuffer import HubBuffer
 from insteonplm.plm import PLM, Hub
 
 __all__ = ('Connection')
 _LOGGER = logging.getLogger(__name__)
 
+# Hub buffer poll interval in seconds right after activity and when idle
+HUB_POLL_MIN = 0.05
+HUB_POLL_MAX = 1
+HUB_POLL_BACKOFF = 2
+
+# Hub writes waiting to be sent and retries of a failed write
+HUB_WRITE_QUEUE_SIZE = 32
+HUB_WRITE_RETRIES = 3
+HUB_WRITE_RETRY_WAIT = 0.1
+
+# Upper bounds in seconds of the Hub request latency histogram buckets
+HUB_LATENCY_BUCKETS = (0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+
 # pylint: disable=invalid-name,no-member
 try:
     ensure_future = asyncio.ensure_future
@@ -28,6 +40,8 @@ except AttributeError:
 def create_http_connection(loop, protocol_factory, host, port=25105,
                            auth=None, connector=None):
     """Create an HTTP session used to connect to the Insteon Hub."""
+    # The HTTP stack is only imported when connecting to a Hub
+    import aiohttp
     session = aiohttp.ClientSession(auth=auth, connector=connector)
     protocol = protocol_factory()
     transport = HttpTransport(loop, protocol, session, host, port)
@@ -257,10 +271,12 @@ class Connection:
 
     @asyncio.coroutine
     def _connect_http(self):
+        import aiohttp
         _LOGGER.info('Connecting to Insteon Hub on %s', self.host)
         auth = aiohttp.BasicAuth(self.username, self.password)
+        # One connection for buffer reads and one for writes
         connector = aiohttp.TCPConnector(
-            limit=1, loop=self._loop, keepalive_timeout=10)
+            limit=2, loop=self._loop, keepalive_timeout=10)
         _LOGGER.debug('Creating http connection')
         # pylint: disable=unused-variable
         transport, protocol = yield from create_http_connection(
@@ -275,6 +291,7 @@ class Connection:
 
     @asyncio.coroutine
     def _connect_serial(self):
+        from serial_asyncio import create_serial_connection
         try:
             if self._hub_version == 1:
                 url = 'socket://{}:{}'.format(self._host, self._port)
@@ -295,6 +312,39 @@ class Connection:
         return not self._closed
 
 
+class LatencyHistogram():
+    """Histogram of request latencies in fixed buckets."""
+
+    def __init__(self, buckets=HUB_LATENCY_BUCKETS):
+        """Init the LatencyHistogram class."""
+        self._buckets = buckets
+        self._counts = [0] * (len(buckets) + 1)
+        self._total = 0.0
+        self._max = 0.0
+
+    def __len__(self):
+        """Return the number of latencies added."""
+        return sum(self._counts)
+
+    def add(self, latency):
+        """Add a request latency in seconds."""
+        self._counts[bisect.bisect_left(self._buckets, latency)] += 1
+        self._total += latency
+        self._max = max(self._max, latency)
+
+    def stats(self):
+        """Return the request count, average, maximum and bucket counts.
+
+        Buckets are keyed by their upper bound in seconds, the last bucket
+        by None.
+        """
+        count = len(self)
+        return {'count': count,
+                'avg': self._total / count if count else 0.0,
+                'max': self._max,
+                'buckets': dict(zip(self._buckets + (None,), self._counts))}
+
+
 # Hub version 1 (2242) is untested using the HTTP Transport.
 # It is tested using the PLM socket interface on port 9761.
 # pylint: disable=too-many-instance-attributes
@@ -312,6 +362,14 @@ class HttpTransport(asyncio.Transport):
     will call `create_http_connection` which will create the
     transport and try to initiate the underlying communication channel,
     calling you back when it succeeds.
+
+    The Hub buffer is polled every HUB_POLL_MIN seconds after a write or
+    a received message and the interval backs off to HUB_POLL_MAX seconds
+    while the Hub is idle.
+
+    Writes are queued and sent in order by a single writer over the keep
+    alive connections of the session. A write that fails is retried before
+    the connection to the Hub is reset.
     """
 
     def __init__(self, loop, protocol, session, host, port=25105):
@@ -329,13 +387,39 @@ class HttpTransport(asyncio.Transport):
         self._write_buffer = []
         self._has_reader = False
         self._has_writer = False
-        self._poll_wait_time = 0.0005
-        self._read_write_lock = asyncio.Lock(loop=self._loop)
-        self._last_read = asyncio.Queue(loop=self._loop)
+        self._poll_interval = HUB_POLL_MIN
+        self._poll_waiter = None
+        self._write_count = 0
+        self._write_retries = 0
+        self._read_count = 0
+        self._write_queue = asyncio.Queue(maxsize=HUB_WRITE_QUEUE_SIZE,
+                                          loop=self._loop)
+        self._writer_task = None
+        self._read_latency = LatencyHistogram()
+        self._write_latency = LatencyHistogram()
+        self._hub_buffer = HubBuffer()
         self._restart_reader = True
         _LOGGER.debug("Starting the reader in HttpTrasnport __init__")
         self._reader_task = None
 
+    @property
+    def stats(self):
+        """Return the Hub request statistics.
+
+        reads / writes: number of successful requests
+        write_retries: number of writes sent again after a failure
+        write_queue: number of writes waiting to be sent
+        poll_interval: current buffer poll interval in seconds
+        read_latency / write_latency: request latency histograms
+        """
+        return {'reads': self._read_count,
+                'writes': self._write_count,
+                'write_retries': self._write_retries,
+                'write_queue': self._write_queue.qsize(),
+                'poll_interval': self._poll_interval,
+                'read_latency': self._read_latency.stats(),
+                'write_latency': self._write_latency.stats()}
+
     def abort(self):
         self._session.close()
 
@@ -375,8 +459,15 @@ class HttpTransport(asyncio.Transport):
         hex_data = binascii.hexlify(data).decode()
         url = 'http://{:s}:{:d}/3?{:s}=I=3'.format(self._host, self._port,
                                                    hex_data)
-        coro_write = self._async_write(url)
-        asyncio.ensure_future(coro_write, loop=self._loop)
+        try:
+            self._write_queue.put_nowait(url)
+        except asyncio.QueueFull:
+            _LOGGER.error('Hub write queue is full, message not sent: %s',
+                          hex_data)
+            return
+        if self._writer_task is None or self._writer_task.done():
+            self._writer_task = asyncio.ensure_future(self._ensure_writer(),
+                                                      loop=self._loop)
 
     @asyncio.coroutine
     def test_connection(self):
@@ -399,35 +490,57 @@ class HttpTransport(asyncio.Transport):
         self.close()
         return False
 
+    @asyncio.coroutine
+    def _ensure_writer(self):
+        """Send the queued writes in order until the queue is empty."""
+        while not self._write_queue.empty():
+            url = self._write_queue.get_nowait()
+            yield from self._async_write(url)
+
     @asyncio.coroutine
     def _async_write(self, url):
+        import aiohttp
         return_status = 500
-        if self._session.closed:
-            _LOGGER.warning("Session closed, cannot write to Hub")
-            return 999
-        _LOGGER.debug("Writing message: %s", url)
-        try:
-            yield from self._read_write_lock
-            response = yield from self._session.post(url, timeout=5)
+        error = None
+        for attempt in range(HUB_WRITE_RETRIES + 1):
+            if self._session.closed:
+                _LOGGER.warning("Session closed, cannot write to Hub")
+                return 999
+            if attempt:
+                self._write_retries += 1
+                yield from asyncio.sleep(HUB_WRITE_RETRY_WAIT * attempt,
+                                         loop=self._loop)
+            _LOGGER.debug("Writing message: %s", url)
+            start = self._loop.time()
+            try:
+                response = yield from self._session.post(url, timeout=5)
+                # Read the response so the connection is kept alive
+                yield from response.read()
+            except (aiohttp.client_exceptions.ServerDisconnectedError,
+                    aiohttp.client_exceptions.ClientConnectorError,
+                    asyncio.TimeoutError) as err:
+                _LOGGER.debug('Hub write failed (%s)', type(err).__name__)
+                error = type(err).__name__
+                continue
+            self._write_latency.add(self._loop.time() - start)
             return_status = response.status
+            error = None
             _LOGGER.debug("Post status: %s", response.status)
             if response.status == 200:
-                self._write_last_read(0)
-            else:
-                self._log_error(response.status)
-                yield from self._stop_reader(False)
-        except aiohttp.client_exceptions.ServerDisconnectedError:
-            _LOGGER.error('Reconnect to Hub (ServerDisconnectedError)')
-            yield from self._stop_reader(True)
-        except aiohttp.client_exceptions.ClientConnectorError:
-            _LOGGER.error('Reconnect to Hub (ClientConnectorError)')
-            yield from self._stop_reader(True)
-        except asyncio.TimeoutError:
-            _LOGGER.error('Reconnect to Hub (TimeoutError)')
+                # The Hub resets its buffer on a write
+                self._write_count += 1
+                self._hub_buffer.reset()
+                self._poll_soon()
+                return return_status
+            if response.status not in range(500, 600):
+                break
+
+        if error is None:
+            self._log_error(return_status)
+            yield from self._stop_reader(False)
+        else:
+            _LOGGER.error('Reconnect to Hub (%s)', error)
             yield from self._stop_reader(True)
-
-        if self._read_write_lock.locked():
-            self._read_write_lock.release()
         return return_status
 
     def write_eof(self):
@@ -453,9 +566,10 @@ class HttpTransport(asyncio.Transport):
     # pylint: disable=broad-except
     @asyncio.coroutine
     def _ensure_reader(self):
+        import aiohttp
         _LOGGER.info('Insteon Hub reader started')
         yield from self._clear_buffer()
-        self._write_last_read(0)
+        self._hub_buffer.reset()
         url = 'http://{:s}:{:d}/buffstatus.xml'.format(self._host, self._port)
         _LOGGER.debug('Calling connection made')
         _LOGGER.debug('Protocol: %s', self._protocol)
@@ -465,28 +579,27 @@ class HttpTransport(asyncio.Transport):
                 if self._session.closed:
                     yield from self._stop_reader(False)
                     return
-                yield from self._read_write_lock
+                write_count = self._write_count
+                start = self._loop.time()
                 response = yield from self._session.get(url, timeout=5)
                 buffer = None
                 # _LOGGER.debug("Reader status: %d", response.status)
                 if response.status == 200:
                     html = yield from response.text()
-                    _LOGGER.debug("HTML Length: %d", len(html))
-                    if len(html) == 234:
-                        # pylint: disable=no-value-for-parameter
-                        buffer = yield from self._parse_buffer(html)
-                    else:
-                        buffer = self._parse_buffer_v1(html)
+                    self._read_count += 1
+                    self._read_latency.add(self._loop.time() - start)
+                    if write_count != self._write_count:
+                        # A write reset the buffer while it was read
+                        continue
+                    buffer = self._hub_buffer.decode(html)
                 else:
                     self._log_error(response.status)
                     yield from self._stop_reader(False)
-                if self._read_write_lock.locked():
-                    self._read_write_lock.release()
                 if buffer:
                     _LOGGER.debug('New buffer: %s', buffer)
-                    bin_buffer = binascii.unhexlify(buffer)
-                    self._protocol.data_received(bin_buffer)
-                yield from asyncio.sleep(1, loop=self._loop)
+                    self._protocol.data_received(buffer)
+                    self._poll_interval = HUB_POLL_MIN
+                yield from self._wait_poll_interval()
 
             except asyncio.CancelledError:
                 _LOGGER.debug('Stop connection to Hub (loop stopped)')
@@ -510,89 +623,29 @@ class HttpTransport(asyncio.Transport):
         return
 
     @asyncio.coroutine
-    def _parse_buffer(self, html):
-        last_stop = 0
-        if not self._last_read.empty():
-            last_stop = self._last_read.get_nowait()
-        buffer = ''
-        raw_text = html.replace('<response><BS>', '')
-        raw_text = raw_text.replace('</BS></response>', '')
-        raw_text = raw_text.strip()
-        if raw_text[:199] == '0' * 200:
-            # Likely the buffer was cleared
-            return None
-        this_stop = int(raw_text[-2:], 16)
-        if this_stop > last_stop:
-            _LOGGER.debug('Buffer from %d to %d', last_stop, this_stop)
-            buffer = raw_text[last_stop:this_stop]
-        elif this_stop < last_stop:
-            _LOGGER.debug('Buffer from %d to 200 and 0 to %d',
-                          last_stop, this_stop)
-            buffer_hi = raw_text[last_stop:200]
-            if buffer_hi == '0' * len(buffer_hi):
-                # The buffer was probably reset since the last read
-                buffer_hi = ''
-            buffer_low = raw_text[0:this_stop]
-            buffer = '{:s}{:s}'.format(buffer_hi, buffer_low)
-        else:
-            buffer = None
-        self._write_last_read(this_stop)
-        return buffer
-
-    def _parse_buffer_v1(self, html):
-        # I think this is a good idea but who knows.
-        # Risk is we may be loosing the next message
-        # If we do this than this method must be a coroutine
-        # yield from self._clear_buffer()
-        raw_text = html.replace('<response><BS>', '')
-        raw_text = raw_text.replace('</BS></response>', '')
-        raw_text = raw_text.strip()
-        buffer = ''
-        while raw_text:
-            msg, raw_text = self._find_message(raw_text)
-            if msg:
-                buffer = '{}{}'.format(buffer, msg)
-        return buffer
-
-    @staticmethod
-    def _find_message(raw_text):
-        from insteonplm.messages import iscomplete
-        len_raw_text = len(raw_text)
-        pos = -2
-        msg_len = 4   # set to 5 because the min msg len is 4 chars or 2 bytes
-        msg = None
-        if raw_text == '0' * len_raw_text:
-            print('Likely the buffer was cleared')
-            return msg, None, False
-        while pos < (len_raw_text - 2) and raw_text[pos: pos + 2] != '02':
-            pos = pos + 2
-        print('pos is: ', pos)
-        print('len_raw_text is: ', len_raw_text)
-        if pos == len_raw_text - 2:
-            print('02 not found')
-            return msg, None, False
-        if pos > 0:
-            raw_text = raw_text[pos:] + raw_text[0:pos]
-        while (msg_len < len_raw_text and
-               not iscomplete(binascii.unhexlify(raw_text[0:msg_len]))):
-            msg_len = msg_len + 2
-        if msg_len == len_raw_text:
-            print('must not be a message')
-            return msg, None, False
-        msg = raw_text[0:msg_len]
-        raw_text = raw_text[msg_len:]
-        if msg_len > len_raw_text - pos:
-            # We have wrapped so there cannot be another messasge
-            raw_text = None
-        else:
-            if pos > 0 and raw_text:
-                raw_text = raw_text[len(raw_text) - pos:] + raw_text[:-pos]
-        return (msg, raw_text)
-
-    def _write_last_read(self, val):
-        while not self._last_read.empty():
-            self._last_read.get_nowait()
-        self._last_read.put_nowait(val)
+    def _wait_poll_interval(self):
+        """Wait for the next buffer poll and back off the poll interval."""
+        self._poll_waiter = self._loop.create_future()
+        handle = self._loop.call_later(self._poll_interval, self._poll_now)
+        try:
+            yield from self._poll_waiter
+        finally:
+            handle.cancel()
+            self._poll_waiter = None
+        self._poll_interval = min(HUB_POLL_MAX,
+                                  self._poll_interval * HUB_POLL_BACKOFF)
+
+    def _poll_soon(self):
+        """Poll the buffer at the minimum interval after Hub activity."""
+        self._poll_interval = HUB_POLL_MIN
+        if self._poll_waiter is not None:
+            handle = self._loop.call_later(HUB_POLL_MIN, self._poll_now)
+            self._poll_waiter.add_done_callback(
+                lambda waiter: handle.cancel())
+
+    def _poll_now(self):
+        if self._poll_waiter is not None and not self._poll_waiter.done():
+            self._poll_waiter.set_result(True)
 
     # pylint: disable=unused-argument
     def _start_reader(self, future=None):
@@ -7,6 +7,22 @@ import insteonplm.utils
 __all__ = ('Address')
 _LOGGER = logging.getLogger(__name__)
 
+# X10 device id and human readable address by house and unit code bytes
+_X10_STRINGS = {}
+
+
+def _x10_strings(housecode_byte, unitcode_byte):
+    """Return the X10 device id and human readable address."""
+    key = (housecode_byte, unitcode_byte)
+    strings = _X10_STRINGS.get(key)
+    if strings is None:
+        housecode = insteonplm.utils.byte_to_housecode(housecode_byte)
+        unitcode = insteonplm.utils.byte_to_unitcode(unitcode_byte)
+        strings = ('x10{}{:02d}'.format(housecode, unitcode),
+                   'X10.{}.{:02d}'.format(housecode, unitcode))
+        _X10_STRINGS[key] = strings
+    return strings
+
 
 class Address():
     """Datatype definition for INSTEON device address handling."""
@@ -101,11 +117,7 @@ class Address():
         addrstr = '00.00.00'
         if self.addr:
             if self._is_x10:
-                housecode_byte = self.addr[1]
-                housecode = insteonplm.utils.byte_to_housecode(housecode_byte)
-                unitcode_byte = self.addr[2]
-                unitcode = insteonplm.utils.byte_to_unitcode(unitcode_byte)
-                addrstr = 'X10.{}.{:02d}'.format(housecode.upper(), unitcode)
+                addrstr = _x10_strings(self.addr[1], self.addr[2])[1]
             else:
                 addrstr = '{}.{}.{}'.format(self.hex[0:2],
                                             self.hex[2:4],
@@ -133,8 +145,7 @@ class Address():
         """Return the ID of the device address."""
         dev_id = ''
         if self._is_x10:
-            dev_id = 'x10{}{:02d}'.format(self.x10_housecode,
-                                          self.x10_unitcode)
+            dev_id = _x10_strings(self.addr[1], self.addr[2])[0]
         else:
             dev_id = self.hex
         return dev_id
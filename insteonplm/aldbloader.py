@@ -0,0 +1,145 @@
+"""Load the All-Link Databases of many devices within a powerline budget."""
+import asyncio
+from functools import partial
+import heapq
+import logging
+
+from insteonplm.devices import ALDBStatus, ALDBVersion
+
+__all__ = ('ALDBLoader')
+_LOGGER = logging.getLogger(__name__)
+ALDB_LOAD_BUDGET = 4
+
+# Devices with a partial or no ALDB are loaded before refreshing the others
+_LOAD_PRIORITY = {ALDBStatus.PARTIAL: 0,
+                  ALDBStatus.LOADING: 0,
+                  ALDBStatus.EMPTY: 1,
+                  ALDBStatus.FAILED: 2,
+                  ALDBStatus.LOADED: 3}
+
+
+class ALDBLoader():
+    """Modem level scheduler of device All-Link Database loads.
+
+    Devices are loaded concurrently while no more than budget devices are
+    loading at once. The modem sends one message at a time and the
+    in-flight tracker allows one message per device, so the budget bounds
+    the number of ALDB reads on the powerline. Devices with a PARTIAL or
+    EMPTY ALDB are loaded first. The device information is saved as records
+    arrive so an interrupted load resumes with the missing records. Devices
+    with a LOADED ALDB are synced, reading only the records that changed.
+
+    Parameters:
+        devices: LinkedDevices of the modem
+        loop: asyncio event loop
+        budget: number of devices loading at the same time
+
+    """
+
+    def __init__(self, devices, loop=None, budget=ALDB_LOAD_BUDGET):
+        """Init the ALDBLoader class."""
+        self._devices = devices
+        self._loop = loop
+        self._budget = budget
+        self._queue = []
+        self._queued = set()
+        self._loading = set()
+        self._count = 0
+        self._progress_callbacks = {}
+        self._idle = asyncio.Event(loop=loop)
+        self._idle.set()
+        self._loaded = 0
+        self._failed = 0
+
+    def __len__(self):
+        """Return the number of devices waiting for or loading the ALDB."""
+        return len(self._queued) + len(self._loading)
+
+    @property
+    def budget(self):
+        """Return the number of devices loading at the same time."""
+        return self._budget
+
+    @budget.setter
+    def budget(self, val: int):
+        """Set the number of devices loading at the same time."""
+        self._budget = max(1, val)
+        self._start_next()
+
+    @property
+    def stats(self):
+        """Return the counts of devices queued, loading and loaded."""
+        return {'queued': len(self._queued),
+                'loading': len(self._loading),
+                'loaded': self._loaded,
+                'failed': self._failed}
+
+    def add(self, addr, clear=False):
+        """Queue a device ALDB load."""
+        self._queue_device(addr, clear)
+        self._start_next()
+
+    @asyncio.coroutine
+    def load(self, addresses=None, clear=False):
+        """Load the ALDB of the devices and wait for the loads to finish.
+
+        All linked devices are loaded if addresses is not given.
+        """
+        if addresses is None:
+            addresses = list(self._devices)
+        for addr in addresses:
+            self._queue_device(addr, clear)
+        self._start_next()
+        yield from self._idle.wait()
+
+    def _queue_device(self, addr, clear):
+        if addr in self._queued or addr in self._loading:
+            return
+        device = self._devices[addr]
+        if device is None or device.aldb.version == ALDBVersion.Null:
+            return
+        if clear:
+            device.aldb.clear()
+        priority = _LOAD_PRIORITY.get(device.aldb.status, 3)
+        self._count += 1
+        heapq.heappush(self._queue, (priority, self._count, addr))
+        self._queued.add(addr)
+        self._idle.clear()
+
+    def _start_next(self):
+        while self._queue and len(self._loading) < self._budget:
+            _priority, _count, addr = heapq.heappop(self._queue)
+            self._queued.discard(addr)
+            device = self._devices[addr]
+            if device is None:
+                continue
+            self._loading.add(addr)
+            callback = self._progress_callbacks.get(addr)
+            if callback is None:
+                callback = partial(self._device_progress, addr)
+                self._progress_callbacks[addr] = callback
+            device.aldb.add_progress_callback(callback)
+            device.aldb.add_loaded_callback(
+                partial(self._device_loaded, addr))
+            _LOGGER.debug('Loading ALDB for device %s, %d devices waiting',
+                          addr, len(self._queued))
+            if device.aldb.status == ALDBStatus.LOADED:
+                device.sync_aldb()
+            else:
+                device.read_aldb()
+        if not self._queue and not self._loading:
+            self._idle.set()
+
+    # pylint: disable=unused-argument
+    def _device_progress(self, addr, count, rate):
+        self._devices.save_device_info(addr)
+
+    def _device_loaded(self, addr):
+        self._loading.discard(addr)
+        device = self._devices[addr]
+        if device is not None and device.aldb.status == ALDBStatus.LOADED:
+            self._loaded += 1
+        else:
+            self._failed += 1
+        self._devices.save_device_info(addr)
+        self._start_next()
@@ -1,13 +1,14 @@
 """Insteon Device Classes."""
 # pylint: disable=too-many-lines
 import asyncio
+import bisect
 from collections import namedtuple
-from concurrent.futures import CancelledError
+from contextlib import suppress
 import datetime
 from enum import Enum
+from functools import partial
 import logging
-
-import async_timeout
+import time
 
 from insteonplm.address import Address
 from insteonplm.constants import (
@@ -24,9 +25,7 @@ from insteonplm.constants import (
     MESSAGE_ACK,
     MESSAGE_TYPE_BROADCAST_MESSAGE,
     MESSAGE_TYPE_DIRECT_MESSAGE,
-    MESSAGE_FLAG_DIRECT_MESSAGE_NAK_0XA0,
-    MESSAGE_STANDARD_MESSAGE_RECEIVED_0X50,
-    MESSAGE_EXTENDED_MESSAGE_RECEIVED_0X51
+    MESSAGE_FLAG_DIRECT_MESSAGE_NAK_0XA0
 )
 from insteonplm.messagecallback import MessageCallback
 from insteonplm.messages.allLinkComplete import AllLinkComplete
@@ -39,11 +38,12 @@ from insteonplm.messages.userdata import Userdata
 from insteonplm.states import State
 
 _LOGGER = logging.getLogger(__name__)
-DIRECT_ACK_WAIT_TIMEOUT = 3
+DEVICE_INFO_TIMEOUT = 6
 ALDB_RECORD_TIMEOUT = 10
 ALDB_RECORD_RETRIES = 20
 ALDB_ALL_RECORD_TIMEOUT = 30
 ALDB_ALL_RECORD_RETRIES = 5
+ALDB_READ_WINDOW = 3
 
 
 LoadAction = namedtuple('LoadAction', 'mem_addr rec_count retries')
@@ -102,16 +102,10 @@ class Device():
         self._last_communication_received = datetime.datetime(1, 1, 1, 1, 1, 1)
         self._product_data_in_aldb = False
         self._stateList = StateList()
-        self._sent_msg_wait_for_directACK = {}
         self._message_callbacks = MessageCallback()
         self._aldb = ALDB(self._send_msg, self._plm.loop, self._address)
 
-        self._recent_messages = asyncio.Queue(loop=self._plm.loop)
-        self._send_msg_queue = asyncio.Queue(loop=self._plm.loop)
-        self._directACK_received_queue = asyncio.Queue(loop=self._plm.loop)
-        self._device_info_queue = asyncio.Queue(loop=self._plm.loop)
-        self._send_msg_lock = asyncio.Lock(loop=self._plm.loop)
-        self._setup_default_links_lock = asyncio.Lock(loop=self._plm.loop)
+        self._device_info_timer = None
         self._device_info_retries = 0
         self._all_link_complete_callback = None
 
@@ -312,6 +306,14 @@ class Device():
                                   loop=self._plm.loop)
             self._aldb.add_loaded_callback(self._aldb_loaded_callback)
 
+    def sync_aldb(self):
+        """Read the device All-Link Database records that changed."""
+        if self._aldb.version != ALDBVersion.Null:
+            _LOGGER.info('Syncing All-Link Database for device %s',
+                         self._address.human)
+            asyncio.ensure_future(self._aldb.sync(), loop=self._plm.loop)
+            self._aldb.add_loaded_callback(self._aldb_loaded_callback)
+
     # pylint: disable=too-many-locals
     # pylint: disable=too-many-return-statements
     # pylint: disable=too-many-branches
@@ -489,7 +491,10 @@ class Device():
     def _handle_get_device_info_ack(self, msg):
         _LOGGER.debug('Starting _handle_get_device_info_ack with message:')
         _LOGGER.debug(msg)
-        asyncio.ensure_future(self._wait_device_info(msg), loop=self._plm.loop)
+        if self._device_info_timer is not None:
+            self._device_info_timer.cancel()
+        self._device_info_timer = self._plm.loop.call_later(
+            DEVICE_INFO_TIMEOUT, self._device_info_timeout)
 
     def _handle_assign_to_all_link_group(self, msg):
         cat = 0xff
@@ -536,60 +541,50 @@ class Device():
     def _refresh_aldb_records(self, linkcode, address, group):
         """Refresh the IM and device ALDB records."""
         if self.aldb.status in [ALDBStatus.LOADED, ALDBStatus.PARTIAL]:
-            for mem_addr in self.aldb:
-                rec = self.aldb[mem_addr]
-                if linkcode in [0, 1, 3]:
-                    if rec.control_flags.is_high_water_mark:
-                        _LOGGER.debug('Removing HWM record %04x', mem_addr)
-                        self.aldb.pop(mem_addr)
-                    elif not rec.control_flags.is_in_use:
-                        _LOGGER.debug('Removing not in use record %04x',
-                                      mem_addr)
-                        self.aldb.pop(mem_addr)
-                else:
-                    if rec.address == self.address and rec.group == group:
-                        _LOGGER.debug('Removing record %04x with addr %s and '
-                                      'group %d', mem_addr, rec.address,
-                                      rec.group)
-                        self.aldb.pop(mem_addr)
+            if linkcode in [0, 1, 3]:
+                for mem_addr in self.aldb.free_mem_addrs:
+                    _LOGGER.debug('Removing not in use record %04x',
+                                  mem_addr)
+                    self.aldb.pop(mem_addr)
+            else:
+                for mem_addr in self.aldb.find_records(self.address, group):
+                    _LOGGER.debug('Removing record %04x with addr %s and '
+                                  'group %d', mem_addr, self.address, group)
+                    self.aldb.pop(mem_addr)
             self.read_aldb()
             # self.aldb.add_loaded_callback(self._refresh_aldb)
 
-    @asyncio.coroutine
-    def _wait_device_info(self, msg):
-        _LOGGER.debug('Starting _wait_device_info for device %s in %s',
-                      msg.address.human, self._address.human)
-        try:
-            with async_timeout.timeout(6):
-                device_info_msg = yield from self._device_info_queue.get()
-                _LOGGER.debug('_wait_device_info got device_id message %s',
-                              device_info_msg)
-        except asyncio.TimeoutError:
-            _LOGGER.debug('_wait_device_info timed out for message %s in %s',
-                          msg.address.human, self._address.human)
-            if self._device_info_retries < 5:
-                self._device_info_retries += 1
-                _LOGGER.debug('Device %s id_request retry %d',
-                              self.address.human, self._device_info_retries)
-                self.id_request()
-            else:
-                _LOGGER.warning('Device %s did not respond to an ID request',
-                                self.address.human)
-                _LOGGER.warning('Use a device override to define the device '
-                                'type')
-                self._plm.device_not_active(self.address)
-            return
-        self._device_info_retries = 0
-        address = device_info_msg.address
-        cat = device_info_msg.targetLow
-        subcat = device_info_msg.targetMed
-        product_key = device_info_msg.targetHi
-        self._add_device_from_prod_data(address, cat, subcat, product_key)
+    def _device_info_timeout(self):
+        self._device_info_timer = None
+        _LOGGER.debug('Device info request timed out for %s',
+                      self._address.human)
+        if self._device_info_retries < 5:
+            self._device_info_retries += 1
+            _LOGGER.debug('Device %s id_request retry %d',
+                          self.address.human, self._device_info_retries)
+            self.id_request()
+        else:
+            _LOGGER.warning('Device %s did not respond to an ID request',
+                            self.address.human)
+            _LOGGER.warning('Use a device override to define the device '
+                            'type')
+            self._plm.device_not_active(self.address)
 
     def _handle_device_info_response(self, msg):
         _LOGGER.debug('Got device_id for %s in %s', msg.address.human,
                       self._address.human)
-        self._device_info_queue.put_nowait(msg)
+        if self._device_info_timer is None:
+            _LOGGER.debug('Device info for %s was not requested',
+                          msg.address.human)
+            return
+        self._device_info_timer.cancel()
+        self._device_info_timer = None
+        self._device_info_retries = 0
+        address = msg.address
+        cat = msg.targetLow
+        subcat = msg.targetMed
+        product_key = msg.targetHi
+        self._add_device_from_prod_data(address, cat, subcat, product_key)
 
     def _handle_all_link_complete(self, msg):
         if msg and msg.group == 0 and msg.linkcode == 0x01:
@@ -597,11 +592,7 @@ class Device():
             # Set up other needed links
             self.aldb.add_loaded_callback(self.create_default_links)
 
-        last_record = None
-        for mem_addr in self.aldb:
-            aldb_rec = self.aldb[mem_addr]
-            if aldb_rec.control_flags.is_high_water_mark:
-                last_record = mem_addr
+        last_record = self.aldb.high_water_mark
         if last_record:
             self.aldb.pop(last_record)
         self.read_aldb()
@@ -665,141 +656,31 @@ class Device():
     # Send / Receive message processing
     def receive_message(self, msg):
         """Receive a messages sent to this device."""
-        _LOGGER.debug('Starting Device.receive_message')
-        if hasattr(msg, 'isack') and msg.isack:
-            _LOGGER.debug('Got Message ACK')
-            if self._sent_msg_wait_for_directACK.get('callback') is not None:
-                _LOGGER.debug('Look for direct ACK')
-                coro = self._wait_for_direct_ACK()
-                asyncio.ensure_future(coro, loop=self._plm.loop)
-            else:
-                _LOGGER.debug('DA queue: %s',
-                              self._sent_msg_wait_for_directACK)
-                _LOGGER.debug('Message ACK with no callback')
-        if (hasattr(msg, 'flags') and
-                hasattr(msg.flags, 'isDirectACK') and
-                msg.flags.isDirectACK):
-            _LOGGER.debug('Got Direct ACK message')
-            if self._send_msg_lock.locked():
-                self._directACK_received_queue.put_nowait(msg)
-            else:
-                _LOGGER.debug('But Direct ACK not expected')
-        if not self._is_duplicate(msg):
+        debug = _LOGGER.isEnabledFor(logging.DEBUG)
+        if not self._plm.duplicates.is_duplicate(msg):
             callbacks = self._message_callbacks.get_callbacks_from_message(msg)
             for callback in callbacks:
-                _LOGGER.debug('Scheduling msg callback: %s', callback)
+                if debug:
+                    _LOGGER.debug('Scheduling msg callback: %s', callback)
                 self._plm.loop.call_soon(callback, msg)
-        else:
-            _LOGGER.debug('msg is duplicate')
-            _LOGGER.debug(msg)
+        elif debug:
+            _LOGGER.debug('msg is duplicate: %s', msg)
         self._last_communication_received = datetime.datetime.now()
-        _LOGGER.debug('Ending Device.receive_message')
-
-    def _is_duplicate(self, msg):
-        if msg.code not in [MESSAGE_STANDARD_MESSAGE_RECEIVED_0X50,
-                            MESSAGE_EXTENDED_MESSAGE_RECEIVED_0X51]:
-            return False
-
-        recent_messages = []
-        while not self._recent_messages.empty():
-            recent_message = self._recent_messages.get_nowait()
-            if recent_message:
-                msg_received = recent_message.get("received")
-                if msg_received >= (datetime.datetime.now() -
-                                    datetime.timedelta(0, 0, 500000)):
-                    recent_messages.append(recent_message)
-        if not recent_messages:
-            self._save_recent_message(msg)
-            return False
-
-        for recent_message in recent_messages:
-            prev_msg = recent_message.get('msg')
-            self._recent_messages.put_nowait(recent_message)
-            prev_cmd1 = prev_msg.cmd1
-            if prev_msg.flags.isAllLinkBroadcast:
-                prev_group = prev_msg.target.bytes[2]
-            elif prev_msg.flags.isAllLinkCleanup:
-                prev_group = prev_msg.cmd2
-
-            if msg.flags.isAllLinkCleanup or msg.flags.isAllLinkBroadcast:
-                cmd1 = msg.cmd1
-                if msg.flags.isAllLinkBroadcast:
-                    group = msg.target.bytes[2]
-                else:
-                    group = msg.cmd2
-                if prev_cmd1 == cmd1 and prev_group == group:
-                    return True
-                self._save_recent_message(msg)
-            else:
-                self._save_recent_message(msg)
-                return False
-
-    def _save_recent_message(self, msg):
-        recent_message = {"msg": msg,
-                          "received": datetime.datetime.now()}
-        self._recent_messages.put_nowait(recent_message)
 
     def _send_msg(self, msg, callback=None, on_timeout=False):
+        """Send a message to the device.
+
+        Messages with a callback are held by the modem until the device
+        sends a direct ACK, which is passed to the callback. If on_timeout
+        is True the callback is called with None when no direct ACK is
+        received.
+        """
         _LOGGER.debug('Starting Device._send_msg')
-        msg_info = {'msg': msg,
-                    'callback': callback,
-                    'on_timeout': on_timeout}
-        self._send_msg_queue.put_nowait(msg_info)
-        asyncio.ensure_future(self._process_send_queue(), loop=self._plm.loop)
+        self._plm.inflight.send(msg, callback, on_timeout)
         _LOGGER.debug('Ending Device._send_msg')
 
-    @asyncio.coroutine
-    def _process_send_queue(self):
-        _LOGGER.debug('Starting %s Device._process_send_queue',
-                      self._address.human)
-        yield from self._send_msg_lock
-        if self._send_msg_lock.locked():
-            _LOGGER.debug("Lock is locked from yeild from")
-        msg_info = yield from self._send_msg_queue.get()
-        msg = msg_info.get('msg')
-        callback = msg_info.get('callback')
-        self._plm.send_msg(msg)
-        if callback:
-            self._sent_msg_wait_for_directACK = msg_info
-        else:
-            if self._send_msg_lock.locked():
-                self._send_msg_lock.release()
-                _LOGGER.debug('Device %s msg_lock unlocked',
-                              self._address.human)
-        _LOGGER.debug('Ending %s Device._process_send_queue',
-                      self._address.human)
-
-    @asyncio.coroutine
-    def _wait_for_direct_ACK(self):
-        _LOGGER.debug('Starting Device._wait_for_direct_ACK')
-        msg = None
-        while True:
-            # wait for an item from the queue
-            try:
-                with async_timeout.timeout(DIRECT_ACK_WAIT_TIMEOUT):
-                    msg = yield from self._directACK_received_queue.get()
-                    break
-            except asyncio.TimeoutError:
-                _LOGGER.debug('No direct ACK messages received.')
-                break
-            except CancelledError:
-                break
-
-        # _LOGGER.debug('Holding lock for 10 seconds')
-        # yield from asyncio.sleep(10, loop=self._plm.loop)
-        _LOGGER.debug('Releasing lock after processing direct ACK')
-        if self._send_msg_lock.locked():
-            self._send_msg_lock.release()
-            _LOGGER.debug('Device %s msg_lock unlocked', self._address.human)
-        if msg or self._sent_msg_wait_for_directACK.get('on_timeout'):
-            callback = self._sent_msg_wait_for_directACK.get('callback', None)
-            if callback is not None:
-                callback(msg)
-        self._sent_msg_wait_for_directACK = {}
-        _LOGGER.debug('Ending Device._wait_for_direct_ACK')
-
     def _aldb_loaded_callback(self):
-        self._plm.devices.save_device_info()
+        self._plm.devices.save_device_info(self.id)
 
 
 # pylint: disable=too-many-instance-attributes
@@ -851,18 +732,21 @@ class X10Device():
     # Send / Receive message processing
     def receive_message(self, msg):
         """Receive a message sent to this device."""
-        _LOGGER.debug('Starting X10Device.receive_message')
+        debug = _LOGGER.isEnabledFor(logging.DEBUG)
         if hasattr(msg, 'isack') and msg.isack:
-            _LOGGER.debug('Got Message ACK')
+            if debug:
+                _LOGGER.debug('Got Message ACK')
             if self._send_msg_lock.locked():
                 self._send_msg_lock.release()
         callbacks = self._message_callbacks.get_callbacks_from_message(msg)
-        _LOGGER.debug('Found %d callbacks for msg %s', len(callbacks), msg)
+        if debug:
+            _LOGGER.debug('Found %d callbacks for msg %s', len(callbacks),
+                          msg)
         for callback in callbacks:
-            _LOGGER.debug('Scheduling msg callback: %s', callback)
+            if debug:
+                _LOGGER.debug('Scheduling msg callback: %s', callback)
             self._plm.loop.call_soon(callback, msg)
         self._last_communication_received = datetime.datetime.now()
-        _LOGGER.debug('Ending Device.receive_message')
 
     @asyncio.coroutine
     def close(self):
@@ -870,21 +754,22 @@ class X10Device():
         # Nothing actually needed here.
         pass
 
-    def _send_msg(self, msg, wait_ack=True):
+    def _send_msg(self, msg, wait_ack=True, wait_timeout=2):
         _LOGGER.debug('Starting Device._send_msg')
-        write_message_coroutine = self._process_send_queue(msg, wait_ack)
+        write_message_coroutine = self._process_send_queue(msg, wait_ack,
+                                                           wait_timeout)
         asyncio.ensure_future(write_message_coroutine,
                               loop=self._plm.loop)
         _LOGGER.debug('Ending Device._send_msg')
 
     @asyncio.coroutine
-    def _process_send_queue(self, msg, wait_ack):
+    def _process_send_queue(self, msg, wait_ack, wait_timeout):
         _LOGGER.debug('Starting Device._process_send_queue')
         yield from self._send_msg_lock
         if self._send_msg_lock.locked():
             _LOGGER.debug("Lock is locked from yeild from")
 
-        self._plm.send_msg(msg, wait_timeout=2)
+        self._plm.send_msg(msg, wait_timeout=wait_timeout)
         if not wait_ack:
             _LOGGER.debug("No directACK wait")
             _LOGGER.debug("Releasing lock")
@@ -965,6 +850,15 @@ class ALDBRecord():
         msgstr = "{}{}".format(msgstr, '}')
         return msgstr
 
+    def __eq__(self, other):
+        """Test if two records hold the same link."""
+        if not isinstance(other, ALDBRecord):
+            return NotImplemented
+        # pylint: disable=protected-access
+        return self._record_properties() == other._record_properties()
+
+    __hash__ = None
+
     @property
     def mem_addr(self):
         """Return the memory address of the database record."""
@@ -1142,6 +1036,13 @@ class ALDBVersion(Enum):
     v2cs = 20
 
 
+def _remove_sorted(items, item):
+    """Remove an item from a sorted list."""
+    index = bisect.bisect_left(items, item)
+    if index < len(items) and items[index] == item:
+        del items[index]
+
+
 # pylint: disable=too-many-instance-attributes
 class ALDB():
     """Represents a device All-Link database."""
@@ -1150,6 +1051,11 @@ class ALDB():
                  version=ALDBVersion.v2, mem_addr=0x0000):
         """Instantiate the ALL-Link Database object."""
         self._records = {}
+        # Indexes of the records kept in step with self._records
+        self._mem_addrs = []
+        self._links = {}
+        self._hwm_addrs = []
+        self._free_addrs = []
         self._status = ALDBStatus.EMPTY
         self._prior_status = self._status
         self._version = version
@@ -1159,9 +1065,23 @@ class ALDB():
         self._address = address
         self._mem_addr = mem_addr
 
-        self._rec_mgr_lock = asyncio.Lock(loop=self._loop)
         self._load_action = LoadAction(0, 0, 0)
         self._cb_aldb_loaded = []
+        self._cb_aldb_progress = []
+
+        # Read state of the current load
+        self._loading = False
+        self._read_all = False
+        self._read_all_retries = 0
+        self._read_window = {}
+        self._read_timers = {}
+        self._read_targets = None
+        self._read_stopped = False
+        self._load_started = 0.0
+        self._load_count = 0
+        self._syncing = False
+        self._sync_changes = 0
+        self._dirty = set()
 
     def __len__(self):
         """Return the number of devices in the ALDB."""
@@ -1169,10 +1089,7 @@ class ALDB():
 
     def __iter__(self):
         """Iterate through each ALDB device record."""
-        keys = list(self._records.keys())
-        keys.sort(reverse=True)
-        for key in keys:
-            yield key
+        return iter(self._mem_addrs[::-1])
 
     def __getitem__(self, mem_addr):
         """Fetch a device from the ALDB."""
@@ -1183,7 +1100,10 @@ class ALDB():
         if not isinstance(record, ALDBRecord):
             raise ValueError
 
+        if mem_addr in self._records:
+            self._unindex_record(mem_addr)
         self._records[mem_addr] = record
+        self._index_record(mem_addr, record)
 
     def __repr__(self):
         """Human representation of a device from the ALDB."""
@@ -1205,60 +1125,110 @@ class ALDB():
         """Return the ALDB version."""
         return self._version
 
+    @property
+    def high_water_mark(self):
+        """Return the memory address of the high water mark record."""
+        if self._hwm_addrs:
+            return self._hwm_addrs[-1]
+        return None
+
+    @property
+    def free_mem_addrs(self):
+        """Return the memory addresses of records not in use, highest first.
+
+        The high water mark record is included since it is not in use.
+        """
+        return self._free_addrs[::-1]
+
     def pop(self, key):
         """Pop and remove an item from the ALDB."""
-        return self._records.pop(key)
+        record = self._records.pop(key)
+        self._unindex_record(key, record)
+        return record
 
     def add_loaded_callback(self, callback):
         """Add a callback to be run when the ALDB load is complete."""
         if callback not in self._cb_aldb_loaded:
             self._cb_aldb_loaded.append(callback)
 
+    def add_progress_callback(self, callback):
+        """Add a callback to be run when a record is loaded.
+
+        The callback is called with the number of records received in the
+        current load and the rate in records per second.
+        """
+        if callback not in self._cb_aldb_progress:
+            self._cb_aldb_progress.append(callback)
+
+    @property
+    def is_loading(self):
+        """Return if the ALDB is being read from the device."""
+        return self._loading
+
+    @property
+    def dirty(self):
+        """Return the memory addresses written since they were read."""
+        return frozenset(self._dirty)
+
     @asyncio.coroutine
     def load(self, mem_addr=0x0000, rec_count=0, retry=0):
-        """Read the device database and load."""
+        """Read the device database and load.
+
+        With a rec_count of 0 the device is asked for all records. Records
+        missing after that are read ALDB_READ_WINDOW at a time until the
+        high water mark is reached. With a rec_count of 1 only the record at
+        mem_addr is read.
+
+        Records already loaded are kept, so a load started again after an
+        interrupted load only reads the missing records.
+        """
         if self._version == ALDBVersion.Null:
             self._status = ALDBStatus.LOADED
             _LOGGER.debug('Device has no ALDB')
+            return
+        self._status = ALDBStatus.LOADING
+        if not self._loading:
+            self._start_load()
+        if rec_count:
+            _LOGGER.info('ALDB read record %04x', mem_addr)
+            self._read_all = False
+            if self._read_targets is None:
+                self._read_targets = []
+            if mem_addr not in self._read_targets:
+                self._read_targets.append(mem_addr)
+            self._fill_read_window()
+        elif self._read_all or self._read_window:
+            _LOGGER.debug('ALDB load already in progress')
+        elif self._have_first_record():
+            _LOGGER.info('ALDB read missing records')
+            self._read_targets = None
+            self._fill_read_window()
         else:
-            self._status = ALDBStatus.LOADING
-            _LOGGER.debug('Tring to lock from load')
-            yield from self._rec_mgr_lock
-            _LOGGER.debug('load yielded lock')
-
-            mem_hi = mem_addr >> 8
-            mem_lo = mem_addr & 0xff
-            log_output = 'ALDB read'
-            max_retries = 0
-            if rec_count:
-                max_retries = ALDB_RECORD_RETRIES
-                if mem_addr == 0x0000:
-                    log_output = '{:s} first record'.format(log_output)
-                else:
-                    log_output = '{:s} record {:04x}'.format(log_output,
-                                                             mem_addr)
-            else:
-                max_retries = ALDB_ALL_RECORD_RETRIES
-                log_output = '{:s} all records'.format(log_output)
-
-            if retry:
-                log_output = '{:s} retry {:d} of {:d}'.format(log_output,
-                                                              retry,
-                                                              max_retries)
-            _LOGGER.info(log_output)
-            userdata = Userdata({'d1': 0,
-                                 'd2': 0,
-                                 'd3': mem_hi,
-                                 'd4': mem_lo,
-                                 'd5': rec_count})
-            msg = ExtendedSend(self._address,
-                               COMMAND_EXTENDED_READ_WRITE_ALDB_0X2F_0X00,
-                               userdata=userdata)
-            msg.set_checksum()
-            self._send_method(msg, self._handle_read_aldb_ack, True)
+            self._read_all_records(retry)
 
-            if not self._load_action:
-                self._set_load_action(mem_addr, rec_count, -1, False)
+    @asyncio.coroutine
+    def sync(self):
+        """Verify the loaded records and read only the records that changed.
+
+        The first record, the high water mark record and the records written
+        since they were last read are read and compared to the loaded
+        records. New records are read if the high water mark moved and all
+        records are read again if the first record changed. An ALDB that is
+        not fully loaded is loaded instead.
+        """
+        if (self._loading or self._status != ALDBStatus.LOADED or
+                not self._have_all_records()):
+            yield from self.load()
+            return
+        _LOGGER.info('ALDB sync with device %s', self._address)
+        self._status = ALDBStatus.LOADING
+        self._start_load()
+        self._syncing = True
+        self._sync_changes = 0
+        targets = [self._mem_addr, self._mem_addrs[0]]
+        targets.extend(sorted(self._dirty - set(targets), reverse=True))
+        self._read_targets = targets
+        self._fill_read_window()
 
     def get(self, mem_addr):
         """Return an All-Link record at a memory address."""
@@ -1267,6 +1237,11 @@ class ALDB():
     def clear(self):
         """Remove all records."""
         self._records.clear()
+        self._mem_addrs.clear()
+        self._links.clear()
+        self._hwm_addrs.clear()
+        self._free_addrs.clear()
+        self._dirty.clear()
 
     # pylint: disable=too-many-locals
     def write_record(self, mem_addr: int, mode: str, group: int, target,
@@ -1304,6 +1279,7 @@ class ALDB():
                                userdata=userdata)
             msg.set_checksum()
             _LOGGER.debug('writing message %s', msg)
+            self._dirty.add(mem_addr)
             self._send_method(msg, self._handle_write_aldb_ack, True)
             self._load_action = LoadAction(mem_addr, 1, 0)
 
@@ -1347,6 +1323,7 @@ class ALDB():
                                userdata=userdata)
             msg.set_checksum()
             _LOGGER.debug('writing message %s', msg)
+            self._dirty.add(mem_addr)
             self._send_method(msg, self._handle_write_aldb_ack, True)
             self._load_action = LoadAction(mem_addr, 1, 0)
 
@@ -1360,41 +1337,85 @@ class ALDB():
         addr:  Inteon address of the linked device
         """
         found_rec = None
-        mode_test = None
         if mode.lower() in ['c', 'r']:
-            link_group = int(group)
-            link_addr = Address(addr)
-            for mem_addr in self:
-                rec = self[mem_addr]
-                if mode.lower() == 'r':
-                    mode_test = rec.control_flags.is_controller
-                else:
-                    mode_test = rec.control_flags.is_responder
-                if (mode_test and
-                        rec.group == link_group and
-                        rec.address == link_addr):
-                    found_rec = rec
+            mem_addrs = self.find_records(addr, group,
+                                          controller=mode.lower() == 'r')
+            if mem_addrs:
+                found_rec = self._records[mem_addrs[-1]]
         return found_rec
 
+    def find_records(self, addr, group, controller=None):
+        """Return the memory addresses of records linking to a device.
+
+        addr: Insteon address the records point to
+        group: All-Link group number
+        controller: True for controller records, False for responder
+                    records or None for both
+
+        The memory addresses are returned highest first.
+        """
+        addr_id = Address(addr).id
+        if controller is None:
+            modes = [True, False]
+        else:
+            modes = [bool(controller)]
+        mem_addrs = []
+        for mode in modes:
+            mem_addrs.extend(self._links.get((addr_id, int(group), mode), ()))
+        mem_addrs.sort(reverse=True)
+        return mem_addrs
+
+    def next_free_mem_addr(self):
+        """Return the memory address to write a new record or None.
+
+        This is the highest record not in use, which is the high water mark
+        record if no record was deleted.
+        """
+        if not self._have_all_records():
+            return None
+        return self._free_addrs[-1]
+
     def record_received(self, msg):
         """Handle ALDB record received from device."""
-        release_lock = False
-        userdata = msg.userdata
-        rec = ALDBRecord.create_from_userdata(userdata)
-        self._records[rec.mem_addr] = rec
+        rec = ALDBRecord.create_from_userdata(msg.userdata)
+        if self._below_high_water_mark(rec.mem_addr):
+            _LOGGER.debug('Ignoring record below the high water mark: %s',
+                          rec)
+            return
+        if self._syncing:
+            self._sync_record(rec)
+        self[rec.mem_addr] = rec
+        self._dirty.discard(rec.mem_addr)
 
         _LOGGER.debug('ALDB Record: %s', rec)
 
-        rec_count = self._load_action.rec_count
-        if rec_count == 1 or self._have_all_records():
-            release_lock = True
-
-        if self._is_first_record(rec):
+        mem_addr = rec.mem_addr
+        if mem_addr not in self._read_window and 0x0000 in self._read_window:
+            # The response to a read of the first record
+            self._mem_addr = mem_addr
+            mem_addr = 0x0000
+        elif self._read_all and not self._records_before(rec.mem_addr):
             self._mem_addr = rec.mem_addr
-
-        if release_lock and self._rec_mgr_lock.locked():
-            _LOGGER.debug('Releasing lock because record received')
-            self._rec_mgr_lock.release()
+        self._read_window.pop(mem_addr, None)
+        timer = self._read_timers.pop(mem_addr, None)
+        if timer is not None:
+            timer.cancel()
+        if self._read_targets:
+            with suppress(ValueError):
+                self._read_targets.remove(mem_addr)
+
+        if not self._loading:
+            return
+        self._load_count += 1
+        self._report_progress()
+        if self._read_all:
+            if self._have_all_records():
+                self._load_complete()
+            else:
+                self._set_read_timer(None, ALDB_RECORD_TIMEOUT,
+                                     self._read_all_timeout)
+        else:
+            self._fill_read_window()
 
     def load_saved_records(self, status, records):
         """Load ALDB records from a set of saved records."""
@@ -1413,23 +1434,15 @@ class ALDB():
             self[int(mem_addr)] = ALDBRecord(int(mem_addr), control_flags,
                                              group, rec_addr,
                                              data1, data2, data3)
-        if self._status == ALDBStatus.LOADED:
-            keys = list(self._records.keys())
-            keys.sort(reverse=True)
-            first_key = keys[0]
-            self._mem_addr = first_key
-
-    # pylint: disable=unused-argument
-    def _handle_read_aldb_ack(self, msg):
-        _LOGGER.debug('Read ALDB directACK received or timeout reached')
-        asyncio.ensure_future(self._read_timeout_manager(), loop=self._loop)
+        if self._status == ALDBStatus.LOADED and self._mem_addrs:
+            self._mem_addr = self._mem_addrs[-1]
 
     def _handle_write_aldb_ack(self, msg):
         if msg:
             _LOGGER.info('Device %s confirmed All-Link record was written',
                          self._address.human)
             try:
-                self._records.pop(self._load_action.mem_addr)
+                self.pop(self._load_action.mem_addr)
             except KeyError:
                 pass
             asyncio.ensure_future(self.load(self._load_action.mem_addr, 1, 0),
@@ -1439,60 +1452,176 @@ class ALDB():
                          'written', self._address.human)
             self._status = self._prior_status
 
-    @asyncio.coroutine
-    def _read_timeout_manager(self):
-        _LOGGER.debug('_read_timeout_manager started.')
-        read_complete = False
-        rec_count = self._load_action.rec_count
-        timeout = ALDB_RECORD_TIMEOUT if rec_count else ALDB_ALL_RECORD_TIMEOUT
-
-        try:
-            with async_timeout.timeout(timeout + self._load_action.retries):
-                _LOGGER.debug('Tring to get lock in _read_timeout_manager.')
-                yield from self._rec_mgr_lock
-                _LOGGER.debug('_read_timeout_manager lock yielded.')
-                read_complete = True
-        except asyncio.TimeoutError:
-            if (self._load_action.rec_count and
-                    self._load_action.mem_addr == 0x0000 and
-                    self._have_first_record()):
-                read_complete = False
-            elif self.get(self._load_action.mem_addr):
-                read_complete = True
-            else:
-                _LOGGER.debug('ALDB record response timeout.')
-                read_complete = False
-
-        self._set_load_action(self._load_action.mem_addr,
-                              self._load_action.rec_count,
-                              self._load_action.retries,
-                              read_complete)
-
-        mem_addr = self._load_action.mem_addr
-        rec_count = self._load_action.rec_count
-        retries = self._load_action.retries
+    def _read_message(self, mem_addr, rec_count):
+        userdata = Userdata({'d1': 0,
+                             'd2': 0,
+                             'd3': mem_addr >> 8,
+                             'd4': mem_addr & 0xff,
+                             'd5': rec_count})
+        msg = ExtendedSend(self._address,
+                           COMMAND_EXTENDED_READ_WRITE_ALDB_0X2F_0X00,
+                           userdata=userdata)
+        msg.set_checksum()
+        return msg
 
-        if self._rec_mgr_lock.locked():
-            self._rec_mgr_lock.release()
+    def _read_all_records(self, retries):
+        if retries:
+            _LOGGER.info('ALDB read all records retry %d of %d', retries,
+                         ALDB_ALL_RECORD_RETRIES)
+        else:
+            _LOGGER.info('ALDB read all records')
+        self._read_all = True
+        self._read_all_retries = retries
+        self._send_method(self._read_message(0x0000, 0),
+                          self._handle_read_all_ack, True)
+
+    def _handle_read_all_ack(self, msg):
+        if msg is None:
+            _LOGGER.debug('No direct ACK for ALDB read all records')
+            self._read_all_timeout()
+        else:
+            self._set_read_timer(None, ALDB_ALL_RECORD_TIMEOUT,
+                                 self._read_all_timeout)
+
+    def _read_all_timeout(self):
+        """Read the missing records one at a time after a read all."""
+        self._read_timers.pop(None, None)
+        if (not self._records and
+                self._read_all_retries < ALDB_ALL_RECORD_RETRIES):
+            self._read_all_records(self._read_all_retries + 1)
+            return
+        _LOGGER.debug('ALDB read all records stopped with %d records',
+                      len(self._records))
+        self._read_all = False
+        self._fill_read_window()
+
+    def _fill_read_window(self):
+        """Send record reads until ALDB_READ_WINDOW reads are outstanding."""
+        if (self._syncing and not self._read_targets and
+                not self._read_window and not self._have_all_records()):
+            _LOGGER.debug('ALDB high water mark moved, reading new records')
+            self._read_targets = None
+        if self._read_targets is None and self._have_all_records():
+            self._load_complete()
+            return
+        if not self._read_stopped:
+            if self._read_targets is None:
+                mem_addrs = self._missing_addresses()
+            else:
+                mem_addrs = list(self._read_targets)
+            for mem_addr in mem_addrs:
+                if len(self._read_window) >= ALDB_READ_WINDOW:
+                    break
+                if mem_addr not in self._read_window:
+                    self._send_read_record(mem_addr, 0)
+        if not self._read_window:
+            self._load_complete()
+
+    def _missing_addresses(self):
+        """Return the memory addresses to read next, highest first."""
+        if not self._have_first_record():
+            yield 0x0000
+            return
+        mem_addr = self._first_gap()
+        while mem_addr >= 0:
+            rec = self._records.get(mem_addr)
+            if rec is None:
+                yield mem_addr
+            elif rec.control_flags.is_high_water_mark:
+                return
+            mem_addr -= 8
+
+    def _send_read_record(self, mem_addr, retries):
+        self._read_window[mem_addr] = retries
+        if retries:
+            _LOGGER.info('ALDB read record %04x retry %d of %d', mem_addr,
+                         retries, ALDB_RECORD_RETRIES)
+        self._send_method(self._read_message(mem_addr, 1),
+                          partial(self._handle_read_record_ack, mem_addr),
+                          True)
+
+    def _handle_read_record_ack(self, mem_addr, msg):
+        if mem_addr not in self._read_window:
+            return
+        if msg is None:
+            _LOGGER.debug('No direct ACK for ALDB read record %04x', mem_addr)
+            self._read_record_timeout(mem_addr)
+        else:
+            self._set_read_timer(mem_addr, ALDB_RECORD_TIMEOUT,
+                                 self._read_record_timeout, mem_addr)
 
-        if mem_addr is not None:
-            asyncio.ensure_future(self.load(mem_addr, rec_count, retries),
-                                  loop=self._loop)
-        elif read_complete or self._have_all_records():
+    def _read_record_timeout(self, mem_addr):
+        self._read_timers.pop(mem_addr, None)
+        retries = self._read_window.pop(mem_addr, None)
+        if retries is None:
+            return
+        if retries < ALDB_RECORD_RETRIES:
+            self._send_read_record(mem_addr, retries + 1)
+            return
+        _LOGGER.debug('ALDB record %04x response timeout', mem_addr)
+        self._read_stopped = True
+        if not self._read_window:
+            self._load_complete()
+
+    def _set_read_timer(self, key, timeout, callback, *args):
+        timer = self._read_timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        self._read_timers[key] = self._loop.call_later(timeout, callback,
+                                                       *args)
+
+    def _start_load(self):
+        self._loading = True
+        self._read_stopped = False
+        self._load_started = time.monotonic()
+        self._load_count = 0
+
+    def _sync_record(self, rec):
+        """Compare a record read during a sync to the loaded record."""
+        cached = self._records.get(rec.mem_addr)
+        if cached == rec:
+            return
+        self._sync_changes += 1
+        _LOGGER.debug('ALDB record %04x changed', rec.mem_addr)
+        if rec.mem_addr == self._mem_addr and cached is not None:
+            _LOGGER.info('ALDB first record changed, reading all records')
+            self.clear()
+            self._read_targets = None
+
+    def _report_progress(self):
+        elapsed = time.monotonic() - self._load_started
+        rate = self._load_count / elapsed if elapsed else 0.0
+        for callback in self._cb_aldb_progress:
+            callback(self._load_count, rate)
+
+    def _load_complete(self):
+        if self._syncing:
+            _LOGGER.info('ALDB sync found %d changed records for device %s',
+                         self._sync_changes, self._address)
+        if self._have_all_records():
             _LOGGER.info('All-Link Database load complete for device %s',
                          self._address)
             self._load_finished(ALDBStatus.LOADED)
+        elif self._read_targets is not None and not self._read_stopped:
+            self._load_finished(ALDBStatus.LOADED)
+        elif self._records:
+            _LOGGER.warning('Insteon All-Link Database partially loaded '
+                            'for device %s', self._address)
+            self._load_finished(ALDBStatus.PARTIAL)
         else:
-            if self._records:
-                _LOGGER.warning('Insteon All-Link Database partially loaded '
-                                'for device %s', self._address)
-                self._load_finished(ALDBStatus.PARTIAL)
-            else:
-                _LOGGER.warning('Insteon All-Link Database  failed to load '
-                                'for device %s', self._address)
-                self._load_finished(ALDBStatus.FAILED)
+            _LOGGER.warning('Insteon All-Link Database  failed to load '
+                            'for device %s', self._address)
+            self._load_finished(ALDBStatus.FAILED)
 
     def _load_finished(self, status):
+        for timer in self._read_timers.values():
+            timer.cancel()
+        self._read_timers.clear()
+        self._read_window.clear()
+        self._read_all = False
+        self._read_targets = None
+        self._loading = False
+        self._syncing = False
         self._status = status
         while self._cb_aldb_loaded:
             _LOGGER.debug('Calling aldb loaded callback')
@@ -1501,70 +1630,60 @@ class ALDB():
                 callback()
         self._load_action = LoadAction(0, 0, 0)
 
-    def _set_load_action(self, mem_addr, rec_count, retries,
-                         read_complete=False):
-        """Calculate the next record to read.
-
-        If the last record was successful and one record was being read then
-        look for the next record until we get to the high water mark.
-
-        If the last read was successful and all records were being read then
-        look for the first record.
-
-        if the last read was unsuccessful and one record was being read then
-        repeat the last read until max retries
-
-        If the last read was unsuccessful and all records were being read then
-        repeat the last read until max retries or look for the first record.
+    def _index_record(self, mem_addr, record):
+        bisect.insort(self._mem_addrs, mem_addr)
+        flags = record.control_flags
+        link = (record.address.id, record.group, flags.is_controller)
+        self._links.setdefault(link, set()).add(mem_addr)
+        if flags.is_high_water_mark:
+            bisect.insort(self._hwm_addrs, mem_addr)
+        if not flags.is_in_use:
+            bisect.insort(self._free_addrs, mem_addr)
+
+    def _unindex_record(self, mem_addr, record=None):
+        if record is None:
+            record = self._records[mem_addr]
+        _remove_sorted(self._mem_addrs, mem_addr)
+        flags = record.control_flags
+        link = (record.address.id, record.group, flags.is_controller)
+        mem_addrs = self._links.get(link)
+        if mem_addrs is not None:
+            mem_addrs.discard(mem_addr)
+            if not mem_addrs:
+                self._links.pop(link)
+        if flags.is_high_water_mark:
+            _remove_sorted(self._hwm_addrs, mem_addr)
+        if not flags.is_in_use:
+            _remove_sorted(self._free_addrs, mem_addr)
+
+    def _records_before(self, mem_addr):
+        """Test if a record above a memory address is loaded."""
+        return bool(self._mem_addrs) and self._mem_addrs[-1] > mem_addr
+
+    def _below_high_water_mark(self, mem_addr):
+        return bool(self._hwm_addrs) and self._hwm_addrs[-1] > mem_addr
+
+    def _first_gap(self):
+        """Return the highest missing memory address below the first record.
+
+        The records are contiguous from the first record down to the gap, so
+        the gap is found with a binary search of the sorted memory addresses.
         """
-        if self._have_all_records():
-            mem_addr = None
-            rec_count = 0
-            retries = 0
-        elif read_complete:
-            retries = 0
-            if rec_count:
-                mem_addr = self._next_address(mem_addr)
-            else:
-                mem_addr = self._next_address(mem_addr)
-                rec_count = 1
-                retries = 0
-        elif rec_count and retries < ALDB_RECORD_RETRIES:
-            retries = retries + 1
-        elif not rec_count and retries < ALDB_ALL_RECORD_RETRIES:
-            retries = retries + 1
-        elif not rec_count and retries >= ALDB_ALL_RECORD_RETRIES:
-            mem_addr = self._next_address(mem_addr)
-            rec_count = 1
-            retries = 0
-        else:
-            mem_addr = None
-            rec_count = 0
-            retries = 0
-
-        self._load_action = LoadAction(mem_addr, rec_count, retries)
-        if mem_addr is not None:
-            _LOGGER.debug('Load action: addr: %04x rec_count: %d retries: %d',
-                          self._load_action.mem_addr,
-                          self._load_action.rec_count,
-                          self._load_action.retries)
-
-    def _next_address(self, mem_addr):
-        if self._have_first_record() and mem_addr == 0x0000:
-            mem_addr = self._mem_addr
-        while self.get(mem_addr):
-            if self.get(mem_addr).control_flags.is_high_water_mark:
-                mem_addr = None
+        keys = self._mem_addrs
+        low = 0
+        high = len(keys)
+        while low < high:
+            mid = (low + high) // 2
+            if keys[len(keys) - 1 - mid] == self._mem_addr - 8 * mid:
+                low = mid + 1
             else:
-                mem_addr = mem_addr - 8
-        return mem_addr
+                high = mid
+        return self._mem_addr - 8 * low
 
     def _have_first_record(self):
         have_first_record = False
-        if self._records:
-            keys = list(self._records.keys())
-            keys.sort(reverse=True)
-            first_key = int(keys[0])
+        if self._mem_addrs:
+            first_key = self._mem_addrs[-1]
             if first_key == self._mem_addr:
                 have_first_record = True
             elif first_key == 0x0fff:
@@ -1573,41 +1692,15 @@ class ALDB():
         return have_first_record
 
     def _have_last_record(self):
-        have_last_record = False
-        if self._records:
-            keys = list(self._records.keys())
-            keys.sort(reverse=False)
-            last_key = keys[0]
-            if self[last_key].control_flags.is_high_water_mark:
-                have_last_record = True
-        return have_last_record
-
-    def _is_first_record(self, rec):
-        is_first_record = False
-        mem_addr = self._load_action.mem_addr
-        rec_count = self._load_action.rec_count
-        if rec_count and mem_addr == 0x0000:
-            is_first_record = True
-        elif self._mem_addr == rec.mem_addr:
-            is_first_record = True
-        elif (self._mem_addr == 0x0000 and
-              rec.mem_addr == 0x0fff):
-            is_first_record = True
-        return is_first_record
+        return bool(self._mem_addrs) and self._records[
+            self._mem_addrs[0]].control_flags.is_high_water_mark
 
     def _have_all_records(self):
-        have_all_recs = False
-        if self._have_first_record() and self._have_last_record():
-            prev_mem_addr = None
-            for mem_addr in self:
-                if not prev_mem_addr:
-                    prev_mem_addr = mem_addr
-                elif mem_addr == (prev_mem_addr - 8):
-                    if self[mem_addr].control_flags.is_high_water_mark:
-                        have_all_recs = True
-                    else:
-                        prev_mem_addr = mem_addr
-                else:
-                    have_all_recs = False
-                    break
-        return have_all_recs
+        if not (self._have_first_record() and self._have_last_record()):
+            return False
+        # The records from the first record to the high water mark are
+        # contiguous if their count matches the memory range
+        hwm = self._hwm_addrs[-1]
+        count = len(self._mem_addrs) - bisect.bisect_left(self._mem_addrs,
+                                                          hwm)
+        return count == (self._mem_addr - hwm) // 8 + 1
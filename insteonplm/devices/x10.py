@@ -31,14 +31,16 @@ class X10OnOff(X10Device):
 class X10Dimmable(X10Device):
     """General X10 Dimmable Switch Device Class."""
 
-    def __init__(self, plm, housecode, unitcode, dim_steps=22):
+    # pylint: disable=too-many-arguments
+    def __init__(self, plm, housecode, unitcode, dim_steps=22,
+                 preset_dim=False):
         """Init the X10Dimmable class."""
         super().__init__(plm, housecode, unitcode)
         self._description = 'X10 Dimmable Device'
 
         self._stateList[0x01] = X10DimmableSwitch(
             self._address, "x10DimmableSwitch", 0x01, self._send_msg,
-            self._message_callbacks, 0x00, dim_steps)
+            self._message_callbacks, 0x00, dim_steps, preset_dim)
 
 
 class X10Sensor(X10Device):
@@ -0,0 +1,117 @@
+"""Store device information between sessions."""
+import json
+import logging
+import os
+import sqlite3
+
+__all__ = ('DeviceInfoStore')
+_LOGGER = logging.getLogger(__name__)
+DEVICE_INFO_FILE = 'insteon_plm_device_info.dat'
+DEVICE_STORE_FILE = 'insteon_plm_device_info.db'
+
+_CREATE_TABLE = ('CREATE TABLE IF NOT EXISTS devices ('
+                 'address TEXT PRIMARY KEY, cat INTEGER, subcat INTEGER, '
+                 'product_key INTEGER, aldb_status INTEGER, aldb TEXT)')
+_SELECT_INDEX = ('SELECT address, cat, subcat, product_key, aldb_status '
+                 'FROM devices')
+_SELECT_ALDB = 'SELECT address, aldb FROM devices WHERE address IN ({})'
+_REPLACE_DEVICE = ('INSERT OR REPLACE INTO devices (address, cat, subcat, '
+                   'product_key, aldb_status, aldb) VALUES (?, ?, ?, ?, ?, ?)')
+
+
+class DeviceInfoStore():
+    """SQLite file of the device information saved in the working directory.
+
+    Each device is a row so only changed devices are written. Every write
+    is a single transaction, so the file always holds either the old or
+    the new device information. The methods block and are expected to be
+    run in an executor.
+
+    Device information saved by earlier versions in the JSON device info
+    file is imported when the store is first created.
+    """
+
+    def __init__(self, workdir):
+        """Init the DeviceInfoStore class."""
+        self._path = os.path.join(workdir, DEVICE_STORE_FILE)
+        self._legacy_path = os.path.join(workdir, DEVICE_INFO_FILE)
+
+    @property
+    def path(self):
+        """Return the path of the store file."""
+        return self._path
+
+    def load_index(self):
+        """Return the list of saved device information without the ALDB."""
+        self._import_legacy()
+        rows = self._query(_SELECT_INDEX)
+        return [{'address': address,
+                 'cat': cat,
+                 'subcat': subcat,
+                 'product_key': product_key,
+                 'aldb_status': aldb_status}
+                for address, cat, subcat, product_key, aldb_status in rows]
+
+    def load_aldb(self, addresses):
+        """Return the saved ALDB records of devices by device address."""
+        addresses = list(addresses)
+        query = _SELECT_ALDB.format(', '.join('?' * len(addresses)))
+        rows = self._query(query, addresses)
+        return {address: json.loads(aldb) if aldb else {}
+                for address, aldb in rows}
+
+    def write(self, devices):
+        """Write the information of changed devices in one transaction."""
+        rows = [(device['address'], device.get('cat'), device.get('subcat'),
+                 device.get('product_key', device.get('firmware')),
+                 device.get('aldb_status', 0),
+                 json.dumps(device.get('aldb', {})))
+                for device in devices]
+        try:
+            conn = self._connect()
+            try:
+                with conn:
+                    conn.executemany(_REPLACE_DEVICE, rows)
+            finally:
+                conn.close()
+        except sqlite3.Error as err:
+            _LOGGER.error('Cannot write device info to %s: %s',
+                          self._path, err)
+            return False
+        _LOGGER.debug('Wrote %d devices to %s', len(rows), self._path)
+        return True
+
+    def _query(self, query, params=()):
+        try:
+            conn = self._connect()
+            try:
+                return conn.execute(query, params).fetchall()
+            finally:
+                conn.close()
+        except sqlite3.Error as err:
+            _LOGGER.error('Cannot read device info from %s: %s',
+                          self._path, err)
+            return []
+
+    def _connect(self):
+        conn = sqlite3.connect(self._path)
+        conn.execute(_CREATE_TABLE)
+        return conn
+
+    def _import_legacy(self):
+        if not os.path.exists(self._path):
+            devices = self._load_legacy()
+            if devices:
+                self.write(devices)
+
+    def _load_legacy(self):
+        try:
+            with open(self._legacy_path, 'r') as infile:
+                devices = json.load(infile)
+                _LOGGER.debug("Saved device file loaded")
+                return devices
+        except FileNotFoundError:
+            _LOGGER.debug("Saved device file not found")
+        except json.decoder.JSONDecodeError:
+            _LOGGER.debug("Loading saved device file failed")
+        return []
@@ -0,0 +1,73 @@
+"""Suppress duplicate All-Link broadcast and cleanup messages."""
+from collections import OrderedDict
+import logging
+import time
+
+from insteonplm.constants import (MESSAGE_EXTENDED_MESSAGE_RECEIVED_0X51,
+                                  MESSAGE_STANDARD_MESSAGE_RECEIVED_0X50)
+
+__all__ = ('DuplicateFilter')
+_LOGGER = logging.getLogger(__name__)
+DUPLICATE_WINDOW = 0.5
+DUPLICATE_MAX_SIZE = 256
+
+
+class DuplicateFilter():
+    """Drop repeated All-Link messages received within a time window.
+
+    Devices send an All-Link broadcast and its cleanup messages several
+    times. The first message of a device, command and group is kept for
+    window seconds and later copies in that time are reported as
+    duplicates. Direct messages are never duplicates.
+
+    Entries are kept in the order they were received so expired entries
+    are removed from the front. At most max_size entries are kept.
+    """
+
+    def __init__(self, window=DUPLICATE_WINDOW, max_size=DUPLICATE_MAX_SIZE):
+        """Init the DuplicateFilter class."""
+        self._window = window
+        self._max_size = max_size
+        self._recent = OrderedDict()
+        self._dropped = 0
+
+    def __len__(self):
+        """Return the number of recent messages kept."""
+        return len(self._recent)
+
+    @property
+    def dropped(self):
+        """Return the number of duplicate messages dropped."""
+        return self._dropped
+
+    def is_duplicate(self, msg):
+        """Test if a message is a copy of a recent All-Link message."""
+        if msg.code not in [MESSAGE_STANDARD_MESSAGE_RECEIVED_0X50,
+                            MESSAGE_EXTENDED_MESSAGE_RECEIVED_0X51]:
+            return False
+        flags = msg.flags
+        if flags.isAllLinkBroadcast:
+            group = msg.target.bytes[2]
+        elif flags.isAllLinkCleanup:
+            group = msg.cmd2
+        else:
+            return False
+
+        now = time.monotonic()
+        self._expire(now)
+        key = (msg.address.id, msg.cmd1, group)
+        if key in self._recent:
+            self._dropped += 1
+            return True
+        if len(self._recent) >= self._max_size:
+            self._recent.popitem(last=False)
+        self._recent[key] = now + self._window
+        return False
+
+    def _expire(self, now):
+        recent = self._recent
+        while recent:
+            key = next(iter(recent))
+            if recent[key] > now:
+                break
+            del recent[key]
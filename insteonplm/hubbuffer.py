@@ -0,0 +1,90 @@
+"""Decode the Insteon Hub message buffer."""
+import binascii
+import logging
+
+from insteonplm.constants import MESSAGE_START_CODE_0X02
+from insteonplm.messages import MessageFramer
+
+__all__ = ('HubBuffer')
+_LOGGER = logging.getLogger(__name__)
+
+HUB_BUFFER_SIZE = 100
+HUB_BUFFER_START = '<BS>'
+HUB_BUFFER_END = '</BS>'
+_EMPTY_BUFFER = bytes(HUB_BUFFER_SIZE)
+
+
+class HubBuffer():
+    """Decoder of the buffstatus.xml response of the Insteon Hub.
+
+    The Hub 2245 returns its 100 byte circular buffer as 200 hex characters
+    followed by the write index in hex characters. The read cursor is kept
+    as a byte offset into the buffer and only the bytes written since the
+    last read are returned.
+
+    The Hub 2242 buffer has no index. The buffer is rotated to start at the
+    first message and the complete messages are returned when the buffer
+    changes.
+    """
+
+    def __init__(self):
+        """Init the HubBuffer class."""
+        self._cursor = 0
+        self._last_buffer = None
+
+    @property
+    def cursor(self):
+        """Return the buffer offset of the next byte to read."""
+        return self._cursor
+
+    def reset(self, cursor=0):
+        """Reset the read cursor after the Hub buffer was cleared."""
+        self._cursor = cursor
+
+    def decode(self, html):
+        """Return the new bytes in a buffstatus.xml response or None."""
+        start = html.find(HUB_BUFFER_START)
+        end = html.find(HUB_BUFFER_END, start)
+        if start < 0 or end < 0:
+            _LOGGER.debug('Hub buffer not found in response')
+            return None
+        text = html[start + len(HUB_BUFFER_START):end].strip()
+        try:
+            if len(text) == HUB_BUFFER_SIZE * 2 + 2:
+                return self._decode_indexed(
+                    binascii.unhexlify(text[:-2]), int(text[-2:], 16) // 2)
+            return self._decode_unindexed(binascii.unhexlify(text))
+        except (binascii.Error, ValueError):
+            _LOGGER.debug('Invalid Hub buffer: %s', text)
+            return None
+
+    def _decode_indexed(self, buffer, stop):
+        if buffer == _EMPTY_BUFFER or stop > HUB_BUFFER_SIZE:
+            # Likely the buffer was cleared
+            return None
+        cursor = self._cursor
+        self._cursor = stop
+        if stop > cursor:
+            _LOGGER.debug('Buffer from %d to %d', cursor, stop)
+            return buffer[cursor:stop]
+        if stop < cursor:
+            _LOGGER.debug('Buffer from %d to %d and 0 to %d',
+                          cursor, HUB_BUFFER_SIZE, stop)
+            buffer_hi = buffer[cursor:]
+            if buffer_hi.count(0) == len(buffer_hi):
+                # The buffer was probably reset since the last read
+                return buffer[:stop] or None
+            return buffer_hi + buffer[:stop]
+        return None
+
+    def _decode_unindexed(self, buffer):
+        if buffer == self._last_buffer:
+            return None
+        self._last_buffer = buffer
+        pos = buffer.find(MESSAGE_START_CODE_0X02)
+        if pos < 0:
+            return None
+        buffer = buffer[pos:] + buffer[:pos]
+        framer = MessageFramer()
+        framer.feed(buffer)
+        return buffer[:len(buffer) - len(framer)] or None
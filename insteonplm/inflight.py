@@ -0,0 +1,171 @@
+"""Track direct messages waiting for a direct ACK from a device."""
+from collections import deque
+import heapq
+import logging
+
+from insteonplm.sendqueue import coalesce_key, message_priority
+
+__all__ = ('InFlightTracker')
+_LOGGER = logging.getLogger(__name__)
+DIRECT_ACK_WAIT_TIMEOUT = 3
+
+
+# pylint: disable=too-few-public-methods
+class InFlightMessage():
+    """A message sent to a device and waiting for its direct ACK."""
+
+    __slots__ = ('msg', 'callback', 'on_timeout', 'key', 'priority',
+                 'deadline')
+
+    def __init__(self, msg, callback, on_timeout, key, priority):
+        """Init the InFlightMessage class."""
+        self.msg = msg
+        self.callback = callback
+        self.on_timeout = on_timeout
+        self.key = key
+        self.priority = priority
+        self.deadline = None
+
+
+class InFlightTracker():
+    """Modem level table of messages waiting for a device direct ACK.
+
+    Only one message with a callback is in flight per device address.
+    Later messages to the same device wait in a pending list created when
+    needed, ordered by message priority. The direct ACK timeout starts when
+    the modem ACKs the message and all timeouts share a single timer on the
+    event loop.
+
+    Parameters:
+        send_method: callable used to place a message on the modem send queue
+        loop: asyncio event loop
+        timeout: seconds to wait for the direct ACK after the modem ACK
+
+    """
+
+    def __init__(self, send_method, loop=None,
+                 timeout=DIRECT_ACK_WAIT_TIMEOUT):
+        """Init the InFlightTracker class."""
+        self._send_method = send_method
+        self._loop = loop
+        self._timeout = timeout
+        self._in_flight = {}
+        self._pending = {}
+        self._keys = {}
+        self._deadlines = []
+        self._timer = None
+        self._coalesced = 0
+
+    def __len__(self):
+        """Return the number of messages waiting for a direct ACK."""
+        return len(self._in_flight)
+
+    def __contains__(self, addr):
+        """Test if a message to the device address is in flight."""
+        return addr in self._in_flight
+
+    @property
+    def pending(self):
+        """Return the number of messages waiting to be sent."""
+        return sum(len(queue) for queue in self._pending.values())
+
+    @property
+    def coalesced(self):
+        """Return the number of pending messages replaced by a later one."""
+        return self._coalesced
+
+    def send(self, msg, callback=None, on_timeout=False):
+        """Send a message to a device.
+
+        If callback is given it is called with the direct ACK message, or
+        with None after a timeout if on_timeout is True. Returns False if
+        the message replaced a pending message instead of being added.
+        """
+        addr = msg.address.id
+        key = coalesce_key(msg, callback)
+        if key is not None and key in self._keys:
+            entry = self._keys[key]
+            entry.msg = msg
+            entry.callback = callback
+            entry.on_timeout = on_timeout
+            self._coalesced += 1
+            _LOGGER.debug('Coalesced pending message %s', key)
+            return False
+        entry = InFlightMessage(msg, callback, on_timeout, key,
+                                message_priority(msg))
+        if addr in self._in_flight:
+            if key is not None:
+                self._keys[key] = entry
+            queue = self._pending.setdefault(addr, deque())
+            index = len(queue)
+            while index and queue[index - 1].priority > entry.priority:
+                index -= 1
+            queue.insert(index, entry)
+        else:
+            self._start(addr, entry)
+        return True
+
+    def message_received(self, msg):
+        """Match a received message to the message in flight.
+
+        The modem ACK of the message starts the direct ACK timeout and the
+        direct ACK from the device completes the message.
+        """
+        if not hasattr(msg, 'address'):
+            return
+        entry = self._in_flight.get(msg.address.id)
+        if entry is None:
+            return
+        if getattr(msg, 'isack', False):
+            if entry.deadline is None:
+                entry.deadline = self._loop.time() + self._timeout
+                heapq.heappush(self._deadlines,
+                               (entry.deadline, msg.address.id))
+                if self._timer is None:
+                    self._schedule_timer()
+        elif (hasattr(msg, 'flags') and
+              hasattr(msg.flags, 'isDirectACK') and
+              msg.flags.isDirectACK):
+            _LOGGER.debug('Got Direct ACK message')
+            self._complete(msg.address.id, msg)
+
+    def _start(self, addr, entry):
+        self._send_method(entry.msg)
+        if entry.callback is not None:
+            self._in_flight[addr] = entry
+        else:
+            self._send_next(addr)
+
+    def _send_next(self, addr):
+        queue = self._pending.get(addr)
+        if not queue:
+            return
+        entry = queue.popleft()
+        if not queue:
+            self._pending.pop(addr)
+        if entry.key is not None:
+            self._keys.pop(entry.key)
+        self._start(addr, entry)
+
+    def _complete(self, addr, msg):
+        entry = self._in_flight.pop(addr)
+        self._send_next(addr)
+        if msg is not None or entry.on_timeout:
+            entry.callback(msg)
+
+    def _schedule_timer(self):
+        if self._deadlines:
+            self._timer = self._loop.call_at(self._deadlines[0][0],
+                                             self._expire)
+
+    def _expire(self):
+        self._timer = None
+        now = self._loop.time()
+        while self._deadlines and self._deadlines[0][0] <= now:
+            deadline, addr = heapq.heappop(self._deadlines)
+            entry = self._in_flight.get(addr)
+            if entry is not None and entry.deadline == deadline:
+                _LOGGER.debug('No direct ACK messages received from %s',
+                              addr)
+                self._complete(addr, None)
+        self._schedule_timer()
@@ -1,16 +1,19 @@
 """Module to maintain PLM state information and network interface."""
 
 import asyncio
-import json
+from collections import OrderedDict
+from functools import partial
 import logging
 
 from insteonplm.address import Address
 import insteonplm.devices
 from insteonplm.devices import Device, X10Device
+from insteonplm.devicestore import DeviceInfoStore
 
 __all__ = ('ALDB')
 _LOGGER = logging.getLogger(__name__)
-DEVICE_INFO_FILE = 'insteon_plm_device_info.dat'
+SAVE_DEVICE_INFO_DELAY = 1
+HYDRATE_BATCH_SIZE = 50
 
 
 # pylint: disable=too-many-instance-attributes
@@ -19,27 +22,37 @@ class LinkedDevices():
 
     def __init__(self, loop=None, workdir=None):
         """Instantiate the ALL-Link Database object."""
-        self._loop = loop
+        self._loop = loop if loop else asyncio.get_event_loop()
         self._workdir = workdir
+        self._store = DeviceInfoStore(workdir) if workdir else None
+        self._dirty = set()
+        self._save_handle = None
+        self._save_future = None
 
         self._state = 'empty'
         self._devices = {}
         self._cb_new_device = []
         self._overrides = {}
         self._saved_devices = {}
+        self._known_devices = OrderedDict()
+        self._hydrate_task = None
+        self._aldb_load_tasks = set()
 
     def __len__(self):
         """Return the number of devices in the ALDB."""
-        return len(self._devices)
+        return len(self._devices) + len(self._known_devices)
 
     def __iter__(self):
         """Iterate through each ALDB device record."""
-        for device in self._devices:
+        for device in list(self._devices) + list(self._known_devices):
             yield device
 
     def __getitem__(self, address):
         """Fetch a device from the ALDB."""
-        return self._devices.get(address, None)
+        device = self._devices.get(address, None)
+        if device is None and address in self._known_devices:
+            device = self._hydrate_device(address)
+        return device
 
     def __setitem__(self, key, device):
         """Add or Update a device in the ALDB."""
@@ -48,6 +61,7 @@ class LinkedDevices():
             raise ValueError
 
         self._devices[key] = device
+        self._dirty.add(key)
 
         if device.address.is_x10:
             _LOGGER.debug('New X10 Device %r: %s', key, device.description)
@@ -134,27 +148,20 @@ class LinkedDevices():
         return override
 
     def add_known_devices(self, plm):
-        """Add devices from the saved devices or from the device overrides."""
-        from insteonplm.devices import ALDBStatus
+        """Add devices from the saved devices or from the device overrides.
+
+        Saved devices are created when they are first fetched or by a
+        background task that creates them in batches.
+        """
         for addr in self._saved_devices:
             if not self._devices.get(addr):
-                saved_device = self._saved_devices.get(Address(addr).id, {})
-                cat = saved_device.get('cat')
-                subcat = saved_device.get('subcat')
-                product_key = saved_device.get('firmware')
-                product_key = saved_device.get('product_key', product_key)
-                device = self.create_device_from_category(
-                    plm, addr, cat, subcat, product_key)
-                if device:
-                    _LOGGER.debug('Device with id %s added to device list '
-                                  'from saved device data.', addr)
-                    aldb_status = saved_device.get('aldb_status', 0)
-                    device.aldb.status = ALDBStatus(aldb_status)
-                    aldb = saved_device.get('aldb', {})
-                    device.aldb.load_saved_records(aldb_status, aldb)
-                    self[addr] = device
+                self._known_devices[addr] = plm
+        if self._known_devices and self._hydrate_task is None:
+            self._hydrate_task = asyncio.ensure_future(
+                self._hydrate_known_devices(), loop=self._loop)
         for addr in self._overrides:
-            if not self._devices.get(addr):
+            if (not self._devices.get(addr) and
+                    addr not in self._known_devices):
                 device_override = self._overrides.get(Address(addr).id, {})
                 cat = device_override.get('cat')
                 subcat = device_override.get('subcat')
@@ -167,35 +174,147 @@ class LinkedDevices():
                                   'from device override data.', addr)
                     self[addr] = device
 
+    @asyncio.coroutine
+    def _hydrate_known_devices(self):
+        """Create the saved devices not fetched yet in batches."""
+        while self._known_devices:
+            batch = list(self._known_devices)[:HYDRATE_BATCH_SIZE]
+            records = {}
+            if self._store is not None:
+                records = yield from self._loop.run_in_executor(
+                    None, self._store.load_aldb, batch)
+            for addr in batch:
+                if addr in self._known_devices:
+                    self._hydrate_device(addr, records.get(addr, {}))
+            yield from asyncio.sleep(0, loop=self._loop)
+        self._hydrate_task = None
+        _LOGGER.debug('Saved devices created')
+
+    def _hydrate_device(self, addr, aldb=None):
+        """Create a saved device and load its saved ALDB records."""
+        from insteonplm.devices import ALDBStatus
+        plm = self._known_devices.pop(addr)
+        saved_device = self._saved_devices.get(addr, {})
+        cat = saved_device.get('cat')
+        subcat = saved_device.get('subcat')
+        product_key = saved_device.get('firmware')
+        product_key = saved_device.get('product_key', product_key)
+        device = self.create_device_from_category(
+            plm, addr, cat, subcat, product_key)
+        if device:
+            _LOGGER.debug('Device with id %s added to device list '
+                          'from saved device data.', addr)
+            if aldb is None:
+                aldb = saved_device.get('aldb')
+            aldb_status = saved_device.get('aldb_status', 0)
+            if aldb is None and self._store is not None:
+                # Never read the store on the event loop
+                task = asyncio.ensure_future(
+                    self._load_saved_aldb(device, aldb_status),
+                    loop=self._loop)
+                self._aldb_load_tasks.add(task)
+                task.add_done_callback(self._aldb_load_tasks.discard)
+            else:
+                device.aldb.status = ALDBStatus(aldb_status)
+                device.aldb.load_saved_records(aldb_status, aldb or {})
+            self[addr] = device
+            self._dirty.discard(addr)
+        return device
+
+    @asyncio.coroutine
+    def _load_saved_aldb(self, device, aldb_status):
+        """Load the saved ALDB records of a device created on access."""
+        from insteonplm.devices import ALDBStatus
+        addr = device.address.id
+        records = yield from self._loop.run_in_executor(
+            None, self._store.load_aldb, [addr])
+        if device.aldb.status != ALDBStatus.EMPTY or device.aldb:
+            # The ALDB was read from the device in the meantime
+            return
+        device.aldb.load_saved_records(aldb_status, records.get(addr, {}))
+
     # Save device information
-    def save_device_info(self):
-        """Save all device information to the device info file."""
-        if self._workdir is not None:
-            devices = []
-            for addr in self._devices:
-                device = self._devices.get(addr)
-                if not device.address.is_x10:
-                    aldb = {}
-                    for mem in device.aldb:
-                        rec = device.aldb[mem]
-                        if rec:
-                            aldbRec = {'memory': mem,
-                                       'control_flags': rec.control_flags.byte,
-                                       'group': rec.group,
-                                       'address': rec.address.id,
-                                       'data1': rec.data1,
-                                       'data2': rec.data2,
-                                       'data3': rec.data3}
-                            aldb[mem] = aldbRec
-                    deviceInfo = {'address': device.address.id,
-                                  'cat': device.cat,
-                                  'subcat': device.subcat,
-                                  'product_key': device.product_key,
-                                  'aldb_status': device.aldb.status.value,
-                                  'aldb': aldb}
-                    devices.append(deviceInfo)
-            asyncio.ensure_future(self._write_saved_device_info(devices),
-                                  loop=self._loop)
+    def save_device_info(self, address=None):
+        """Save the device information of changed devices.
+
+        Devices added since the last save and the device with the given
+        address are written to the device info store. Saves requested within
+        SAVE_DEVICE_INFO_DELAY seconds are written together.
+        """
+        if address is not None:
+            self._dirty.add(address)
+        if self._store is None or self._save_handle is not None:
+            return
+        self._save_handle = self._loop.call_later(SAVE_DEVICE_INFO_DELAY,
+                                                  self._save_dirty_devices)
+
+    @asyncio.coroutine
+    def flush_device_info(self):
+        """Write any pending device information and wait for the write."""
+        if self._save_handle is not None:
+            self._save_handle.cancel()
+            self._save_handle = None
+        if self._save_future is not None:
+            yield from self._save_future
+        if self._store is not None and self._dirty:
+            self._save_dirty_devices()
+            yield from self._save_future
+
+    def _save_dirty_devices(self):
+        self._save_handle = None
+        if self._save_future is not None and not self._save_future.done():
+            # Only one write at a time, save again when it completes
+            self.save_device_info()
+            return
+        devices = []
+        addresses = set()
+        for addr in self._dirty:
+            device = self._devices.get(addr)
+            if device is not None and not device.address.is_x10:
+                devices.append(self._device_info(device))
+                addresses.add(addr)
+        self._dirty.clear()
+        if devices:
+            self._save_future = self._loop.run_in_executor(
+                None, self._store.write, devices)
+            self._save_future.add_done_callback(
+                partial(self._device_info_written, addresses))
+
+    def _device_info_written(self, addresses, future):
+        """Save the devices again if writing them to the store failed."""
+        if (not future.cancelled() and future.exception() is None and
+                future.result()):
+            return
+        _LOGGER.warning('Saving %d devices failed, retrying',
+                        len(addresses))
+        self._dirty.update(addresses)
+        self.save_device_info()
+
+    @staticmethod
+    def _device_info(device):
+        from insteonplm.devices import ALDBStatus
+        aldb = {}
+        for mem in device.aldb:
+            rec = device.aldb[mem]
+            if rec:
+                aldbRec = {'memory': mem,
+                           'control_flags': rec.control_flags.byte,
+                           'group': rec.group,
+                           'address': rec.address.id,
+                           'data1': rec.data1,
+                           'data2': rec.data2,
+                           'data3': rec.data3}
+                aldb[mem] = aldbRec
+        aldb_status = device.aldb.status
+        if aldb_status == ALDBStatus.LOADING:
+            # Saved during a load, the next load reads the missing records
+            aldb_status = ALDBStatus.PARTIAL if aldb else ALDBStatus.EMPTY
+        return {'address': device.address.id,
+                'cat': device.cat,
+                'subcat': device.subcat,
+                'product_key': device.product_key,
+                'aldb_status': aldb_status.value,
+                'aldb': aldb}
 
     def _add_saved_device_info(self, **kwarg):
         """Register device info from the saved data file."""
@@ -205,31 +324,12 @@ class LinkedDevices():
 
     @asyncio.coroutine
     def load_saved_device_info(self):
-        """Load device information from the device info file."""
+        """Load device information from the device info store."""
         _LOGGER.debug("Loading saved device info.")
         deviceinfo = []
-        if self._workdir:
+        if self._store is not None:
             _LOGGER.debug("Really Loading saved device info.")
-            try:
-                device_file = '{}/{}'.format(self._workdir, DEVICE_INFO_FILE)
-                with open(device_file, 'r') as infile:
-                    try:
-                        deviceinfo = json.load(infile)
-                        _LOGGER.debug("Saved device file loaded")
-                    except json.decoder.JSONDecodeError:
-                        _LOGGER.debug("Loading saved device file failed")
-            except FileNotFoundError:
-                _LOGGER.debug("Saved device file not found")
+            deviceinfo = yield from self._loop.run_in_executor(
+                None, self._store.load_index)
         for device in deviceinfo:
             self._add_saved_device_info(**device)
-
-    @asyncio.coroutine
-    def _write_saved_device_info(self, devices):
-        if self._workdir:
-            _LOGGER.debug('Writing %d devices to save file', len(devices))
-            device_file = '{}/{}'.format(self._workdir, DEVICE_INFO_FILE)
-            try:
-                with open(device_file, 'w') as outfile:
-                    json.dump(devices, outfile)
-            except FileNotFoundError:
-                _LOGGER.error('Cannot write to file %s', device_file)
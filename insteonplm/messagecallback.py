@@ -2,6 +2,9 @@
 
 import logging
 
+from insteonplm.address import Address
+from insteonplm.messages.messageFlags import MessageFlags
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -24,11 +27,18 @@ class MessageCallback():
 
     The above example is an inbound Standard Receive message (0x50)
     with the "Light On" message and any light level value in cmd2.
+
+    Templates are indexed by message code, address, cmd1 and message type
+    where a template value of None is kept in a wildcard bucket. A lookup
+    only tests the templates found in the matching and wildcard buckets.
     """
 
     def __init__(self):
         """Init the MessageCallback class."""
         self._dict = {}
+        self._index = {}
+        self._order = {}
+        self._next_order = 0
 
     def __len__(self):
         """Return the number of callbacks in the list."""
@@ -59,7 +69,7 @@ class MessageCallback():
                 callbacks.append(callback)
         else:
             callbacks.append(value)
-        self._dict[key] = callbacks
+        self._set_callbacks(key, callbacks)
 
     def add(self, msg, callback, override=False):
         """Add a callback to the callback list.
@@ -72,13 +82,13 @@ class MessageCallback():
         """
         if override:
             if isinstance(callback, list):
-                self._dict[msg] = callback
+                self._set_callbacks(msg, callback)
             else:
-                self._dict[msg] = [callback]
+                self._set_callbacks(msg, [callback])
         else:
             cb = self[msg]
             cb.append(callback)
-            self._dict[msg] = cb
+            self._set_callbacks(msg, cb)
 
     def remove(self, msg, callback):
         """Remove a callback from the callback list.
@@ -90,7 +100,7 @@ class MessageCallback():
         removed.
         """
         if callback is None:
-            self._dict.pop(msg, None)
+            self._pop_callbacks(msg)
         else:
             cb = self._dict.get(msg, [])
             try:
@@ -101,7 +111,7 @@ class MessageCallback():
                 _LOGGER.debug('%d callbacks for message: %s', len(cb), msg)
                 self.add(msg, cb, True)
             else:
-                self._dict.pop(msg, None)
+                self._pop_callbacks(msg)
                 _LOGGER.debug('Removed all callbacks for message: %s', msg)
 
     def get_callbacks_from_message(self, msg):
@@ -113,6 +123,80 @@ class MessageCallback():
         return callbacks
 
     def _find_matching_keys(self, msg):
-        for key in self._dict:
+        nodes = [self._index]
+        for value in _index_values(msg):
+            next_nodes = []
+            for node in nodes:
+                if value is None:
+                    next_nodes.extend(node.values())
+                else:
+                    for bucket in (node.get(value), node.get(None)):
+                        if bucket is not None:
+                            next_nodes.append(bucket)
+            nodes = next_nodes
+
+        candidates = [key for bucket in nodes for key in bucket]
+        candidates.sort(key=self._order.get)
+        for key in candidates:
             if key.matches_pattern(msg) and msg.matches_pattern(key):
                 yield key
+
+    def _set_callbacks(self, key, callbacks):
+        if key not in self._dict:
+            self._add_to_index(key)
+        self._dict[key] = callbacks
+
+    def _pop_callbacks(self, key):
+        if key in self._dict:
+            self._remove_from_index(key)
+        return self._dict.pop(key, None)
+
+    def _add_to_index(self, key):
+        values = _index_values(key)
+        node = self._index
+        for value in values[:-1]:
+            node = node.setdefault(value, {})
+        node.setdefault(values[-1], []).append(key)
+        self._order[key] = self._next_order
+        self._next_order += 1
+
+    def _remove_from_index(self, key):
+        values = _index_values(key)
+        path = [self._index]
+        for value in values[:-1]:
+            node = path[-1].get(value)
+            if node is None:
+                return
+            path.append(node)
+        bucket = path[-1].get(values[-1], [])
+        for pos, indexed_key in enumerate(bucket):
+            if indexed_key == key:
+                bucket.pop(pos)
+                break
+        self._order.pop(key, None)
+
+        # Prune empty buckets so the index does not grow with removed keys
+        if not bucket:
+            path[-1].pop(values[-1], None)
+        for pos in range(len(path) - 1, 0, -1):
+            if not path[pos]:
+                path[pos - 1].pop(values[pos - 1], None)
+
+
+def _index_values(msg):
+    """Return the values used to index a message or message template.
+
+    Values are (code, address, cmd1, message type) with None for any value
+    the message does not define.
+    """
+    address = getattr(msg, 'address', None)
+    if isinstance(address, Address):
+        address = address.addr
+    else:
+        address = None
+    flags = getattr(msg, 'flags', None)
+    if isinstance(flags, MessageFlags):
+        message_type = flags.messageType
+    else:
+        message_type = None
+    return (msg.code, address, getattr(msg, 'cmd1', None), message_type)
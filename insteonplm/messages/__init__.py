@@ -10,6 +10,7 @@ from insteonplm.constants import (MESSAGE_ALL_LINK_CEANUP_FAILURE_REPORT_0X56,
                                   MESSAGE_BUTTON_EVENT_REPORT_0X54,
                                   MESSAGE_CANCEL_ALL_LINKING_0X65,
                                   MESSAGE_EXTENDED_MESSAGE_RECEIVED_0X51,
+                                  MESSAGE_EXTENDED_MESSAGE_RECEIVED_SIZE,
                                   MESSAGE_GET_FIRST_ALL_LINK_RECORD_0X69,
                                   MESSAGE_GET_IM_CONFIGURATION_0X73,
                                   MESSAGE_GET_IM_INFO_0X60,
@@ -52,6 +53,10 @@ from insteonplm.messages.manageAllLinkRecord import ManageAllLinkRecord
 
 _LOGGER = logging.getLogger(__name__)
 
+# Longest frame the modem can send, used to bound the bytes handed to a
+# message class when the final frame size depends on the message flags.
+MAX_MESSAGE_SIZE = MESSAGE_EXTENDED_MESSAGE_RECEIVED_SIZE
+
 
 def create(rawmessage):
     """Return an INSTEON message class based on a raw byte stream."""
@@ -86,6 +91,66 @@ def create(rawmessage):
     return (msg, remaining_data)
 
 
+class MessageFramer():
+    """Incremental framer for the byte stream received from the modem.
+
+    Received data is appended to a single buffer which is walked with an
+    offset. Only the bytes of each complete frame are handed to the message
+    classes, so a large backlog (i.e. during an ALDB dump) is never copied
+    once per message. Consumed bytes are released once per call to `feed`.
+    """
+
+    def __init__(self):
+        """Init the MessageFramer class."""
+        self._buffer = bytearray()
+
+    def __len__(self):
+        """Return the number of bytes waiting for a complete frame."""
+        return len(self._buffer)
+
+    def feed(self, data):
+        """Add received data and return the list of complete messages."""
+        self._buffer.extend(data)
+        buffer = self._buffer
+        end = len(buffer)
+        offset = 0
+        msgs = []
+        while offset < end:
+            if buffer[offset] != MESSAGE_START_CODE_0X02:
+                offset = buffer.find(MESSAGE_START_CODE_0X02, offset)
+                if offset < 0:
+                    offset = end
+                continue
+            if end - offset < 2:
+                break
+
+            entry = _MSG_CLASSES[buffer[offset + 1]]
+            if entry is None:
+                _LOGGER.debug('Did not find message class 0x%02x',
+                              buffer[offset + 1])
+                offset += 1
+                continue
+
+            msgclass, size = entry
+            if end - offset < size:
+                break
+            msg = msgclass.from_raw_message(
+                buffer[offset:offset + MAX_MESSAGE_SIZE])
+            if msg is None:
+                # The frame size depends on data not yet received
+                break
+            msgs.append(msg)
+            offset += msg.receivedSize
+
+        if offset:
+            del buffer[:offset]
+        return msgs
+
+    def clear(self):
+        """Discard any partial frame."""
+        self._buffer.clear()
+
+
 def iscomplete(rawmessage):
     """Test if the raw message is a complete message."""
     if len(rawmessage) < 2:
@@ -94,15 +159,10 @@ def iscomplete(rawmessage):
     if rawmessage[0] != 0x02:
         raise ValueError('message does not start with 0x02')
 
-    messageBuffer = bytearray()
-    filler = bytearray(30)
-    messageBuffer.extend(rawmessage)
-    messageBuffer.extend(filler)
+    entry = _MSG_CLASSES[rawmessage[1]]
 
-    msg = _get_msg_class(rawmessage[1])
-
-    if hasattr(msg, 'receivedSize') and msg.receivedSize:
-        expectedSize = msg.receivedSize
+    if entry is not None and entry[1]:
+        expectedSize = entry[1]
     else:
         _LOGGER.error('Unable to find an receivedSize for code 0x%x',
                       rawmessage[1])
@@ -115,79 +175,67 @@ def iscomplete(rawmessage):
     return is_expected_size
 
 
+def register_msg_class(code, msg_class):
+    """Register a message class for a message code.
+
+    Allows messages not defined in this module to be created from the
+    received byte stream. A registered class replaces any existing class
+    for the same code and a msg_class of None removes the code.
+    """
+    # pylint: disable=global-statement
+    global _MSG_CLASSES
+    if code not in range(0, 256):
+        raise ValueError('Message code must be a single byte')
+    if msg_class is None:
+        _MSG_CLASS_LIST.pop(code, None)
+    else:
+        _MSG_CLASS_LIST[code] = msg_class
+    _MSG_CLASSES = _build_msg_classes(_MSG_CLASS_LIST)
+
+
 def _get_msg_class(code):
     """Get the message class based on the message code."""
-    msg_classes = {}
-    msg_classes = _add_msg_class(msg_classes,
-                                 MESSAGE_STANDARD_MESSAGE_RECEIVED_0X50,
-                                 StandardReceive)
-    msg_classes = _add_msg_class(msg_classes,
-                                 MESSAGE_EXTENDED_MESSAGE_RECEIVED_0X51,
-                                 ExtendedReceive)
-    msg_classes = _add_msg_class(msg_classes,
-                                 MESSAGE_X10_MESSAGE_RECEIVED_0X52,
-                                 X10Received)
-    msg_classes = _add_msg_class(msg_classes,
-                                 MESSAGE_ALL_LINKING_COMPLETED_0X53,
-                                 AllLinkComplete)
-    msg_classes = _add_msg_class(msg_classes,
-                                 MESSAGE_BUTTON_EVENT_REPORT_0X54,
-                                 ButtonEventReport)
-    msg_classes = _add_msg_class(msg_classes,
-                                 MESSAGE_USER_RESET_DETECTED_0X55,
-                                 UserReset)
-    msg_classes = _add_msg_class(msg_classes,
-                                 MESSAGE_ALL_LINK_CEANUP_FAILURE_REPORT_0X56,
-                                 AllLinkCleanupFailureReport)
-    msg_classes = _add_msg_class(msg_classes,
-                                 MESSAGE_ALL_LINK_RECORD_RESPONSE_0X57,
-                                 AllLinkRecordResponse)
-    msg_classes = _add_msg_class(msg_classes,
-                                 MESSAGE_ALL_LINK_CLEANUP_STATUS_REPORT_0X58,
-                                 AllLinkCleanupStatusReport)
-    msg_classes = _add_msg_class(msg_classes,
-                                 MESSAGE_GET_IM_INFO_0X60,
-                                 GetImInfo)
-    msg_classes = _add_msg_class(msg_classes,
-                                 MESSAGE_SEND_ALL_LINK_COMMAND_0X61,
-                                 SendAllLinkCommand)
-    msg_classes = _add_msg_class(msg_classes,
-                                 MESSAGE_SEND_STANDARD_MESSAGE_0X62,
-                                 StandardSend)
-    msg_classes = _add_msg_class(msg_classes,
-                                 MESSAGE_X10_MESSAGE_SEND_0X63,
-                                 X10Send)
-    msg_classes = _add_msg_class(msg_classes,
-                                 MESSAGE_START_ALL_LINKING_0X64,
-                                 StartAllLinking)
-    msg_classes = _add_msg_class(msg_classes,
-                                 MESSAGE_CANCEL_ALL_LINKING_0X65,
-                                 CancelAllLinking)
-    msg_classes = _add_msg_class(msg_classes,
-                                 MESSAGE_RESET_IM_0X67,
-                                 ResetIM)
-    msg_classes = _add_msg_class(msg_classes,
-                                 MESSAGE_GET_FIRST_ALL_LINK_RECORD_0X69,
-                                 GetFirstAllLinkRecord)
-    msg_classes = _add_msg_class(msg_classes,
-                                 MESSAGE_GET_NEXT_ALL_LINK_RECORD_0X6A,
-                                 GetNextAllLinkRecord)
-    msg_classes = _add_msg_class(msg_classes,
-                                 MESSAGE_MANAGE_ALL_LINK_RECORD_0X6F,
-                                 ManageAllLinkRecord)
-    msg_classes = _add_msg_class(msg_classes,
-                                 MESSAGE_SET_IM_CONFIGURATION_0X6B,
-                                 SetIMConfiguration)
-    msg_classes = _add_msg_class(msg_classes,
-                                 MESSAGE_GET_IM_CONFIGURATION_0X73,
-                                 GetImConfiguration)
-
-    return msg_classes.get(code, None)
-
-
-def _add_msg_class(msg_list, code, msg_class):
-    msg_list[code] = msg_class
-    return msg_list
+    entry = _MSG_CLASSES[code]
+    if entry is None:
+        return None
+    return entry[0]
+
+
+def _build_msg_classes(msg_list):
+    """Build the message class table indexed by message code.
+
+    Each slot holds a (message class, received size) tuple or None.
+    """
+    msg_classes = [None] * 256
+    for code, msg_class in msg_list.items():
+        msg_classes[code] = (msg_class, msg_class.receivedSize)
+    return tuple(msg_classes)
+
+
+_MSG_CLASS_LIST = {
+    MESSAGE_STANDARD_MESSAGE_RECEIVED_0X50: StandardReceive,
+    MESSAGE_EXTENDED_MESSAGE_RECEIVED_0X51: ExtendedReceive,
+    MESSAGE_X10_MESSAGE_RECEIVED_0X52: X10Received,
+    MESSAGE_ALL_LINKING_COMPLETED_0X53: AllLinkComplete,
+    MESSAGE_BUTTON_EVENT_REPORT_0X54: ButtonEventReport,
+    MESSAGE_USER_RESET_DETECTED_0X55: UserReset,
+    MESSAGE_ALL_LINK_CEANUP_FAILURE_REPORT_0X56: AllLinkCleanupFailureReport,
+    MESSAGE_ALL_LINK_RECORD_RESPONSE_0X57: AllLinkRecordResponse,
+    MESSAGE_ALL_LINK_CLEANUP_STATUS_REPORT_0X58: AllLinkCleanupStatusReport,
+    MESSAGE_GET_IM_INFO_0X60: GetImInfo,
+    MESSAGE_SEND_ALL_LINK_COMMAND_0X61: SendAllLinkCommand,
+    MESSAGE_SEND_STANDARD_MESSAGE_0X62: StandardSend,
+    MESSAGE_X10_MESSAGE_SEND_0X63: X10Send,
+    MESSAGE_START_ALL_LINKING_0X64: StartAllLinking,
+    MESSAGE_CANCEL_ALL_LINKING_0X65: CancelAllLinking,
+    MESSAGE_RESET_IM_0X67: ResetIM,
+    MESSAGE_GET_FIRST_ALL_LINK_RECORD_0X69: GetFirstAllLinkRecord,
+    MESSAGE_GET_NEXT_ALL_LINK_RECORD_0X6A: GetNextAllLinkRecord,
+    MESSAGE_MANAGE_ALL_LINK_RECORD_0X6F: ManageAllLinkRecord,
+    MESSAGE_SET_IM_CONFIGURATION_0X6B: SetIMConfiguration,
+    MESSAGE_GET_IM_CONFIGURATION_0X73: GetImConfiguration}
+
+_MSG_CLASSES = _build_msg_classes(_MSG_CLASS_LIST)
 
 
 def _trim_buffer_garbage(rawmessage, debug=True):
@@ -19,8 +19,12 @@ class AllLinkRecordResponse(Message):
     _receivedSize = MESSAGE_ALL_LINK_RECORD_RESPONSE_SIZE
     _description = 'INSTEON ALL-Link Record Response'
 
+    __slots__ = ('_raw', '_controlFlags', '_group', '_address',
+                 '_linkdata1', '_linkdata2', '_linkdata3')
+
     def __init__(self, flags, group, address, linkdata1, linkdata2, linkdata3):
         """Init the AllLinkRecordResponse Class."""
+        self._raw = None
         self._controlFlags = flags
         self._group = group
         self._address = Address(address)
@@ -28,15 +32,23 @@ class AllLinkRecordResponse(Message):
         self._linkdata2 = linkdata2
         self._linkdata3 = linkdata3
 
+    # pylint: disable=protected-access
     @classmethod
     def from_raw_message(cls, rawmessage):
-        """Create message from raw byte stream."""
-        return AllLinkRecordResponse(rawmessage[2],
-                                     rawmessage[3],
-                                     rawmessage[4:7],
-                                     rawmessage[7],
-                                     rawmessage[8],
-                                     rawmessage[9])
+        """Create message from raw byte stream.
+
+        The address is decoded from the raw message when it is first read.
+        """
+        msg = AllLinkRecordResponse.__new__(AllLinkRecordResponse)
+        msg._raw = bytes(rawmessage[:cls._receivedSize])
+        msg._bytes = msg._raw
+        msg._controlFlags = msg._raw[2]
+        msg._group = msg._raw[3]
+        msg._address = None
+        msg._linkdata1 = msg._raw[7]
+        msg._linkdata2 = msg._raw[8]
+        msg._linkdata3 = msg._raw[9]
+        return msg
 
     @property
     def controlFlags(self):
@@ -51,6 +63,8 @@ class AllLinkRecordResponse(Message):
     @property
     def address(self):
         """Return the device address."""
+        if self._address is None:
+            self._address = Address(self._raw[4:7])
         return self._address
 
     @property
@@ -88,7 +102,7 @@ class AllLinkRecordResponse(Message):
     def _message_properties(self):
         return [{'controlFlags': self._controlFlags},
                 {'group': self._group},
-                {'address': self._address},
+                {'address': self.address},
                 {'linkdata1': self._linkdata1},
                 {'linkdata2': self._linkdata2},
                 {'linkdata3': self._linkdata3}]
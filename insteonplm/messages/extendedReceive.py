@@ -19,6 +19,9 @@ class ExtendedReceive(Message):
     _receivedSize = MESSAGE_EXTENDED_MESSAGE_RECEIVED_SIZE
     _description = 'INSTEON Extended Message Received'
 
+    __slots__ = ('_raw', '_address', '_target', '_messageFlags',
+                 '_cmd1', '_cmd2', '_userdata')
+
     def __init__(self, address, target, commandtuple, userdata, cmd2=None,
                  flags=0x10):
         """Init the ExtendedRecieve message class."""
@@ -34,6 +37,7 @@ class ExtendedReceive(Message):
         if cmd2out is None:
             raise ValueError
 
+        self._raw = None
         self._address = Address(address)
         self._target = Address(target)
         self._messageFlags = MessageFlags(flags)
@@ -42,16 +46,24 @@ class ExtendedReceive(Message):
         self._cmd2 = cmd2out
         self._userdata = Userdata(userdata)
 
+    # pylint: disable=protected-access
     @classmethod
     def from_raw_message(cls, rawmessage):
-        """Create message from raw byte stream."""
-        userdata = Userdata.from_raw_message(rawmessage[11:25])
-        return ExtendedReceive(rawmessage[2:5],
-                               rawmessage[5:8],
-                               {'cmd1': rawmessage[9],
-                                'cmd2': rawmessage[10]},
-                               userdata,
-                               flags=rawmessage[8])
+        """Create message from raw byte stream.
+
+        The address, target, flags and user data are decoded from the raw
+        message when they are first read.
+        """
+        msg = ExtendedReceive.__new__(ExtendedReceive)
+        msg._raw = bytes(rawmessage[:cls._receivedSize])
+        msg._bytes = msg._raw
+        msg._address = None
+        msg._target = None
+        msg._messageFlags = None
+        msg._cmd1 = msg._raw[9]
+        msg._cmd2 = msg._raw[10]
+        msg._userdata = None
+        return msg
 
     # pylint: disable=protected-access
     @classmethod
@@ -78,16 +90,21 @@ class ExtendedReceive(Message):
         msg._cmd1 = cmd1
         msg._cmd2 = cmd2out
         msg._userdata = Userdata.create_pattern(userdata)
+        msg._clear_cache()
         return msg
 
     @property
     def address(self):
         """Return address of sending device."""
+        if self._address is None:
+            self._address = Address(self._raw[2:5])
         return self._address
 
     @property
     def target(self):
         """Return address of target device."""
+        if self._target is None:
+            self._target = Address(self._raw[5:8])
         return self._target
 
     @property
@@ -103,11 +120,15 @@ class ExtendedReceive(Message):
     @property
     def userdata(self):
         """Return user data of extended message."""
+        if self._userdata is None:
+            self._userdata = Userdata.from_raw_message(self._raw[11:25])
         return self._userdata
 
     @property
     def flags(self):
         """Return message flags."""
+        if self._messageFlags is None:
+            self._messageFlags = MessageFlags(self._raw[8])
         return self._messageFlags
 
     @property
@@ -117,7 +138,7 @@ class ExtendedReceive(Message):
         Used in All-Link Cleanup messages.
         """
         low_byte = None
-        if self.target is not None and self._messageFlags.isBroadcast:
+        if self.target is not None and self.flags.isBroadcast:
             low_byte = self.target.bytes[0]
         return low_byte
 
@@ -128,7 +149,7 @@ class ExtendedReceive(Message):
         Used in All-Link Cleanup messages.
         """
         med_byte = None
-        if self.target is not None and self._messageFlags.isBroadcast:
+        if self.target is not None and self.flags.isBroadcast:
             med_byte = self.target.bytes[1]
         return med_byte
 
@@ -139,14 +160,14 @@ class ExtendedReceive(Message):
         Used in All-Link Cleanup messages.
         """
         hi_byte = None
-        if self.target is not None and self._messageFlags.isBroadcast:
+        if self.target is not None and self.flags.isBroadcast:
             hi_byte = self.target.bytes[2]
         return hi_byte
 
     def _message_properties(self):
-        return [{'address': self._address},
-                {'target': self._target},
-                {'flags': self._messageFlags},
+        return [{'address': self.address},
+                {'target': self.target},
+                {'flags': self.flags},
                 {'cmd1': self._cmd1},
                 {'cmd2': self._cmd2},
-                {'userdata': self._userdata}]
+                {'userdata': self.userdata}]
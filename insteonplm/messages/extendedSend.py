@@ -127,6 +127,7 @@ class ExtendedSend(Message):
         """Set the ACK/NAK byte."""
         if val in [None, 0x06, 0x15]:
             self._acknak = val
+            self._clear_cache()
         else:
             raise ValueError
 
@@ -147,6 +148,7 @@ class ExtendedSend(Message):
             data_sum += self._userdata['d{:d}'.format(i)]
         chksum = 0xff - (data_sum & 0xff) + 1
         self._userdata['d14'] = chksum
+        self._clear_cache()
 
     def set_crc(self):
         """Set Userdata[13] and Userdata[14] to the CRC value."""
@@ -164,6 +166,7 @@ class ExtendedSend(Message):
                 b = b >> 1
         self._userdata['d13'] = (crc >> 8) & 0xff
         self._userdata['d14'] = crc & 0xff
+        self._clear_cache()
 
     def _message_properties(self):
         return [{'address': self._address},
@@ -9,6 +9,18 @@ from insteonplm.messages.userdata import Userdata
 _LOGGER = logging.getLogger(__name__)
 
 
+def _sort_slot(val):
+    """Return a sort key of a message key value.
+
+    Template values are None and sort before any message value.
+    """
+    if val is None:
+        return (0,)
+    if isinstance(val, tuple):
+        return (1, tuple(_sort_slot(item) for item in val))
+    return (1, val)
+
+
 class ClassPropertyMetaClass(type):
     """Meta class for Message class.
 
@@ -45,6 +57,17 @@ class Message(metaclass=ClassPropertyMetaClass):
     _receivedSize = 0
     _description = "Empty message"
 
+    # Cached on first use and cleared by _clear_cache when a message changes
+    __slots__ = ('_bytes', '_key')
+
+    # pylint: disable=unused-argument
+    def __new__(cls, *args, **kwargs):
+        """Create a message instance with an empty cache."""
+        msg = super().__new__(cls)
+        msg._bytes = None
+        msg._key = None
+        return msg
+
     def __str__(self):
         """Return a string representation of an INSTEON message."""
         props = self._message_properties()
@@ -75,37 +98,28 @@ class Message(metaclass=ClassPropertyMetaClass):
         """Test for equality."""
         match = False
         if isinstance(other, Message) and other.code == self._code:
-            match = str(self) == str(other)
+            match = self._message_key() == other._message_key()
         return match
 
     def __ne__(self, other):
         """Test for inequality."""
-        match = True
-        if isinstance(other, Message) and other.code == self._code:
-            match = str(self) != str(other)
-        return match
+        return not self.__eq__(other)
 
     def __lt__(self, other):
         """Test for less than."""
-        less_than = False
         if isinstance(other, Message):
-            less_than = str(self) < str(other)
-        else:
-            raise TypeError
-        return less_than
+            return self._sort_key() < other._sort_key()
+        raise TypeError
 
     def __gt__(self, other):
         """Test for greater than."""
-        greater_than = False
         if isinstance(other, Message):
-            greater_than = str(self) > str(other)
-        else:
-            raise TypeError
-        return greater_than
+            return self._sort_key() > other._sort_key()
+        raise TypeError
 
     def __hash__(self):
         """Create a has of the message."""
-        return hash(str(self))
+        return hash(self._message_key())
 
     @property
     def code(self):
@@ -130,36 +144,14 @@ class Message(metaclass=ClassPropertyMetaClass):
     @property
     def hex(self):
         """Hexideciaml representation of the message in bytes."""
-        props = self._message_properties()
-        msg = bytearray([MESSAGE_START_CODE_0X02, self._code])
-
-        for prop in props:
-            # pylint: disable=unused-variable
-            for key, val in prop.items():
-                if val is None:
-                    pass
-                elif isinstance(val, int):
-                    msg.append(val)
-                elif isinstance(val, Address):
-                    if val.addr is None:
-                        pass
-                    else:
-                        msg.extend(val.bytes)
-                elif isinstance(val, MessageFlags):
-                    msg.extend(val.bytes)
-                elif isinstance(val, bytearray):
-                    msg.extend(val)
-                elif isinstance(val, bytes):
-                    msg.extend(val)
-                elif isinstance(val, Userdata):
-                    msg.extend(val.bytes)
-
-        return binascii.hexlify(msg).decode()
+        return binascii.hexlify(self.bytes).decode()
 
     @property
     def bytes(self):
         """Return the bytes representation of the message."""
-        return binascii.unhexlify(self.hex)
+        if self._bytes is None:
+            self._bytes = self._build_bytes()
+        return self._bytes
 
     def matches_pattern(self, other):
         """Return if the current message matches a message template.
@@ -193,6 +185,68 @@ class Message(metaclass=ClassPropertyMetaClass):
     def _message_properties(self):
         raise NotImplementedError
 
+    def _build_bytes(self):
+        props = self._message_properties()
+        msg = bytearray([MESSAGE_START_CODE_0X02, self._code])
+
+        for prop in props:
+            # pylint: disable=unused-variable
+            for key, val in prop.items():
+                if val is None:
+                    pass
+                elif isinstance(val, int):
+                    msg.append(val)
+                elif isinstance(val, Address):
+                    if val.addr is None:
+                        pass
+                    else:
+                        msg.extend(val.bytes)
+                elif isinstance(val, MessageFlags):
+                    msg.extend(val.bytes)
+                elif isinstance(val, bytearray):
+                    msg.extend(val)
+                elif isinstance(val, bytes):
+                    msg.extend(val)
+                elif isinstance(val, Userdata):
+                    msg.extend(val.bytes)
+
+        return bytes(msg)
+
+    def _message_key(self):
+        """Return an immutable key of the message code and properties.
+
+        Unlike the bytes representation, a property value of None is kept
+        so a template does not compare equal to a message of zero values.
+        """
+        if self._key is None:
+            key = [self._code]
+            for prop in self._message_properties():
+                for val in prop.values():
+                    if isinstance(val, Address):
+                        key.append(val.addr)
+                    elif isinstance(val, MessageFlags):
+                        key.append((val.messageType, val.extended,
+                                    val.hopsLeft, val.hopsMax))
+                    elif isinstance(val, Userdata):
+                        key.append(tuple(val[ud_key] for ud_key in val))
+                    elif isinstance(val, bytearray):
+                        key.append(bytes(val))
+                    else:
+                        key.append(val)
+            self._key = tuple(key)
+        return self._key
+
+    def _sort_key(self):
+        sort_key = [self.__class__.__name__]
+        for val in self._message_key():
+            sort_key.append(_sort_slot(val))
+        return sort_key
+
+    def _clear_cache(self):
+        """Clear cached values after the message content changes."""
+        self._bytes = None
+        self._key = None
+
     @staticmethod
     def _test_match(prop_val, key_val):
         ismatch = False
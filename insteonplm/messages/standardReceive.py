@@ -18,6 +18,9 @@ class StandardReceive(Message):
     _receivedSize = MESSAGE_STANDARD_MESSAGE_RECIEVED_SIZE
     _description = 'INSTEON Standard Message Received'
 
+    __slots__ = ('_raw', '_address', '_target', '_messageFlags',
+                 '_cmd1', '_cmd2')
+
     def __init__(self, address, target, commandtuple, cmd2=None, flags=0x00):
         """Init the StandardReceive message class."""
         if commandtuple.get('cmd1') is not None:
@@ -32,6 +35,7 @@ class StandardReceive(Message):
         if cmd2out is None:
             raise ValueError
 
+        self._raw = None
         self._address = Address(address)
         self._target = Address(target)
         self._messageFlags = MessageFlags(flags)
@@ -39,14 +43,23 @@ class StandardReceive(Message):
         self._cmd1 = cmd1
         self._cmd2 = cmd2out
 
+    # pylint: disable=protected-access
     @classmethod
     def from_raw_message(cls, rawmessage):
-        """Create message from a raw byte stream."""
-        return StandardReceive(rawmessage[2:5],
-                               rawmessage[5:8],
-                               {'cmd1': rawmessage[9],
-                                'cmd2': rawmessage[10]},
-                               flags=rawmessage[8])
+        """Create message from a raw byte stream.
+
+        The address, target and flags are decoded from the raw message when
+        they are first read.
+        """
+        msg = StandardReceive.__new__(StandardReceive)
+        msg._raw = bytes(rawmessage[:cls._receivedSize])
+        msg._bytes = msg._raw
+        msg._address = None
+        msg._target = None
+        msg._messageFlags = None
+        msg._cmd1 = msg._raw[9]
+        msg._cmd2 = msg._raw[10]
+        return msg
 
     # pylint: disable=protected-access
     @classmethod
@@ -72,16 +85,21 @@ class StandardReceive(Message):
         msg._messageFlags = MessageFlags(flags)
         msg._cmd1 = cmd1
         msg._cmd2 = cmd2out
+        msg._clear_cache()
         return msg
 
     @property
     def address(self):
         """Return the address of the device."""
+        if self._address is None:
+            self._address = Address(self._raw[2:5])
         return self._address
 
     @property
     def target(self):
         """Return the address of the target device."""
+        if self._target is None:
+            self._target = Address(self._raw[5:8])
         return self._target
 
     @property
@@ -97,6 +115,8 @@ class StandardReceive(Message):
     @property
     def flags(self):
         """Return the message flags."""
+        if self._messageFlags is None:
+            self._messageFlags = MessageFlags(self._raw[8])
         return self._messageFlags
 
     @property
@@ -106,7 +126,7 @@ class StandardReceive(Message):
         Used in All-Link Cleanup message types.
         """
         low_byte = None
-        if self.target.addr is not None and self._messageFlags.isBroadcast:
+        if self.target.addr is not None and self.flags.isBroadcast:
             low_byte = self.target.bytes[0]
         return low_byte
 
@@ -117,7 +137,7 @@ class StandardReceive(Message):
         Used in All-Link Cleanup message types.
         """
         med_byte = None
-        if self.target.addr is not None and self._messageFlags.isBroadcast:
+        if self.target.addr is not None and self.flags.isBroadcast:
             med_byte = self.target.bytes[1]
         return med_byte
 
@@ -128,13 +148,13 @@ class StandardReceive(Message):
         Used in All-Link Cleanup message types.
         """
         hi_byte = None
-        if self.target.addr is not None and self._messageFlags.isBroadcast:
+        if self.target.addr is not None and self.flags.isBroadcast:
             hi_byte = self.target.bytes[2]
         return hi_byte
 
     def _message_properties(self):
-        return [{'address': self._address},
-                {'target': self._target},
-                {'flags': self._messageFlags},
+        return [{'address': self.address},
+                {'target': self.target},
+                {'flags': self.flags},
                 {'cmd1': self._cmd1},
                 {'cmd2': self._cmd2}]
@@ -116,6 +116,7 @@ class StandardSend(Message):
         """Set the ACK/NAK byte."""
         if val in [None, 0x06, 0x15]:
             self._acknak = val
+            self._clear_cache()
         else:
             raise ValueError
 
@@ -16,6 +16,8 @@ class X10Received(Message):
     _receivedSize = MESSAGE_X10_MESSAGE_RECEIVED_SIZE
     _description = 'Insteon Get Next All Link Record Message'
 
+    __slots__ = ('_rawX10', '_flag')
+
     def __init__(self, rawX10, flag):
         """Init X10Received Class."""
         self._rawX10 = rawX10
@@ -3,30 +3,50 @@
 import asyncio
 import logging
 import binascii
+import time
 from collections import deque, namedtuple
 
 import async_timeout
 
 import insteonplm.messages
+from insteonplm.aldbloader import ALDBLoader
 from insteonplm.constants import (MESSAGE_ACK,
                                   MESSAGE_NAK,
+                                  MESSAGE_CANCEL_ALL_LINKING_0X65,
+                                  MESSAGE_GET_FIRST_ALL_LINK_RECORD_0X69,
+                                  MESSAGE_GET_IM_CONFIGURATION_0X73,
+                                  MESSAGE_GET_IM_INFO_0X60,
+                                  MESSAGE_GET_NEXT_ALL_LINK_RECORD_0X6A,
+                                  MESSAGE_MANAGE_ALL_LINK_RECORD_0X6F,
+                                  MESSAGE_RESET_IM_0X67,
+                                  MESSAGE_SET_IM_CONFIGURATION_0X6B,
+                                  MESSAGE_START_ALL_LINKING_0X64,
+                                  MESSAGE_TYPE_DIRECT_MESSAGE,
                                   X10CommandType,
                                   X10_COMMAND_ALL_UNITS_OFF,
                                   X10_COMMAND_ALL_LIGHTS_ON,
-                                  X10_COMMAND_ALL_LIGHTS_OFF)
+                                  X10_COMMAND_ALL_LIGHTS_OFF,
+                                  X10_COMMAND_PRE_SET_DIM)
 from insteonplm.address import Address
 from insteonplm.devices import Device, ALDBRecord, ALDBStatus
+from insteonplm.duplicates import DuplicateFilter
+from insteonplm.inflight import InFlightTracker
 from insteonplm.linkedDevices import LinkedDevices
 from insteonplm.messagecallback import MessageCallback
 from insteonplm.messages.allLinkRecordResponse import AllLinkRecordResponse
+from insteonplm.messages.extendedReceive import ExtendedReceive
 from insteonplm.messages.getFirstAllLinkRecord import GetFirstAllLinkRecord
 from insteonplm.messages.getIMInfo import GetImInfo
 from insteonplm.messages.getNextAllLinkRecord import GetNextAllLinkRecord
 from insteonplm.messages.manageAllLinkRecord import ManageAllLinkRecord
 from insteonplm.messages.setImConfiguration import SetIMConfiguration
+from insteonplm.messages.standardReceive import StandardReceive
+from insteonplm.messages.standardSend import StandardSend
 from insteonplm.messages.startAllLinking import StartAllLinking
 from insteonplm.messages.x10received import X10Received
 from insteonplm.messages.x10send import X10Send
+from insteonplm.sendqueue import SendQueue, coalesce_key, message_priority
+from insteonplm.trace import FRAME_TRACE_SIZE, TRACE_RX, TRACE_TX, FrameTrace
 from insteonplm.utils import (byte_to_housecode,
                               byte_to_unitcode,
                               rawX10_to_bytes,
@@ -36,9 +56,27 @@ __all__ = ('PLM, Hub')
 _LOGGER = logging.getLogger(__name__)
 WAIT_TIMEOUT = 1.5
 ACKNAK_TIMEOUT = 2
-
-
-MessageInfo = namedtuple('MessageInfo', 'msg wait_nak wait_timeout')
+SEND_GAP_MIN = 0.1
+SEND_GAP_PER_HOP = 0.05
+HOPS_AVERAGE_WEIGHT = 0.2
+# Commands handled by the modem itself without sending on the powerline
+MODEM_LOCAL_CODES = [MESSAGE_GET_IM_INFO_0X60,
+                     MESSAGE_START_ALL_LINKING_0X64,
+                     MESSAGE_CANCEL_ALL_LINKING_0X65,
+                     MESSAGE_RESET_IM_0X67,
+                     MESSAGE_GET_FIRST_ALL_LINK_RECORD_0X69,
+                     MESSAGE_GET_NEXT_ALL_LINK_RECORD_0X6A,
+                     MESSAGE_SET_IM_CONFIGURATION_0X6B,
+                     MESSAGE_MANAGE_ALL_LINK_RECORD_0X6F,
+                     MESSAGE_GET_IM_CONFIGURATION_0X73]
+ALL_LINK_NAK_RETRIES = 3
+ALL_LINK_NAK_BACKOFF_MIN = 0.05
+ALL_LINK_NAK_BACKOFF_MAX = 1
+ALL_LINK_NAK_BACKOFF_DECAY = 0.9
+ALL_LINK_NAK_RETRY_WAIT = 0.05
+
+
+MessageInfo = namedtuple('MessageInfo', 'msg wait_nak wait_timeout queued')
 
 
 # pylint: disable=too-many-instance-attributes
@@ -72,18 +110,37 @@ class IM(Device, asyncio.Protocol):
         self._loop = loop
         self._connection_lost_callback = connection_lost_callback
 
-        self._buffer = asyncio.Queue(loop=self._loop)
+        self._framer = insteonplm.messages.MessageFramer()
         self._recv_queue = deque([])
-        self._send_queue = asyncio.Queue(loop=self._loop)
+        self._send_queue = SendQueue(loop=self._loop)
         self._acknak_queue = asyncio.Queue(loop=self._loop)
         self._next_all_link_rec_nak_retries = 0
+        self._all_link_nak_backoff = ALL_LINK_NAK_BACKOFF_MIN
+        self._all_link_retry = None
+        self._all_link_started = None
+        self._all_link_ended = None
+        self._all_link_stats = {'records': 0, 'seconds': 0.0, 'rate': 0.0,
+                                'nak_retries': 0}
         self._aldb_devices = {}
         self._devices = LinkedDevices(loop, workdir)
+        self._aldb_loader = ALDBLoader(self._devices, loop)
         self._poll_devices = poll_devices
         self._load_aldb = load_aldb
         self._write_transport_lock = asyncio.Lock(loop=self._loop)
         self._message_callbacks = MessageCallback()
+        self._inflight = InFlightTracker(self.send_msg, self._loop)
+        self._duplicates = DuplicateFilter()
         self._x10_address = None
+        self._frame_trace = None
+
+        # Send scheduler state
+        self._direct_ack_event = asyncio.Event(loop=self._loop)
+        self._direct_ack_pending = None
+        self._hops_used = 0.0
+        self._send_gap = SEND_GAP_MIN
+        self._send_count = 0
+        self._send_wait_total = 0.0
+        self._send_wait_max = 0.0
 
         # Callback lists
         self._cb_load_all_link_db_done = []
@@ -104,6 +161,11 @@ class IM(Device, asyncio.Protocol):
         """Return the list of devices linked to the IM."""
         return self._devices
 
+    @property
+    def aldb_loader(self):
+        """Return the scheduler of device ALDB loads."""
+        return self._aldb_loader
+
     @property
     def loop(self):
         """Return the asyncio loop."""
@@ -114,6 +176,72 @@ class IM(Device, asyncio.Protocol):
         """Return the list of message callbacks."""
         return self._message_callbacks
 
+    @property
+    def inflight(self):
+        """Return the messages waiting for a direct ACK from a device."""
+        return self._inflight
+
+    @property
+    def duplicates(self):
+        """Return the filter of duplicate All-Link messages."""
+        return self._duplicates
+
+    @property
+    def frame_trace(self):
+        """Return the trace of frames sent and received or None."""
+        return self._frame_trace
+
+    def start_frame_trace(self, size=FRAME_TRACE_SIZE):
+        """Keep the last size frames sent to and received from the modem."""
+        self._frame_trace = FrameTrace(size)
+        return self._frame_trace
+
+    def stop_frame_trace(self):
+        """Stop tracing the frames sent to and received from the modem."""
+        self._frame_trace = None
+
+    @property
+    def send_queue_stats(self):
+        """Return statistics of the send queue.
+
+        queue_depth: number of messages waiting to be sent
+        sent: number of messages sent
+        avg_wait / max_wait: seconds a message waited in the queue
+        send_gap: current gap in seconds between messages
+        avg_hops: average powerline hops used by direct ACK messages
+        lanes: depth and counters of each priority lane
+        coalesced: number of frames not sent because a later message
+        replaced them in the send queue or while waiting for a device
+        in_flight: number of device messages waiting for a direct ACK
+        pending: number of device messages waiting for an earlier message
+        to the same device
+        """
+        avg_wait = 0.0
+        if self._send_count:
+            avg_wait = self._send_wait_total / self._send_count
+        return {'queue_depth': self._send_queue.qsize(),
+                'sent': self._send_count,
+                'avg_wait': avg_wait,
+                'max_wait': self._send_wait_max,
+                'send_gap': self._send_gap,
+                'avg_hops': self._hops_used,
+                'lanes': self._send_queue.stats(),
+                'coalesced': (self._send_queue.coalesced +
+                              self._inflight.coalesced),
+                'in_flight': len(self._inflight),
+                'pending': self._inflight.pending}
+
+    @property
+    def all_link_load_stats(self):
+        """Return statistics of the last modem All-Link Database load.
+
+        records: number of All-Link records read from the modem
+        seconds: time taken to read the records
+        rate: records read per second
+        nak_retries: number of requests retried after a NAK
+        """
+        return dict(self._all_link_stats)
+
     # asyncio.protocol interface methods
     def connection_made(self, transport):
         """Complete the network connection.
@@ -127,14 +255,20 @@ class IM(Device, asyncio.Protocol):
 
         Called when asyncio.Protocol detects received data from network.
         """
-        _LOGGER.debug("Starting: data_received")
-        _LOGGER.debug('Received %d bytes from PLM: %s',
-                      len(data), binascii.hexlify(data))
-        self._buffer.put_nowait(data)
-        asyncio.ensure_future(self._peel_messages_from_buffer(),
-                              loop=self._loop)
-
-        _LOGGER.debug("Finishing: data_received")
+        debug = _LOGGER.isEnabledFor(logging.DEBUG)
+        if debug:
+            _LOGGER.debug('Received %d bytes from PLM: %s',
+                          len(data), binascii.hexlify(data))
+        frame_trace = self._frame_trace
+        for msg in self._framer.feed(data):
+            if frame_trace is not None:
+                frame_trace.add(TRACE_RX, msg.bytes)
+            self._recv_queue.appendleft(msg)
+
+        if debug:
+            _LOGGER.debug('Messages in queue: %d', len(self._recv_queue))
+        while self._recv_queue:
+            self._process_recv_queue(debug)
 
     def connection_lost(self, exc):
         """Reestablish the connection to the transport.
@@ -147,6 +281,7 @@ class IM(Device, asyncio.Protocol):
             _LOGGER.warning('Lost connection to Insteon Modem: %s', exc)
 
         self.transport = None
+        self._framer.clear()
         asyncio.ensure_future(self.pause_writing(), loop=self.loop)
 
         if self._connection_lost_callback:
@@ -175,15 +310,25 @@ class IM(Device, asyncio.Protocol):
             if not device.address.is_x10:
                 device.async_refresh_state()
 
-    def send_msg(self, msg, wait_nak=True, wait_timeout=WAIT_TIMEOUT):
+    def send_msg(self, msg, wait_nak=True, wait_timeout=WAIT_TIMEOUT,
+                 priority=None):
         """Place a message on the send queue for sending.
 
-        Message are sent in the order they are placed in the queue.
+        Messages are sent in the order they are placed in the queue within
+        a priority lane. Interactive commands are sent before status
+        requests, which are sent before ALDB and device discovery traffic.
+        If priority is None it is taken from the message type. A queued
+        on, off or status request to the same device is replaced by a
+        later one. After a direct message is sent the next message is held
+        until the device responds or wait_timeout seconds have passed.
         """
         msg_info = MessageInfo(msg=msg, wait_nak=wait_nak,
-                               wait_timeout=wait_timeout)
+                               wait_timeout=wait_timeout,
+                               queued=time.monotonic())
+        if priority is None:
+            priority = message_priority(msg)
         _LOGGER.debug("Queueing msg: %s", msg)
-        self._send_queue.put_nowait(msg_info)
+        self._send_queue.put_nowait(msg_info, priority, coalesce_key(msg))
 
     def start_all_linking(self, mode, group):
         """Put the IM into All-Linking mode.
@@ -333,6 +478,7 @@ class IM(Device, asyncio.Protocol):
     def close(self):
         """Close all writers for all devices for a clean shutdown."""
         yield from self.pause_writing()
+        yield from self.devices.flush_device_info()
         yield from asyncio.sleep(0, loop=self._loop)
 
     @asyncio.coroutine
@@ -362,11 +508,11 @@ class IM(Device, asyncio.Protocol):
             # wait for an item from the queue
             try:
                 msg_info = yield from self._send_queue.get()
+                self._update_send_wait(msg_info)
                 message_sent = False
                 while not message_sent:
                     message_sent = yield from self._write_message(msg_info)
-                yield from asyncio.sleep(msg_info.wait_timeout,
-                                         loop=self._loop)
+                yield from self._wait_send_release(msg_info)
             except asyncio.CancelledError:
                 _LOGGER.info('Stopping Insteon Modem writer due to '
                              'CancelledError')
@@ -389,14 +535,68 @@ class IM(Device, asyncio.Protocol):
         msg = GetImInfo()
         self.send_msg(msg, wait_nak=True, wait_timeout=.5)
 
+    def _update_send_wait(self, msg_info: MessageInfo):
+        wait = time.monotonic() - msg_info.queued
+        self._send_count += 1
+        self._send_wait_total += wait
+        self._send_wait_max = max(self._send_wait_max, wait)
+
+    @asyncio.coroutine
+    def _wait_send_release(self, msg_info: MessageInfo):
+        """Wait until the next message can be sent.
+
+        INSTEON direct messages release the queue when the device responds
+        and X10 messages wait the full wait_timeout. Each message sent on the
+        powerline is followed by a gap based on the number of hops seen in
+        device responses. Commands to the modem itself have no gap.
+        """
+        msg = msg_info.msg
+        if self._direct_ack_pending is not None:
+            try:
+                with async_timeout.timeout(msg_info.wait_timeout,
+                                           loop=self._loop):
+                    yield from self._direct_ack_event.wait()
+            except asyncio.TimeoutError:
+                _LOGGER.debug('No direct ACK from %s',
+                              self._direct_ack_pending)
+            self._direct_ack_pending = None
+        elif msg.code == X10Send.code:
+            yield from asyncio.sleep(msg_info.wait_timeout, loop=self._loop)
+        if msg.code not in MODEM_LOCAL_CODES:
+            yield from asyncio.sleep(self._send_gap, loop=self._loop)
+
+    def _direct_ack_received(self, msg):
+        """Release the send queue when the pending device responds."""
+        if msg.address.id != self._direct_ack_pending:
+            return
+        hops_used = msg.flags.hopsMax - msg.flags.hopsLeft
+        self._hops_used += HOPS_AVERAGE_WEIGHT * (hops_used - self._hops_used)
+        self._send_gap = SEND_GAP_MIN + self._hops_used * SEND_GAP_PER_HOP
+        self._direct_ack_event.set()
+
+    @staticmethod
+    def _expects_direct_ack(msg):
+        return (msg.code == StandardSend.code and
+                msg.flags.messageType == MESSAGE_TYPE_DIRECT_MESSAGE)
+
     @asyncio.coroutine
     def _write_message(self, msg_info: MessageInfo):
-        _LOGGER.debug('TX: %s', msg_info.msg)
+        debug = _LOGGER.isEnabledFor(logging.DEBUG)
+        if debug:
+            _LOGGER.debug('TX: %s', msg_info.msg)
         is_sent = False
         if not self.transport.is_closing():
-            self.transport.write(msg_info.msg.bytes)
+            self._direct_ack_event.clear()
+            self._direct_ack_pending = None
+            if self._expects_direct_ack(msg_info.msg):
+                self._direct_ack_pending = msg_info.msg.address.id
+            data = msg_info.msg.bytes
+            self.transport.write(data)
+            if self._frame_trace is not None:
+                self._frame_trace.add(TRACE_TX, data)
             if msg_info.wait_nak:
-                _LOGGER.debug('Waiting for ACK or NAK message')
+                if debug:
+                    _LOGGER.debug('Waiting for ACK or NAK message')
                 is_sent = yield from self._wait_ack_nak(msg_info.msg)
             else:
                 is_sent = True
@@ -454,11 +654,14 @@ class IM(Device, asyncio.Protocol):
         _LOGGER.debug("Starting: _get_first_all_link_record")
         _LOGGER.info('Requesting ALL-Link Records')
         if self.aldb.status == ALDBStatus.LOADED:
-            self._next_all_link_rec_nak_retries = 3
+            self._next_all_link_rec_nak_retries = ALL_LINK_NAK_RETRIES
             self._handle_get_next_all_link_record_nak(None)
             return
         self.aldb.clear()
         self._next_all_link_rec_nak_retries = 0
+        self._all_link_started = time.monotonic()
+        self._all_link_ended = None
+        self._all_link_stats['nak_retries'] = 0
         msg = GetFirstAllLinkRecord()
         self.send_msg(msg, wait_nak=True, wait_timeout=.5)
         _LOGGER.debug("Ending: _get_first_all_link_record")
@@ -467,6 +670,7 @@ class IM(Device, asyncio.Protocol):
         """Request next ALL-Link record."""
         _LOGGER.debug("Starting: _get_next_all_link_record")
         _LOGGER.debug("Requesting Next All-Link Record")
+        self._all_link_retry = None
         msg = GetNextAllLinkRecord()
         self.send_msg(msg, wait_nak=True, wait_timeout=.5)
         _LOGGER.debug("Ending: _get_next_all_link_record")
@@ -509,54 +713,18 @@ class IM(Device, asyncio.Protocol):
             template_x10_received,
             self._handle_x10_send_receive)
 
-    @asyncio.coroutine
-    def _peel_messages_from_buffer(self):
-        lastlooplen = 0
-        worktodo = True
-        buffer = bytearray()
-        while worktodo:
-            buffer.extend(self._unpack_buffer())
-            if len(buffer) < 2:
-                worktodo = False
-                break
-            _LOGGER.debug('Total buffer: %s', binascii.hexlify(buffer))
-            msg, buffer = insteonplm.messages.create(buffer)
-
-            if msg is not None:
-                # _LOGGER.debug('Msg buffer: %s', msg.hex)
-                self._recv_queue.appendleft(msg)
-
-            # _LOGGER.debug('Post buffer: %s', binascii.hexlify(buffer))
-            if len(buffer) < 2:
-                _LOGGER.debug('Buffer too short to have a message')
-                worktodo = False
-                break
-
-            if len(buffer) == lastlooplen:
-                _LOGGER.debug("Buffer size did not change wait for more data")
-                worktodo = False
-                break
-
-            lastlooplen = len(buffer)
-        if buffer:
-            buffer.extend(self._unpack_buffer())
-            self._buffer.put_nowait(buffer)
-
-        _LOGGER.debug('Messages in queue: %d', len(self._recv_queue))
-        worktodo = True
-        while worktodo:
-            try:
-                self._process_recv_queue()
-            except IndexError:
-                _LOGGER.debug('Last item in self._recv_queue reached.')
-                worktodo = False
-
-    def _process_recv_queue(self):
+    def _process_recv_queue(self, debug=False):
         msg = self._recv_queue.pop()
-        _LOGGER.debug('RX: %s', msg)
+        if debug:
+            _LOGGER.debug('RX: %s', msg)
         callbacks = self._message_callbacks.get_callbacks_from_message(msg)
         if hasattr(msg, 'isack') or hasattr(msg, 'isnak'):
             self._acknak_queue.put_nowait(msg)
+        self._inflight.message_received(msg)
+        if (self._direct_ack_pending is not None and
+                msg.code in [StandardReceive.code, ExtendedReceive.code] and
+                (msg.flags.isDirectACK or msg.flags.isDirectNAK)):
+            self._direct_ack_received(msg)
         if hasattr(msg, 'address'):
             device = self.devices[msg.address.hex]
             if device:
@@ -571,12 +739,6 @@ class IM(Device, asyncio.Protocol):
         for callback in callbacks:
             self._loop.call_soon(callback, msg)
 
-    def _unpack_buffer(self):
-        buffer = bytearray()
-        while not self._buffer.empty():
-            buffer.extend(self._buffer.get_nowait())
-        return buffer
-
     def _refresh_aldb(self):
         self.aldb.clear()
         self._load_all_link_database()
@@ -619,16 +781,55 @@ class IM(Device, asyncio.Protocol):
                 self, msg.address.hex, None, None, None)
             self._aldb_devices[msg.address.id] = unknowndevice
 
+        if self._all_link_retry is not None:
+            self._all_link_retry.cancel()
+        if self._next_all_link_rec_nak_retries:
+            # The modem was busy, wait longer after the next NAK
+            self._all_link_nak_backoff = min(ALL_LINK_NAK_BACKOFF_MAX,
+                                             self._all_link_nak_backoff * 2)
+        else:
+            self._all_link_nak_backoff = max(
+                ALL_LINK_NAK_BACKOFF_MIN,
+                self._all_link_nak_backoff * ALL_LINK_NAK_BACKOFF_DECAY)
         self._next_all_link_rec_nak_retries = 0
         self._get_next_all_link_record()
 
     def _handle_get_next_all_link_record_nak(self, msg):
-        # When the last All-Link record is reached the PLM sends a NAK
-        if self._next_all_link_rec_nak_retries < 3:
+        # When the last All-Link record is reached the PLM sends a NAK. A
+        # busy modem also sends a NAK so the first NAK after a record is
+        # retried after the adaptive busy wait. A repeated NAK is most likely
+        # the end of the list and is retried after a short fixed wait.
+        retries = self._next_all_link_rec_nak_retries
+        if retries < ALL_LINK_NAK_RETRIES:
+            if not retries:
+                self._all_link_ended = time.monotonic()
+                delay = self._all_link_nak_backoff
+            else:
+                delay = ALL_LINK_NAK_RETRY_WAIT
             self._next_all_link_rec_nak_retries += 1
-            self._get_next_all_link_record()
+            self._all_link_stats['nak_retries'] += 1
+            if self._all_link_retry is not None:
+                self._all_link_retry.cancel()
+            self._all_link_retry = self._loop.call_later(
+                delay, self._get_next_all_link_record)
             return
+        if self._all_link_retry is not None:
+            self._all_link_retry.cancel()
+            self._all_link_retry = None
         self._aldb.status = ALDBStatus.LOADED
+        if self._all_link_started is not None:
+            # The load ended at the first NAK after the last record
+            ended = self._all_link_ended or time.monotonic()
+            seconds = ended - self._all_link_started
+            self._all_link_started = None
+            self._all_link_ended = None
+            self._all_link_stats['records'] = len(self._aldb)
+            self._all_link_stats['seconds'] = seconds
+            self._all_link_stats['rate'] = (
+                len(self._aldb) / seconds if seconds else 0.0)
+            _LOGGER.info('Loaded %d All-Link records in %.1f s, '
+                         '%.1f records/s', len(self._aldb), seconds,
+                         self._all_link_stats['rate'])
         _LOGGER.debug('All-Link device records found in ALDB: %d',
                       len(self._aldb_devices))
 
@@ -724,15 +925,18 @@ class IM(Device, asyncio.Protocol):
         else:
             raise TypeError('Housecode must be a string')
         if x10_command_type(command) == X10CommandType.DIRECT:
+            # The unit stays addressed for the following commands. A preset
+            # dim command carries the level in place of the house code.
             if self._x10_address and self.devices[self._x10_address.id]:
-                if self._x10_address.x10_housecode == housecode:
+                if (self._x10_address.x10_housecode == housecode or
+                        command == X10_COMMAND_PRE_SET_DIM):
                     self.devices[self._x10_address.id].receive_message(msg)
         else:
             for addr in self.devices:
                 if self.devices[addr].address.is_x10:
                     if self.devices[addr].address.x10_housecode == housecode:
                         self.devices[addr].receive_message(msg)
-        self._x10_address = None
+            self._x10_address = None
 
 
 class PLM(IM):
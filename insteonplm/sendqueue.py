@@ -0,0 +1,210 @@
+"""Prioritized send queue for the Insteon Modem."""
+import asyncio
+from collections import deque
+import logging
+import time
+
+from insteonplm.constants import (
+    COMMAND_DEVICE_TEXT_STRING_REQUEST_0X03_0X02,
+    COMMAND_EXTENDED_READ_WRITE_ALDB_0X2F_0X00,
+    COMMAND_GET_INSTEON_ENGINE_VERSION_0X0D_0X00,
+    COMMAND_GET_OPERATING_FLAGS_0X1F_NONE,
+    COMMAND_ID_REQUEST_0X10_0X00,
+    COMMAND_LIGHT_INSTANT_CHANGE_0X21_NONE,
+    COMMAND_LIGHT_OFF_0X13_0X00,
+    COMMAND_LIGHT_OFF_FAST_0X14_0X00,
+    COMMAND_LIGHT_ON_0X11_NONE,
+    COMMAND_LIGHT_ON_FAST_0X12_NONE,
+    COMMAND_LIGHT_STATUS_REQUEST_0X19_0X00,
+    COMMAND_PING_0X0F_0X00,
+    COMMAND_PRODUCT_DATA_REQUEST_0X03_0X00,
+    MESSAGE_GET_FIRST_ALL_LINK_RECORD_0X69,
+    MESSAGE_GET_NEXT_ALL_LINK_RECORD_0X6A,
+    MESSAGE_MANAGE_ALL_LINK_RECORD_0X6F,
+    MESSAGE_SEND_STANDARD_MESSAGE_0X62)
+
+__all__ = ('SendQueue')
+_LOGGER = logging.getLogger(__name__)
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_STATUS = 1
+PRIORITY_BULK = 2
+LANE_NAMES = ('interactive', 'status', 'bulk')
+STARVATION_TIMEOUT = 10
+
+STATUS_COMMANDS = [COMMAND_LIGHT_STATUS_REQUEST_0X19_0X00['cmd1'],
+                   COMMAND_GET_OPERATING_FLAGS_0X1F_NONE['cmd1']]
+BULK_COMMANDS = [COMMAND_PRODUCT_DATA_REQUEST_0X03_0X00['cmd1'],
+                 COMMAND_DEVICE_TEXT_STRING_REQUEST_0X03_0X02['cmd1'],
+                 COMMAND_GET_INSTEON_ENGINE_VERSION_0X0D_0X00['cmd1'],
+                 COMMAND_PING_0X0F_0X00['cmd1'],
+                 COMMAND_ID_REQUEST_0X10_0X00['cmd1']]
+BULK_EXTENDED_COMMANDS = [COMMAND_EXTENDED_READ_WRITE_ALDB_0X2F_0X00['cmd1']]
+BULK_MESSAGES = [MESSAGE_GET_FIRST_ALL_LINK_RECORD_0X69,
+                 MESSAGE_GET_NEXT_ALL_LINK_RECORD_0X6A,
+                 MESSAGE_MANAGE_ALL_LINK_RECORD_0X6F]
+LEVEL_COMMANDS = [COMMAND_LIGHT_ON_0X11_NONE['cmd1'],
+                  COMMAND_LIGHT_ON_FAST_0X12_NONE['cmd1'],
+                  COMMAND_LIGHT_OFF_0X13_0X00['cmd1'],
+                  COMMAND_LIGHT_OFF_FAST_0X14_0X00['cmd1'],
+                  COMMAND_LIGHT_INSTANT_CHANGE_0X21_NONE['cmd1']]
+
+
+def message_priority(msg):
+    """Return the send priority of a message.
+
+    Status requests are sent after interactive commands and device
+    discovery and ALDB traffic is sent last.
+    """
+    if msg.code in BULK_MESSAGES:
+        return PRIORITY_BULK
+    if msg.code == MESSAGE_SEND_STANDARD_MESSAGE_0X62:
+        if msg.cmd1 in STATUS_COMMANDS:
+            return PRIORITY_STATUS
+        if msg.cmd1 in BULK_COMMANDS:
+            return PRIORITY_BULK
+        if msg.flags.isExtended and msg.cmd1 in BULK_EXTENDED_COMMANDS:
+            return PRIORITY_BULK
+    return PRIORITY_INTERACTIVE
+
+
+def coalesce_key(msg, callback=None):
+    """Return the key of queued messages a message supersedes.
+
+    On, off and instant change commands to the same device and group
+    replace each other so only the last one is sent. Identical status
+    requests with the same callback are only sent once. Other messages
+    return None and are never coalesced.
+    """
+    if (msg.code != MESSAGE_SEND_STANDARD_MESSAGE_0X62 or
+            not msg.flags.isDirect):
+        return None
+    if msg.cmd1 in STATUS_COMMANDS:
+        return ('status', msg.address.id, msg.cmd1, msg.cmd2,
+                _callback_key(callback))
+    if msg.cmd1 in LEVEL_COMMANDS:
+        group = 0x01
+        if msg.flags.isExtended:
+            group = msg.userdata['d1']
+        return ('level', msg.address.id, group)
+    return None
+
+
+def _callback_key(callback):
+    """Return a hashable key that identifies a callback.
+
+    Bound methods are identified by their instance and function so a new
+    bound method object for the same method gives the same key.
+    """
+    instance = getattr(callback, '__self__', callback)
+    return (id(instance), getattr(callback, '__func__', None))
+
+
+class SendQueue():
+    """Queue of messages to send with one FIFO lane per priority.
+
+    The highest priority lane with a message is served first. When the
+    oldest message of a lower priority lane has waited starvation_timeout
+    seconds it is served next so bulk traffic still makes progress. A lane
+    is promoted at most once every starvation_timeout seconds, so an old
+    backlog is not sent ahead of the interactive commands.
+
+    Items put with a coalesce key replace a queued item with the same key,
+    keeping its place in the queue.
+    """
+
+    def __init__(self, loop=None, starvation_timeout=STARVATION_TIMEOUT):
+        """Init the SendQueue class."""
+        self._loop = loop
+        self._starvation_timeout = starvation_timeout
+        self._lanes = [deque() for _ in LANE_NAMES]
+        self._keys = {}
+        self._promoted = [None for _ in LANE_NAMES]
+        self._not_empty = asyncio.Event(loop=loop)
+        self._stats = [{'queued': 0, 'sent': 0, 'promoted': 0,
+                        'coalesced': 0, 'max_wait': 0.0}
+                       for _ in LANE_NAMES]
+
+    def __len__(self):
+        """Return the number of messages in all lanes."""
+        return sum(len(lane) for lane in self._lanes)
+
+    def qsize(self):
+        """Return the number of messages in all lanes."""
+        return len(self)
+
+    def empty(self):
+        """Test if all lanes are empty."""
+        return not len(self)
+
+    @property
+    def coalesced(self):
+        """Return the number of items replaced by a later item."""
+        return sum(stats['coalesced'] for stats in self._stats)
+
+    def put_nowait(self, item, priority=PRIORITY_INTERACTIVE, key=None):
+        """Add an item to the end of a priority lane.
+
+        Returns False if the item replaced a queued item with the same key
+        instead of being added.
+        """
+        entry = self._keys.get(key) if key is not None else None
+        if entry is not None:
+            entry[1] = item
+            self._stats[entry[3]]['coalesced'] += 1
+            _LOGGER.debug('Coalesced queued message %s', key)
+            return False
+        entry = [time.monotonic(), item, key, priority]
+        if key is not None:
+            self._keys[key] = entry
+        self._lanes[priority].append(entry)
+        self._stats[priority]['queued'] += 1
+        self._not_empty.set()
+        return True
+
+    def get_nowait(self):
+        """Remove and return the next item to send."""
+        lane = self._next_lane()
+        if lane is None:
+            raise asyncio.QueueEmpty
+        queued, item, key, _ = self._lanes[lane].popleft()
+        if key is not None:
+            self._keys.pop(key)
+        stats = self._stats[lane]
+        stats['sent'] += 1
+        stats['max_wait'] = max(stats['max_wait'],
+                                time.monotonic() - queued)
+        return item
+
+    @asyncio.coroutine
+    def get(self):
+        """Wait for and return the next item to send."""
+        while self.empty():
+            self._not_empty.clear()
+            yield from self._not_empty.wait()
+        return self.get_nowait()
+
+    def stats(self):
+        """Return the depth and counters of each lane by lane name."""
+        lane_stats = {}
+        for lane, name in enumerate(LANE_NAMES):
+            lane_stats[name] = dict(self._stats[lane],
+                                    depth=len(self._lanes[lane]))
+        return lane_stats
+
+    def _next_lane(self):
+        ready = [lane for lane, items in enumerate(self._lanes) if items]
+        if not ready:
+            return None
+        now = time.monotonic()
+        for lane in ready[1:]:
+            promoted = self._promoted[lane]
+            if promoted is not None and (now - promoted <
+                                         self._starvation_timeout):
+                continue
+            if now - self._lanes[lane][0][0] >= self._starvation_timeout:
+                _LOGGER.debug('Serving starved %s lane', LANE_NAMES[lane])
+                self._promoted[lane] = now
+                self._stats[lane]['promoted'] += 1
+                return lane
+        return ready[0]
@@ -1,5 +1,6 @@
 """X10 states."""
 import logging
+import time
 
 from insteonplm.messages.x10send import X10Send
 from insteonplm.messages.x10received import X10Received
@@ -10,11 +11,24 @@ from insteonplm.constants import (X10_COMMAND_ALL_UNITS_OFF,
                                   X10_COMMAND_ON,
                                   X10_COMMAND_OFF,
                                   X10_COMMAND_DIM,
-                                  X10_COMMAND_BRIGHT)
+                                  X10_COMMAND_BRIGHT,
+                                  X10_COMMAND_PRE_SET_DIM,
+                                  MESSAGE_ACK)
 
 
 _LOGGER = logging.getLogger(__name__)
 
+# Wait in seconds after each command of a dim or bright sequence, about the
+# time an X10 command takes on the powerline
+X10_STEP_WAIT = 0.5
+
+# Preset dim levels from lowest to highest are sent in place of the house
+# code of the preset dim command
+X10_PRESET_DIM_HOUSECODES = 'MNOPCDABEFGHKLIJ'
+X10_LEVEL_COMMANDS = [X10_COMMAND_DIM,
+                      X10_COMMAND_BRIGHT,
+                      X10_COMMAND_PRE_SET_DIM]
+
 
 class X10OnOffSwitch(State):
     """On / Off state for an X10 device."""
@@ -84,15 +98,28 @@ class X10OnOffSwitch(State):
 
 
 class X10DimmableSwitch(X10OnOffSwitch):
-    """Dimmable X10 Switch."""
+    """Dimmable X10 Switch.
+
+    A level change addresses the unit once and sends the dim or bright
+    commands back to back. Modules that support preset dim are set with a
+    single preset dim command. The time from the level change to the ACK
+    of the last command is kept in level_change_time. The ACKs still due
+    for a level change that is replaced by a new one are skipped.
+    """
 
     def __init__(self, address, statename, group, send_message_method,
-                 message_callbacks, defaultvalue=0, dim_steps=22):
+                 message_callbacks, defaultvalue=0, dim_steps=22,
+                 preset_dim=False):
         """Init the Dimmable state."""
         super().__init__(address, statename, group, send_message_method,
                          message_callbacks, defaultvalue)
 
         self._steps = dim_steps
+        self._preset_dim = preset_dim
+        self._level_change_start = None
+        self._level_change_pending = 0
+        self._level_change_skip = 0
+        self._level_change_time = None
 
     @property
     def steps(self):
@@ -104,6 +131,21 @@ class X10DimmableSwitch(X10OnOffSwitch):
         """Set the number of steps from OFF to full ON."""
         self._steps = val
 
+    @property
+    def preset_dim(self):
+        """Return if the level is set with a preset dim command."""
+        return self._preset_dim
+
+    @preset_dim.setter
+    def preset_dim(self, val: bool):
+        """Set if the level is set with a preset dim command."""
+        self._preset_dim = val
+
+    @property
+    def level_change_time(self):
+        """Return the seconds the last level change took to send."""
+        return self._level_change_time
+
     def set_level(self, val):
         """Set the device ON LEVEL."""
         if val == 0:
@@ -116,23 +158,49 @@ class X10DimmableSwitch(X10OnOffSwitch):
                 setlevel = val * 255
             elif val <= 0xff:
                 setlevel = val
-            change = setlevel - self._value
-            increment = 255 / self._steps
-            steps = round(abs(change) / increment)
-            print('Steps: ', steps)
-            if change > 0:
-                method = self.brighten
-                self._value += round(steps * increment)
-                self._value = min(255, self._value)
+            if self._preset_dim:
+                self._set_preset_level(setlevel)
             else:
-                method = self.dim
-                self._value -= round(steps * increment)
-                self._value = max(0, self._value)
-            # pylint: disable=unused-variable
-            for step in range(0, steps):
-                method(True)
+                self._step_level(setlevel)
             self._update_subscribers(self._value)
 
+    def _step_level(self, setlevel):
+        change = setlevel - self._value
+        increment = 255 / self._steps
+        steps = round(abs(change) / increment)
+        if change > 0:
+            command = X10_COMMAND_BRIGHT
+            self._value += round(steps * increment)
+            self._value = min(255, self._value)
+        else:
+            command = X10_COMMAND_DIM
+            self._value -= round(steps * increment)
+            self._value = max(0, self._value)
+        self._send_level_commands(self.address.x10_housecode, command, steps)
+
+    def _set_preset_level(self, setlevel):
+        last_level = len(X10_PRESET_DIM_HOUSECODES) - 1
+        level = round(setlevel * last_level / 255)
+        self._value = round(level * 255 / last_level)
+        self._send_level_commands(X10_PRESET_DIM_HOUSECODES[level],
+                                  X10_COMMAND_PRE_SET_DIM, 1)
+
+    def _send_level_commands(self, housecode, command, count):
+        """Address the unit once and send the commands back to back."""
+        if not count:
+            return
+        # The commands of a previous level change are still sent first
+        self._level_change_skip += self._level_change_pending
+        self._level_change_start = time.monotonic()
+        self._level_change_pending = count
+        msg = X10Send.unit_code_msg(self.address.x10_housecode,
+                                    self.address.x10_unitcode)
+        self._send_method(msg)
+
+        msg = X10Send.command_msg(housecode, command)
+        for _ in range(count):
+            self._send_method(msg, False, X10_STEP_WAIT)
+
     def brighten(self, defer_update=False):
         """Brighten the device one step."""
         msg = X10Send.unit_code_msg(self.address.x10_housecode,
@@ -157,6 +225,20 @@ class X10DimmableSwitch(X10OnOffSwitch):
         if not defer_update:
             self._update_subscribers(self._value - 255 / self._steps)
 
+    def _level_command_ack_received(self, msg):
+        if (not self._level_change_pending or
+                msg.rawX10 & 0x0f not in X10_LEVEL_COMMANDS):
+            return
+        if self._level_change_skip:
+            self._level_change_skip -= 1
+            return
+        self._level_change_pending -= 1
+        if not self._level_change_pending:
+            self._level_change_time = (time.monotonic() -
+                                       self._level_change_start)
+            _LOGGER.debug('X10 device %s level changed in %.1f s',
+                          self.address.human, self._level_change_time)
+
     # pylint: disable=unused-argument
     def _dim_message_received(self, msg):
         val = max(self._value - (255 / self._steps), 0)
@@ -177,6 +259,9 @@ class X10DimmableSwitch(X10OnOffSwitch):
                                     self._dim_message_received)
         self._message_callbacks.add(bri_msg,
                                     self._bright_message_received)
+        ack_msg = X10Send(None, 0x80, MESSAGE_ACK)
+        self._message_callbacks.add(ack_msg,
+                                    self._level_command_ack_received)
 
 
 class X10OnOffSensor(State):
@@ -283,8 +283,10 @@ class Tools():
     @asyncio.coroutine
     def load_all_aldb(self, clear=True):
         """Read all devices ALDB."""
-        for addr in self.plm.devices:
-            yield from self.load_device_aldb(addr, clear)
+        yield from self.plm.aldb_loader.load(clear=clear)
+        _LOGGING.info('ALDB loaded for %d devices',
+                      self.plm.aldb_loader.stats['loaded'])
+        self.print_all_aldb()
 
     @asyncio.coroutine
     def write_aldb(self, addr, mem_addr: int, mode: str, group: int, target,
@@ -895,11 +897,12 @@ class Commander():
 
         The working directory is used to load and save known devices
         to improve startup times. During startup the application
-        loads and saves a file `insteon_plm_device_info.dat`. This file
-        is saved in the working directory.
+        loads and saves a file `insteon_plm_device_info.db`. This file
+        is saved in the working directory. Devices saved by earlier versions
+        in `insteon_plm_device_info.dat` are imported into the new file.
 
         The working directory has no default value. If the working directory is
-        not set, the `insteon_plm_device_info.dat` file is not loaded or saved.
+        not set, the `insteon_plm_device_info.db` file is not loaded or saved.
 
         Usage:
             set_workdir workdir
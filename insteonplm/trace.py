@@ -0,0 +1,54 @@
+"""Trace the frames sent to and received from the Insteon Modem."""
+import binascii
+from collections import deque
+import time
+
+__all__ = ('FrameTrace')
+FRAME_TRACE_SIZE = 256
+TRACE_RX = 'RX'
+TRACE_TX = 'TX'
+
+
+class FrameTrace():
+    """Ring buffer of the last frames sent to and received from the modem.
+
+    Each complete message received from the framer or written to the
+    modem is kept as raw bytes with the time and direction, so a read that
+    carries a partial message or several messages is traced as whole
+    frames. Frames are only formatted when the trace is dumped, so tracing
+    adds no formatting cost to the send and receive path. At most size
+    frames are kept.
+    """
+
+    def __init__(self, size=FRAME_TRACE_SIZE):
+        """Init the FrameTrace class."""
+        self._frames = deque(maxlen=size)
+
+    def __len__(self):
+        """Return the number of frames in the trace."""
+        return len(self._frames)
+
+    def __iter__(self):
+        """Iterate through the (time, direction, data) frames, oldest first."""
+        return iter(list(self._frames))
+
+    @property
+    def size(self):
+        """Return the maximum number of frames kept."""
+        return self._frames.maxlen
+
+    def add(self, direction, data):
+        """Add a frame received (RX) or sent (TX)."""
+        self._frames.append((time.monotonic(), direction, bytes(data)))
+
+    def clear(self):
+        """Remove all frames from the trace."""
+        self._frames.clear()
+
+    def dump(self):
+        """Return the frames as lines of time, direction and hex data."""
+        lines = []
+        for frame_time, direction, data in self._frames:
+            lines.append('{:.3f} {} {}'.format(
+                frame_time, direction, binascii.hexlify(data).decode()))
+        return lines
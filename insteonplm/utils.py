@@ -9,6 +9,13 @@ from insteonplm.constants import (HC_LOOKUP,
                                   X10CommandType)
 
 
+# Byte value to X10 code tables, the inverse of the lookups
+_BYTE_TO_HOUSECODE = {bytecode: housecode.upper()
+                      for housecode, bytecode in HC_LOOKUP.items()}
+_BYTE_TO_UNITCODE = {bytecode: unitcode
+                     for unitcode, bytecode in UC_LOOKUP.items()}
+
+
 def housecode_to_byte(housecode):
     """Return the byte value of an X10 housecode."""
     return HC_LOOKUP.get(housecode.lower())
@@ -21,13 +28,18 @@ def unitcode_to_byte(unitcode):
 
 def byte_to_housecode(bytecode):
     """Return an X10 housecode value from a byte value."""
-    hc = list(HC_LOOKUP.keys())[list(HC_LOOKUP.values()).index(bytecode)]
-    return hc.upper()
+    try:
+        return _BYTE_TO_HOUSECODE[bytecode]
+    except KeyError:
+        raise ValueError('Invalid X10 housecode byte: {}'.format(bytecode))
 
 
 def byte_to_unitcode(bytecode):
     """Return an X10 unitcode value from a byte value."""
-    return list(UC_LOOKUP.keys())[list(UC_LOOKUP.values()).index(bytecode)]
+    try:
+        return _BYTE_TO_UNITCODE[bytecode]
+    except KeyError:
+        raise ValueError('Invalid X10 unitcode byte: {}'.format(bytecode))
 
 
 def x10_command_type(command):
@@ -0,0 +1,72 @@
+"""Mock device answering All-Link Database reads."""
+import asyncio
+
+from insteonplm.address import Address
+from insteonplm.constants import COMMAND_EXTENDED_READ_WRITE_ALDB_0X2F_0X00
+from insteonplm.devices import ALDB
+from insteonplm.messages.extendedReceive import ExtendedReceive
+from insteonplm.messages.userdata import Userdata
+
+
+class MockALDBDevice():
+    """Simulated device answering ALDB read requests."""
+
+    def __init__(self, loop, address='1a2b3c', count=30, drop_all=(),
+                 drop_once=()):
+        """Init the MockALDBDevice class."""
+        self._loop = loop
+        self.address = Address(address)
+        self.id = self.address.id
+        self.aldb = ALDB(self.send_msg, loop, self.address)
+        self.records = {}
+        for index in range(count):
+            mem_addr = 0x0fff - index * 8
+            flags = 0x00 if index == count - 1 else 0xe2
+            self.records[mem_addr] = (flags, index)
+        self.drop_all = set(drop_all)
+        self.drop_once = set(drop_once)
+        self.requests = []
+        self.outstanding = 0
+        self.max_outstanding = 0
+
+    def read_aldb(self):
+        """Start reading the ALDB."""
+        asyncio.ensure_future(self.aldb.load(), loop=self._loop)
+
+    def sync_aldb(self):
+        """Start syncing the ALDB."""
+        asyncio.ensure_future(self.aldb.sync(), loop=self._loop)
+
+    def send_msg(self, msg, callback=None, on_timeout=False):
+        """Direct ACK a read request and send the requested records."""
+        mem_addr = msg.userdata['d3'] << 8 | msg.userdata['d4']
+        rec_count = msg.userdata['d5']
+        self.requests.append((mem_addr, rec_count))
+        self._loop.call_soon(callback, msg)
+        if not rec_count:
+            for mem in self.records:
+                if mem not in self.drop_all:
+                    self._loop.call_soon(self._send_record, mem, False)
+        else:
+            if mem_addr == 0x0000:
+                mem_addr = max(self.records)
+            self.outstanding += 1
+            self.max_outstanding = max(self.max_outstanding,
+                                       self.outstanding)
+            self._loop.call_later(.01, self._send_record, mem_addr, True)
+
+    def _send_record(self, mem_addr, outstanding):
+        if outstanding:
+            self.outstanding -= 1
+        if mem_addr in self.drop_once:
+            self.drop_once.remove(mem_addr)
+            return
+        flags, index = self.records.get(mem_addr, (0x00, 0))
+        userdata = Userdata({'d1': 0, 'd2': 0x01, 'd3': mem_addr >> 8,
+                             'd4': mem_addr & 0xff, 'd5': 0, 'd6': flags,
+                             'd7': 1, 'd8': 0x4d, 'd9': 0x5e,
+                             'd10': index, 'd11': 0xff, 'd12': 0x1c,
+                             'd13': 0x01})
+        self.aldb.record_received(ExtendedReceive(
+            self.address, '000000', COMMAND_EXTENDED_READ_WRITE_ALDB_0X2F_0X00,
+            userdata))
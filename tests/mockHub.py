@@ -0,0 +1,121 @@
+"""Mock Insteon Hub HTTP server for testing the Hub transport."""
+import asyncio
+import binascii
+import logging
+import time
+
+from aiohttp import web
+
+_LOGGER = logging.getLogger(__name__)
+BUFFER_SIZE = 100
+
+
+class MockHub():
+    """Local stand-in for the Insteon Hub HTTP interface.
+
+    The Hub keeps a 100 byte circular buffer of messages from the modem
+    served as hex text by buffstatus.xml. A write resets the buffer and
+    places the message and its ACK in the buffer. The next fail_writes
+    writes fail with a server error.
+    """
+
+    def __init__(self, loop, host='127.0.0.1'):
+        """Init the MockHub class."""
+        self._loop = loop
+        self._host = host
+        self._runner = None
+        self.port = None
+        self.buffer = bytearray(BUFFER_SIZE)
+        self.index = 0
+        self.reads = 0
+        self.writes = []
+        self.injected = []
+        self.fail_writes = 0
+        self.peers = set()
+
+    @asyncio.coroutine
+    def start(self):
+        """Start the Hub HTTP server on a free port."""
+        app = web.Application()
+        app.router.add_get('/buffstatus.xml', self._buffstatus)
+        app.router.add_post('/1', self._command)
+        app.router.add_post('/3', self._command)
+        self._runner = web.AppRunner(app)
+        yield from self._runner.setup()
+        site = web.TCPSite(self._runner, self._host, 0)
+        yield from site.start()
+        # pylint: disable=protected-access
+        self.port = site._server.sockets[0].getsockname()[1]
+
+    @asyncio.coroutine
+    def stop(self):
+        """Stop the Hub HTTP server."""
+        yield from self._runner.cleanup()
+
+    def clear(self):
+        """Reset the Hub buffer."""
+        self.buffer = bytearray(BUFFER_SIZE)
+        self.index = 0
+
+    def inject(self, data):
+        """Place a message from the modem in the Hub buffer."""
+        for byte in data:
+            self.buffer[self.index // 2] = byte
+            self.index = (self.index + 2) % (BUFFER_SIZE * 2)
+        self.injected.append((time.monotonic(), bytes(data)))
+
+    def buffstatus(self):
+        """Return the buffstatus.xml response text."""
+        return '\n<response><BS>{}{:02X}</BS></response>\n'.format(
+            binascii.hexlify(self.buffer).decode().upper(), self.index)
+
+    @asyncio.coroutine
+    def _buffstatus(self, request):
+        self.reads += 1
+        self.peers.add(request.transport.get_extra_info('peername'))
+        return web.Response(text=self.buffstatus())
+
+    @asyncio.coroutine
+    def _command(self, request):
+        self.peers.add(request.transport.get_extra_info('peername'))
+        if self.fail_writes:
+            self.fail_writes -= 1
+            return web.Response(status=503)
+        command = request.query_string
+        self.clear()
+        if command.endswith('=I=3'):
+            data = binascii.unhexlify(command[:-4])
+            self.writes.append((time.monotonic(), data))
+            self.inject(data + b'\x06')
+        return web.Response(text='')
+
+
+class MockHubProtocol():
+    """Protocol recording the data received from the Hub transport."""
+
+    def __init__(self, loop):
+        """Init the MockHubProtocol class."""
+        self._loop = loop
+        self.transport = None
+        self.received = []
+        self.connected = asyncio.Event(loop=loop)
+        self.data_event = asyncio.Event(loop=loop)
+
+    def connection_made(self, transport):
+        """Record the transport."""
+        self.transport = transport
+        self.connected.set()
+
+    def data_received(self, data):
+        """Record data received with the time it was received."""
+        self.received.append((time.monotonic(), data))
+        self.data_event.set()
+
+    def connection_lost(self, exc):
+        """Record the connection was lost."""
+        self.transport = None
+
+    @asyncio.coroutine
+    def pause_writing(self):
+        """Pause writing to the transport."""
+        yield from asyncio.sleep(0, loop=self._loop)
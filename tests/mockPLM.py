@@ -1,5 +1,7 @@
 """Mock PLM class for testing devices."""
 import logging
+from insteonplm.duplicates import DuplicateFilter
+from insteonplm.inflight import InFlightTracker
 from insteonplm.messagecallback import MessageCallback
 from insteonplm.linkedDevices import LinkedDevices
 
@@ -12,9 +14,12 @@ class MockPLM():
     def __init__(self, loop=None):
         """Init the MockPLM class."""
         self.sentmessage = ''
+        self.sentmessages = []
         self._message_callbacks = MessageCallback()
         self.loop = loop
         self.devices = LinkedDevices()
+        self.inflight = InFlightTracker(self.send_msg, loop)
+        self.duplicates = DuplicateFilter()
 
     @property
     def message_callbacks(self):
@@ -22,12 +27,14 @@ class MockPLM():
         return self._message_callbacks
 
     # pylint: disable=unused-argument
-    def send_msg(self, msg, wait_nak=True, wait_timeout=2):
+    def send_msg(self, msg, wait_nak=True, wait_timeout=2, priority=None):
         """Send a message mock routine."""
         self.sentmessage = msg.hex
+        self.sentmessages.append((msg, wait_timeout))
 
     def message_received(self, msg):
         """Fake a message being received by the PLM."""
+        self.inflight.message_received(msg)
         if hasattr(msg, 'address'):
             device = self.devices[msg.address.id]
             if device:
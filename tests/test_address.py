@@ -1,5 +1,15 @@
 """Test insteonplm Address type."""
+import logging
+import time
+
+import pytest
+
 from insteonplm.address import Address
+from insteonplm.constants import HC_LOOKUP, UC_LOOKUP
+from insteonplm.utils import (byte_to_housecode, byte_to_unitcode,
+                              housecode_to_byte, unitcode_to_byte)
+
+_LOGGER = logging.getLogger(__name__)
 
 
 def test_textstring():
@@ -62,3 +72,36 @@ def test_x10():
 
     addr2 = Address.x10('A', 20)
     assert addr2.human == 'X10.A.20'
+
+
+def test_x10_codes():
+    """Test the X10 code conversions in both directions."""
+    for housecode in HC_LOOKUP:
+        assert byte_to_housecode(housecode_to_byte(housecode)) == \
+            housecode.upper()
+    for unitcode in UC_LOOKUP:
+        assert byte_to_unitcode(unitcode_to_byte(unitcode)) == unitcode
+        addr = Address.x10('p', unitcode)
+        assert addr.id == 'x10P{:02d}'.format(unitcode)
+        assert addr.human == 'X10.P.{:02d}'.format(unitcode)
+        assert Address(addr.id) == addr
+    with pytest.raises(ValueError):
+        byte_to_housecode(0x10)
+    with pytest.raises(ValueError):
+        byte_to_unitcode(0x10)
+
+
+def test_x10_benchmark():
+    """Log the rate of X10 address conversions."""
+    addresses = [Address.x10(housecode, unitcode)
+                 for housecode in HC_LOOKUP for unitcode in range(1, 17)]
+    rounds = 50
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for addr in addresses:
+            # pylint: disable=pointless-statement
+            addr.id, addr.human, addr.x10_housecode, addr.x10_unitcode
+    rate = rounds * len(addresses) / (time.perf_counter() - start)
+    _LOGGER.info('X10 %d addresses: %.0f conversions/s',
+                 len(addresses), rate)
@@ -1,5 +1,16 @@
 """Test insteonplm.devices.ALDB class."""
-from insteonplm.devices import ControlFlags
+import asyncio
+import logging
+import time
+
+from insteonplm.address import Address
+import insteonplm.devices
+from insteonplm.devices import (ALDB, ALDB_READ_WINDOW, ALDBRecord,
+                                ALDBStatus, ControlFlags)
+
+from .mockALDBDevice import MockALDBDevice
+
+_LOGGER = logging.getLogger(__name__)
 
 
 def test_control_flags():
@@ -28,3 +39,183 @@ def test_control_flags():
     assert not cf.is_used_before
     assert cf.is_high_water_mark
     assert cf.byte == 0x00
+
+
+def _run_load(loop, aldb, coro):
+    loaded = asyncio.Event(loop=loop)
+    aldb.add_loaded_callback(loaded.set)
+    loop.run_until_complete(coro)
+    loop.run_until_complete(asyncio.wait_for(loaded.wait(), 5, loop=loop))
+
+
+def test_aldb_load_fills_missing_records(monkeypatch):
+    """Test records missed by a read all are read one at a time."""
+    monkeypatch.setattr(insteonplm.devices, 'ALDB_RECORD_TIMEOUT', .05)
+    loop = asyncio.get_event_loop()
+    device = MockALDBDevice(loop, drop_all=[0x0fff - 5 * 8, 0x0fff - 17 * 8])
+    progress = []
+    device.aldb.add_progress_callback(
+        lambda count, rate: progress.append((count, rate)))
+
+    _run_load(loop, device.aldb, device.aldb.load())
+
+    assert device.aldb.status == ALDBStatus.LOADED
+    assert len(device.aldb) == 30
+    assert device.requests == [(0x0000, 0), (0x0fff - 5 * 8, 1),
+                               (0x0fff - 17 * 8, 1)]
+    assert progress[-1][0] == 30
+    assert progress[-1][1] > 0
+
+
+def test_aldb_load_resumes_windowed(monkeypatch):
+    """Test an interrupted load reads only the missing records."""
+    monkeypatch.setattr(insteonplm.devices, 'ALDB_RECORD_TIMEOUT', .05)
+    loop = asyncio.get_event_loop()
+    device = MockALDBDevice(loop, drop_once=[0x0fff - 12 * 8])
+    device.aldb.load_saved_records(ALDBStatus.PARTIAL, {
+        mem_addr: {'control_flags': 0xe2, 'group': 1, 'address': '4d5e6f'}
+        for mem_addr in range(0x0fff, 0x0fff - 10 * 8, -8)})
+
+    _run_load(loop, device.aldb, device.aldb.load())
+
+    assert device.aldb.status == ALDBStatus.LOADED
+    assert len(device.aldb) == 30
+    assert device.max_outstanding == ALDB_READ_WINDOW
+    assert [mem_addr for mem_addr, _ in device.requests].count(
+        0x0fff - 12 * 8) == 2
+    # Reads sent before the high water mark record arrived may pass it
+    assert 21 <= len(device.requests) < 21 + ALDB_READ_WINDOW
+
+
+def _load_device(loop, device):
+    _run_load(loop, device.aldb, device.aldb.load())
+    device.requests.clear()
+
+
+def test_aldb_sync_unchanged(monkeypatch):
+    """Test a sync of an unchanged ALDB reads two records."""
+    monkeypatch.setattr(insteonplm.devices, 'ALDB_RECORD_TIMEOUT', .05)
+    loop = asyncio.get_event_loop()
+    device = MockALDBDevice(loop)
+    _load_device(loop, device)
+
+    _run_load(loop, device.aldb, device.aldb.sync())
+
+    assert device.aldb.status == ALDBStatus.LOADED
+    assert len(device.aldb) == 30
+    assert device.requests == [(0x0fff, 1), (0x0fff - 29 * 8, 1)]
+
+
+def test_aldb_sync_changed(monkeypatch):
+    """Test a sync reads new and written records only."""
+    monkeypatch.setattr(insteonplm.devices, 'ALDB_RECORD_TIMEOUT', .05)
+    loop = asyncio.get_event_loop()
+    device = MockALDBDevice(loop)
+    _load_device(loop, device)
+
+    # Records written by the modem and not confirmed
+    device.aldb._send_method = (  # pylint: disable=protected-access
+        lambda msg, callback=None, on_timeout=False: None)
+    device.aldb.del_record(0x0fff - 3 * 8)
+    device.aldb._send_method = device.send_msg  # pylint: disable=W0212
+    device.aldb.status = ALDBStatus.LOADED
+    assert device.aldb.dirty == {0x0fff - 3 * 8}
+
+    # Two records added by another controller
+    for index in range(29, 32):
+        device.records[0x0fff - index * 8] = (
+            0x00 if index == 31 else 0xe2, index)
+
+    _run_load(loop, device.aldb, device.aldb.sync())
+
+    assert device.aldb.status == ALDBStatus.LOADED
+    assert len(device.aldb) == 32
+    assert not device.aldb.dirty
+    read = [mem_addr for mem_addr, _ in device.requests]
+    assert read[:3] == [0x0fff, 0x0fff - 29 * 8, 0x0fff - 3 * 8]
+    assert {0x0fff - 30 * 8, 0x0fff - 31 * 8} <= set(read)
+    assert len(read) < 5 + ALDB_READ_WINDOW
+
+
+def test_aldb_sync_first_record_changed(monkeypatch):
+    """Test a sync reads all records when the first record changed."""
+    monkeypatch.setattr(insteonplm.devices, 'ALDB_RECORD_TIMEOUT', .05)
+    loop = asyncio.get_event_loop()
+    device = MockALDBDevice(loop, count=10)
+    _load_device(loop, device)
+    device.records[0x0fff] = (0xa2, 40)
+
+    _run_load(loop, device.aldb, device.aldb.sync())
+
+    assert device.aldb.status == ALDBStatus.LOADED
+    assert len(device.aldb) == 10
+    assert device.aldb[0x0fff].address.bytes[2] == 40
+    assert len(device.requests) >= 10
+
+
+def _synthetic_aldb(count, first=0x3fff):
+    """Return a loaded ALDB with a deleted record every 97 records."""
+    aldb = ALDB(None, None, Address('1a2b3c'), mem_addr=first)
+    for index in range(count):
+        mem_addr = first - index * 8
+        if index == count - 1:
+            flags = 0x00
+        elif index % 97 == 50:
+            flags = 0x42
+        else:
+            flags = 0xe2 if index % 2 else 0xa2
+        aldb[mem_addr] = ALDBRecord(mem_addr, flags, index // 100,
+                                    '4d5e{:02x}'.format(index % 100),
+                                    0xff, 0x1c, 0x01)
+    aldb.status = ALDBStatus.LOADED
+    return aldb
+
+
+def test_aldb_indexes():
+    """Test the ALDB indexes follow records added and removed."""
+    aldb = _synthetic_aldb(10, 0x0fff)
+    assert list(aldb) == [0x0fff - index * 8 for index in range(10)]
+    assert aldb.high_water_mark == 0x0fff - 9 * 8
+    assert aldb.free_mem_addrs == [0x0fff - 9 * 8]
+    assert aldb.next_free_mem_addr() == 0x0fff - 9 * 8
+    rec = aldb.find_matching_link('r', 0, '4d5e03')
+    assert rec.mem_addr == 0x0fff - 3 * 8
+    assert aldb.find_matching_link('c', 0, '4d5e03') is None
+    assert aldb.find_records('4d5e04', 0) == [0x0fff - 4 * 8]
+
+    # Deleted records are reused first
+    aldb[0x0fff - 3 * 8] = ALDBRecord(0x0fff - 3 * 8, 0x42, 0, '4d5e03',
+                                      0, 0, 0)
+    assert aldb.find_records('4d5e03', 0, controller=True) == [
+        0x0fff - 3 * 8]
+    assert aldb.next_free_mem_addr() == 0x0fff - 3 * 8
+
+    aldb.pop(0x0fff - 3 * 8)
+    assert not aldb.find_records('4d5e03', 0)
+    assert aldb.next_free_mem_addr() is None
+    aldb.clear()
+    assert not list(aldb)
+    assert aldb.high_water_mark is None
+
+
+def test_aldb_index_benchmark():
+    """Log the rate of link lookups in a 1000 record ALDB."""
+    aldb = _synthetic_aldb(1000)
+    assert aldb.next_free_mem_addr() == 0x3fff - 50 * 8
+    assert len(aldb.free_mem_addrs) == 11
+
+    lookups = 10000
+    start = time.perf_counter()
+    for index in range(lookups):
+        rec_index = (index * 2 + 1) % 998
+        rec = aldb.find_matching_link(
+            'r', rec_index // 100, '4d5e{:02x}'.format(rec_index % 100))
+    lookup_rate = lookups / (time.perf_counter() - start)
+    assert rec.control_flags.is_controller
+
+    start = time.perf_counter()
+    for _ in range(lookups):
+        aldb.next_free_mem_addr()
+    free_rate = lookups / (time.perf_counter() - start)
+    _LOGGER.info('ALDB 1000 records: %.0f link lookups/s, '
+                 '%.0f free record lookups/s', lookup_rate, free_rate)
@@ -0,0 +1,69 @@
+"""Test loading the ALDB of many devices with insteonplm.ALDBLoader."""
+import asyncio
+
+import insteonplm.devices
+from insteonplm.aldbloader import ALDBLoader
+from insteonplm.devices import ALDBStatus
+
+from .mockALDBDevice import MockALDBDevice
+
+
+class MockDevices(dict):
+    """Linked devices recording the devices saved."""
+
+    def __init__(self):
+        """Init the MockDevices class."""
+        super().__init__()
+        self.saved = []
+
+    def __getitem__(self, address):
+        """Return the device or None."""
+        return self.get(address)
+
+    def save_device_info(self, address=None):
+        """Record the device saved."""
+        self.saved.append(address)
+
+
+def test_aldbloader_budget(monkeypatch):
+    """Test devices load concurrently within the budget."""
+    monkeypatch.setattr(insteonplm.devices, 'ALDB_RECORD_TIMEOUT', .05)
+    loop = asyncio.get_event_loop()
+    devices = MockDevices()
+    for index in range(10):
+        device = MockALDBDevice(loop, '1a2b{:02x}'.format(index), count=5,
+                                drop_all=[0x0fff - 8])
+        devices[device.id] = device
+    partial_device = devices['1a2b07']
+    partial_device.aldb.load_saved_records(ALDBStatus.PARTIAL, {
+        0x0fff: {'control_flags': 0xe2, 'group': 1, 'address': '4d5e6f'}})
+    loaded_device = devices['1a2b00']
+    loaded_device.aldb.status = ALDBStatus.LOADED
+
+    loader = ALDBLoader(devices, loop, budget=3)
+    started = []
+    max_loading = 0
+
+    def send_msg(device, msg, callback=None, on_timeout=False):
+        nonlocal max_loading
+        if device.id not in started:
+            started.append(device.id)
+        max_loading = max(max_loading, loader.stats['loading'])
+        MockALDBDevice.send_msg(device, msg, callback, on_timeout)
+
+    for device in devices.values():
+        device.aldb._send_method = (  # pylint: disable=protected-access
+            lambda msg, cb=None, on_timeout=False, device=device:
+            send_msg(device, msg, cb, on_timeout))
+
+    loop.run_until_complete(asyncio.wait_for(loader.load(), 10, loop=loop))
+
+    assert max_loading == 3
+    assert started[0] == '1a2b07'
+    assert started[-1] == '1a2b00'
+    assert not loader
+    assert loader.stats['loaded'] == 10
+    for device in devices.values():
+        assert device.aldb.status == ALDBStatus.LOADED
+        assert len(device.aldb) == 5
+        assert device.id in devices.saved
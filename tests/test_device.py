@@ -6,7 +6,8 @@ from insteonplm.constants import (COMMAND_LIGHT_OFF_0X13_0X00,
                                   COMMAND_LIGHT_ON_0X11_NONE,
                                   MESSAGE_ACK)
 from insteonplm.messages.standardSend import StandardSend
-from insteonplm.devices import create, DIRECT_ACK_WAIT_TIMEOUT
+from insteonplm.devices import create
+from insteonplm.inflight import DIRECT_ACK_WAIT_TIMEOUT
 from insteonplm.devices.dimmableLightingControl import DimmableLightingControl
 from tests.mockPLM import MockPLM
 
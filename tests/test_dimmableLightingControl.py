@@ -367,3 +367,39 @@ def test_dimmableLightingControl_2475F_status():
             _LOGGING.error('Task: %s', task)
         if not task.done():
             loop.run_until_complete(task)
+
+
+def test_dimmableLightingControl_coalesce():
+    """Test queued level commands are replaced by the last command."""
+    @asyncio.coroutine
+    def run_test(loop):
+        """Asyncio test to run."""
+        plm = MockPLM(loop)
+        address = '1a2b3c'
+        target = '4d5e6f'
+        device = DimmableLightingControl(plm, address, 0x01, 0x04, None,
+                                         'SwitchLinc Dimmer (1000W)',
+                                         '2476DH')
+        plm.devices[device.address.hex] = device
+
+        device.states[0x01].on()
+        yield from asyncio.sleep(.1, loop=loop)
+        device.states[0x01].set_level(0x40)
+        device.states[0x01].off()
+        device.states[0x01].set_level(0x80)
+        assert plm.inflight.coalesced == 2
+
+        plm.message_received(StandardSend(
+            address, COMMAND_LIGHT_ON_0X11_NONE, cmd2=0xff,
+            acknak=MESSAGE_ACK))
+        yield from asyncio.sleep(.1, loop=loop)
+        plm.message_received(StandardReceive(
+            address, target, COMMAND_LIGHT_ON_0X11_NONE, cmd2=0xff,
+            flags=MessageFlags.create(
+                MESSAGE_TYPE_DIRECT_MESSAGE_ACK, 0, 2, 3)))
+        yield from asyncio.sleep(.1, loop=loop)
+        sentmsg = StandardSend(address, COMMAND_LIGHT_ON_0X11_NONE, cmd2=0x80)
+        assert plm.sentmessage == sentmsg.hex
+
+    loop = asyncio.get_event_loop()
+    loop.run_until_complete(run_test(loop))
@@ -0,0 +1,53 @@
+"""Test the duplicate All-Link message filter."""
+import time
+
+from insteonplm.constants import (COMMAND_LIGHT_ON_0X11_NONE,
+                                  MESSAGE_TYPE_ALL_LINK_BROADCAST,
+                                  MESSAGE_TYPE_ALL_LINK_CLEANUP,
+                                  MESSAGE_TYPE_DIRECT_MESSAGE)
+from insteonplm.duplicates import DuplicateFilter
+from insteonplm.messages.messageFlags import MessageFlags
+from insteonplm.messages.standardReceive import StandardReceive
+
+
+def test_duplicate_all_link_messages():
+    """Test copies of All-Link broadcast and cleanup messages are dropped."""
+    dup_filter = DuplicateFilter(window=.05)
+    broadcast = StandardReceive(
+        '1a2b3c', '000001', COMMAND_LIGHT_ON_0X11_NONE, cmd2=0xff,
+        flags=MessageFlags.create(MESSAGE_TYPE_ALL_LINK_BROADCAST, 0, 3, 3))
+    cleanup = StandardReceive(
+        '1a2b3c', '4d5e6f', COMMAND_LIGHT_ON_0X11_NONE, cmd2=0x01,
+        flags=MessageFlags.create(MESSAGE_TYPE_ALL_LINK_CLEANUP, 0, 3, 3))
+    other_group = StandardReceive(
+        '1a2b3c', '4d5e6f', COMMAND_LIGHT_ON_0X11_NONE, cmd2=0x02,
+        flags=MessageFlags.create(MESSAGE_TYPE_ALL_LINK_CLEANUP, 0, 3, 3))
+    direct = StandardReceive(
+        '1a2b3c', '4d5e6f', COMMAND_LIGHT_ON_0X11_NONE, cmd2=0xff,
+        flags=MessageFlags.create(MESSAGE_TYPE_DIRECT_MESSAGE, 0, 3, 3))
+
+    assert not dup_filter.is_duplicate(broadcast)
+    assert dup_filter.is_duplicate(broadcast)
+    assert dup_filter.is_duplicate(cleanup)
+    assert not dup_filter.is_duplicate(other_group)
+    assert not dup_filter.is_duplicate(direct)
+    assert not dup_filter.is_duplicate(direct)
+    assert dup_filter.dropped == 2
+    assert len(dup_filter) == 2
+
+    time.sleep(.06)
+    assert not dup_filter.is_duplicate(cleanup)
+    assert len(dup_filter) == 1
+
+
+def test_duplicate_filter_max_size():
+    """Test the oldest message is dropped when the filter is full."""
+    dup_filter = DuplicateFilter(max_size=2)
+    for group in [1, 2, 3]:
+        dup_filter.is_duplicate(StandardReceive(
+            '1a2b3c', '4d5e6f', COMMAND_LIGHT_ON_0X11_NONE, cmd2=group,
+            flags=MessageFlags.create(MESSAGE_TYPE_ALL_LINK_CLEANUP, 0, 3, 3)))
+    assert len(dup_filter) == 2
+    assert not dup_filter.is_duplicate(StandardReceive(
+        '1a2b3c', '4d5e6f', COMMAND_LIGHT_ON_0X11_NONE, cmd2=1,
+        flags=MessageFlags.create(MESSAGE_TYPE_ALL_LINK_CLEANUP, 0, 3, 3)))
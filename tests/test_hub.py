@@ -0,0 +1,110 @@
+"""Test the Insteon Hub HTTP transport against a local stand-in Hub."""
+import asyncio
+import logging
+
+import aiohttp
+
+from insteonplm import HUB_POLL_MAX, HttpTransport
+
+from .mockHub import MockHub, MockHubProtocol
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@asyncio.coroutine
+def _wait_for_data(protocol, loop, timeout=2):
+    protocol.data_event.clear()
+    yield from asyncio.wait_for(protocol.data_event.wait(), timeout,
+                                loop=loop)
+    return protocol.received[-1]
+
+
+@asyncio.coroutine
+def do_hub_poll_latency(loop):
+    """Measure the event to callback latency and the Hub request counts."""
+    hub = MockHub(loop)
+    yield from hub.start()
+    session = aiohttp.ClientSession(loop=loop)
+    protocol = MockHubProtocol(loop)
+    transport = HttpTransport(loop, protocol, session, '127.0.0.1', hub.port)
+    transport.resume_reading()
+    yield from asyncio.wait_for(protocol.connected.wait(), 2, loop=loop)
+
+    # Idle Hub: the poll interval backs off to the maximum
+    yield from asyncio.sleep(2, loop=loop)
+    idle_reads = hub.reads
+    assert transport.stats['poll_interval'] == HUB_POLL_MAX
+    assert idle_reads < 10
+
+    # An event after an idle period is seen within the maximum interval
+    hub.inject(b'\x02\x50\x1a\x2b\x3c\x4d\x5e\x6f\x20\x11\xff')
+    received, data = yield from _wait_for_data(protocol, loop)
+    idle_latency = received - hub.injected[-1][0]
+    assert data == hub.injected[-1][1]
+    assert idle_latency <= HUB_POLL_MAX + .2
+
+    # The reply to a write is seen at the fast poll interval
+    transport.write(b'\x02\x62\x1a\x2b\x3c\x00\x11\xff')
+    received, data = yield from _wait_for_data(protocol, loop)
+    write_latency = received - hub.writes[-1][0]
+    assert data == b'\x02\x62\x1a\x2b\x3c\x00\x11\xff\x06'
+    assert write_latency < .3
+
+    # A reply following a received message is also seen quickly
+    hub.inject(b'\x02\x50\x1a\x2b\x3c\x4d\x5e\x6f\x20\x00\xff')
+    received, data = yield from _wait_for_data(protocol, loop)
+    event_latency = received - hub.injected[-1][0]
+    assert event_latency < .3
+
+    _LOGGER.info('Hub latency idle %.3f s, after write %.3f s, '
+                 'after event %.3f s; %d reads while idle',
+                 idle_latency, write_latency, event_latency, idle_reads)
+    transport.pause_reading()
+    yield from asyncio.sleep(.1, loop=loop)
+    yield from hub.stop()
+
+
+@asyncio.coroutine
+def do_hub_write_pipeline(loop):
+    """Send a burst of writes through the Hub write pipeline."""
+    hub = MockHub(loop)
+    yield from hub.start()
+    connector = aiohttp.TCPConnector(limit=2, loop=loop)
+    session = aiohttp.ClientSession(connector=connector, loop=loop)
+    protocol = MockHubProtocol(loop)
+    transport = HttpTransport(loop, protocol, session, '127.0.0.1', hub.port)
+    transport.resume_reading()
+    yield from asyncio.wait_for(protocol.connected.wait(), 2, loop=loop)
+
+    hub.fail_writes = 2
+    frames = [bytes([0x02, 0x62, 0x1a, 0x2b, 0x3c, 0x00, 0x11, level])
+              for level in range(20)]
+    for frame in frames:
+        transport.write(frame)
+    while len(hub.writes) < len(frames):
+        yield from asyncio.sleep(.05, loop=loop)
+
+    stats = transport.stats
+    assert [data for _, data in hub.writes] == frames
+    assert not session.closed
+    assert stats['write_retries'] == 2
+    assert stats['write_queue'] == 0
+    assert stats['write_latency']['count'] == len(frames) + 3
+    assert stats['read_latency']['count'] == stats['reads']
+    assert len(hub.peers) <= 2
+    _LOGGER.info('Hub writes: %s', stats['write_latency'])
+    transport.pause_reading()
+    yield from asyncio.sleep(.1, loop=loop)
+    yield from hub.stop()
+
+
+def test_hub_poll_latency():
+    """Test the Hub buffer is polled quickly after activity."""
+    loop = asyncio.get_event_loop()
+    loop.run_until_complete(do_hub_poll_latency(loop))
+
+
+def test_hub_write_pipeline():
+    """Test writes are sent in order and retried on a server error."""
+    loop = asyncio.get_event_loop()
+    loop.run_until_complete(do_hub_write_pipeline(loop))
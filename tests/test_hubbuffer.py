@@ -0,0 +1,108 @@
+"""Test the Insteon Hub buffer decoder."""
+import binascii
+import logging
+import random
+import time
+
+from insteonplm.hubbuffer import HubBuffer
+
+from .mockHub import MockHub
+
+_LOGGER = logging.getLogger(__name__)
+
+# Hub 2245 buffstatus.xml responses: an ON command with its ACK and the
+# direct ACK from the device, then a status reply wrapping the buffer end.
+HUB_CAPTURE_1 = (
+    '<response><BS>02621A2B3C0F11FF0602501A2B3C4D5E6F2B11FF' + '0' * 160 +
+    '28</BS></response>')
+HUB_CAPTURE_2 = (
+    '<response><BS>4D5E6F2B0080' + '0' * 176 + '02501A2B3C0C' +
+    '0C</BS></response>')
+# Hub 2242 buffer without an index, wrapping inside the first message
+HUB_V1_CAPTURE = (
+    '<response><BS>3C4D5E6F2B11FF02621A2B3C0F11FF0602501A2B</BS></response>')
+
+
+def test_hubbuffer_captured():
+    """Test decoding captured Hub buffers."""
+    hub_buffer = HubBuffer()
+    assert hub_buffer.decode(HUB_CAPTURE_1) == binascii.unhexlify(
+        '02621A2B3C0F11FF0602501A2B3C4D5E6F2B11FF')
+    assert hub_buffer.cursor == 20
+    assert hub_buffer.decode(HUB_CAPTURE_1) is None
+
+    hub_buffer.reset(94)
+    assert hub_buffer.decode(HUB_CAPTURE_2) == binascii.unhexlify(
+        '02501A2B3C0C4D5E6F2B0080')
+    assert hub_buffer.cursor == 6
+
+    # The buffer was reset since the last read so the high part is empty
+    hub_buffer.reset(40)
+    assert hub_buffer.decode(HUB_CAPTURE_1) == binascii.unhexlify(
+        '02621A2B3C0F11FF0602501A2B3C4D5E6F2B11FF')
+
+
+def test_hubbuffer_v1_captured():
+    """Test decoding a captured Hub buffer without an index."""
+    hub_buffer = HubBuffer()
+    assert hub_buffer.decode(HUB_V1_CAPTURE) == binascii.unhexlify(
+        '02621A2B3C0F11FF0602501A2B3C4D5E6F2B11FF')
+    assert hub_buffer.decode(HUB_V1_CAPTURE) is None
+
+
+def test_hubbuffer_invalid():
+    """Test invalid responses are ignored."""
+    hub_buffer = HubBuffer()
+    assert hub_buffer.decode('') is None
+    assert hub_buffer.decode('<response></response>') is None
+    assert hub_buffer.decode('<response><BS>0Z</BS></response>') is None
+    assert hub_buffer.decode(
+        '<response><BS>{}</BS></response>'.format('0' * 202)) is None
+    assert hub_buffer.decode(HUB_CAPTURE_1[:-20]) is None
+    assert hub_buffer.cursor == 0
+
+
+def test_hubbuffer_fuzz():
+    """Test random writes to the Hub buffer are decoded in order."""
+    rand = random.Random(2245)
+    hub = MockHub(None)
+    hub_buffer = HubBuffer()
+    sent = bytearray()
+    decoded = bytearray()
+    for _ in range(2000):
+        data = bytes(rand.randint(1, 255)
+                     for _ in range(rand.randint(1, 40)))
+        hub.inject(data)
+        sent.extend(data)
+        new_bytes = hub_buffer.decode(hub.buffstatus())
+        if new_bytes:
+            decoded.extend(new_bytes)
+        if rand.random() < .05:
+            hub.clear()
+            hub_buffer.reset()
+
+    assert decoded == sent
+
+    for _ in range(500):
+        html = hub.buffstatus()
+        cut = rand.randint(0, len(html))
+        garbled = html[:cut] + rand.choice(['', 'X', '</BS>', '<BS>'])
+        hub_buffer.decode(garbled + html[cut + 1:])
+
+
+def test_hubbuffer_benchmark():
+    """Log the rate of decoding Hub buffers."""
+    hub = MockHub(None)
+    hub_buffer = HubBuffer()
+    responses = []
+    for group in range(50):
+        hub.inject(bytes([0x02, 0x50, 0x1a, 0x2b, 0x3c, 0x00, 0x00,
+                          group + 1, 0xcb, 0x11, 0x00]))
+        responses.append(hub.buffstatus())
+
+    poll_count = 20000
+    start = time.perf_counter()
+    for index in range(poll_count):
+        hub_buffer.decode(responses[index % len(responses)])
+    rate = poll_count / (time.perf_counter() - start)
+    _LOGGER.info('Hub buffer decode: %.0f polls/s', rate)
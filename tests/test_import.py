@@ -0,0 +1,58 @@
+"""Test importing the package does not load the optional modules."""
+import logging
+import subprocess
+import sys
+
+_LOGGER = logging.getLogger(__name__)
+
+_LAZY_MODULES = ('aiohttp', 'serial', 'serial_asyncio',
+                 'insteonplm.devices.ipdb',
+                 'insteonplm.devices.dimmableLightingControl',
+                 'insteonplm.states.onOff')
+
+_IMPORT_SCRIPT = """
+import sys, time
+start = time.perf_counter()
+import insteonplm
+print(time.perf_counter() - start)
+print(' '.join(sorted(sys.modules)))
+"""
+
+
+def _import_insteonplm(*options):
+    """Import the package in a new interpreter."""
+    result = subprocess.run(
+        [sys.executable] + list(options) + ['-c', _IMPORT_SCRIPT],
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+        universal_newlines=True, check=True)
+    elapsed, modules = result.stdout.splitlines()
+    return float(elapsed), set(modules.split()), result.stderr
+
+
+def _cumulative_import_time(importtime, module):
+    """Return the cumulative import time of a module in seconds."""
+    for line in importtime.splitlines():
+        fields = [field.strip() for field in line.split('|')]
+        if len(fields) == 3 and fields[2] == module:
+            return int(fields[1]) / 1e6
+    return None
+
+
+def test_import_lazy_modules():
+    """Test the Hub, serial and device modules are not loaded on import."""
+    elapsed, modules, _stderr = _import_insteonplm()
+    for module in _LAZY_MODULES:
+        assert module not in modules
+    assert not [module for module in modules
+                if module.startswith('insteonplm.states.')]
+    _LOGGER.info('Import insteonplm: %.3f s', elapsed)
+
+
+def test_import_benchmark():
+    """Log the time to import the package."""
+    elapsed, _modules, stderr = _import_insteonplm('-X', 'importtime')
+    cumulative = _cumulative_import_time(stderr, 'insteonplm')
+    if cumulative is None:
+        # -X importtime is only supported from Python 3.7
+        cumulative = elapsed
+    _LOGGER.info('Import insteonplm: %.3f s', cumulative)
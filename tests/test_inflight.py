@@ -0,0 +1,77 @@
+"""Test the in-flight message tracker."""
+import asyncio
+
+from insteonplm.constants import (COMMAND_LIGHT_OFF_0X13_0X00,
+                                  COMMAND_LIGHT_ON_0X11_NONE,
+                                  COMMAND_LIGHT_STATUS_REQUEST_0X19_0X00,
+                                  MESSAGE_ACK,
+                                  MESSAGE_TYPE_DIRECT_MESSAGE_ACK)
+from insteonplm.inflight import InFlightTracker
+from insteonplm.messages.messageFlags import MessageFlags
+from insteonplm.messages.standardReceive import StandardReceive
+from insteonplm.messages.standardSend import StandardSend
+
+
+def test_inflight_direct_ack():
+    """Test the next message is sent after the direct ACK."""
+    loop = asyncio.get_event_loop()
+    sent = []
+    status_results = []
+    on_results = []
+    other_results = []
+    tracker = InFlightTracker(sent.append, loop)
+    msg_on = StandardSend('1a2b3c', COMMAND_LIGHT_ON_0X11_NONE, cmd2=0xff)
+    msg_status = StandardSend('1a2b3c',
+                              COMMAND_LIGHT_STATUS_REQUEST_0X19_0X00)
+    msg_other = StandardSend('4d5e6f', COMMAND_LIGHT_OFF_0X13_0X00)
+
+    tracker.send(msg_status, status_results.append)
+    tracker.send(msg_on, on_results.append)
+    tracker.send(msg_other, other_results.append)
+    assert sent == [msg_status, msg_other]
+    assert len(tracker) == 2
+    assert tracker.pending == 1
+
+    tracker.message_received(StandardSend(
+        '1a2b3c', COMMAND_LIGHT_STATUS_REQUEST_0X19_0X00, acknak=MESSAGE_ACK))
+    direct_ack = StandardReceive(
+        '1a2b3c', '4d5e6f', {'cmd1': 0x00, 'cmd2': 0xff},
+        flags=MessageFlags.create(MESSAGE_TYPE_DIRECT_MESSAGE_ACK, 0, 2, 3))
+    tracker.message_received(direct_ack)
+
+    assert status_results == [direct_ack]
+    assert sent == [msg_status, msg_other, msg_on]
+    assert tracker.pending == 0
+    assert '1a2b3c' in tracker
+
+    # Each direct ACK is delivered to the callback of its own device
+    tracker.message_received(StandardSend(
+        '4d5e6f', COMMAND_LIGHT_OFF_0X13_0X00, acknak=MESSAGE_ACK))
+    other_ack = StandardReceive(
+        '4d5e6f', '1a2b3c', {'cmd1': 0x13, 'cmd2': 0x00},
+        flags=MessageFlags.create(MESSAGE_TYPE_DIRECT_MESSAGE_ACK, 0, 2, 3))
+    tracker.message_received(other_ack)
+    assert other_results == [other_ack]
+    assert on_results == []
+
+
+def test_inflight_timeout():
+    """Test the callback is called with None when no direct ACK arrives."""
+    loop = asyncio.get_event_loop()
+    sent = []
+    results = []
+    tracker = InFlightTracker(sent.append, loop, timeout=.05)
+    msg_on = StandardSend('1a2b3c', COMMAND_LIGHT_ON_0X11_NONE, cmd2=0xff)
+    msg_off = StandardSend('4d5e6f', COMMAND_LIGHT_OFF_0X13_0X00)
+
+    tracker.send(msg_on, results.append, True)
+    tracker.send(msg_off, results.append)
+    for msg in [msg_on, msg_off]:
+        tracker.message_received(StandardSend(
+            msg.address, {'cmd1': msg.cmd1, 'cmd2': msg.cmd2},
+            acknak=MESSAGE_ACK))
+    loop.run_until_complete(asyncio.sleep(.1, loop=loop))
+
+    # Only the message with on_timeout set calls back on a timeout
+    assert results == [None]
+    assert not tracker
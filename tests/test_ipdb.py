@@ -0,0 +1,92 @@
+"""Test the INSTEON Product Database lookups."""
+import logging
+import time
+
+from insteonplm.devices.dimmableLightingControl import DimmableLightingControl
+from insteonplm.devices.ipdb import IPDB
+from insteonplm.devices.x10 import X10Dimmable
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _scan(ipdb, cat, subcat):
+    """Look up a product with a scan of the product list."""
+    device_product = None
+    for product in ipdb:
+        if cat == product.cat and subcat == product.subcat:
+            device_product = product
+    if not device_product:
+        for product in ipdb:
+            if cat == product.cat and product.subcat is None:
+                return product
+    return device_product
+
+
+def _keys(ipdb):
+    """Return the keys in the product list and keys not in the list."""
+    keys = [(product.cat, product.subcat) for product in ipdb]
+    keys.extend([(0x01, 0xfe), (0x02, 0xfe), (0x0e, 0x01), (0x42, 0x00)])
+    return keys
+
+
+def test_ipdb_lookup():
+    """Test the indexed lookups match a scan of the product list."""
+    ipdb = IPDB()
+    for cat, subcat in _keys(ipdb):
+        product = ipdb[[cat, subcat]]
+        expected = _scan(ipdb, cat, subcat)
+        if expected is None:
+            assert product.deviceclass is None
+            assert (product.cat, product.subcat) == (cat, subcat)
+        else:
+            assert product is expected
+
+    product = ipdb[[0x01, 0xfe]]
+    assert product.description == 'Generic Dimmable Lighting Control'
+    assert product.deviceclass == DimmableLightingControl
+    assert ipdb.x10('Dimmable').deviceclass == X10Dimmable
+    assert ipdb.x10('NoSuchFeature').deviceclass is None
+
+
+def test_ipdb_device_classes():
+    """Test every product names a device class that can be imported."""
+    ipdb = IPDB()
+    for product in ipdb:
+        if product[-1] is None:
+            assert product.deviceclass is None
+        else:
+            assert product.deviceclass.__name__ == product[-1]
+
+
+def test_ipdb_find():
+    """Test finding products by model number and product key."""
+    ipdb = IPDB()
+    products = ipdb.find_by_model('2477d')
+    assert products
+    assert all(product.model == '2477D' for product in products)
+    assert {product.subcat for product in products} == {0x20}
+    assert not ipdb.find_by_model('no such model')
+
+    products = ipdb.find_by_product_key(0x000022)
+    assert {product.model for product in products} == {'2443', '2992-222'}
+    assert not ipdb.find_by_product_key(0x123456)
+
+
+def test_ipdb_benchmark():
+    """Log the rate of product lookups over the full product table."""
+    ipdb = IPDB()
+    keys = _keys(ipdb)
+    rounds = 20
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for cat, subcat in keys:
+            ipdb[[cat, subcat]]  # pylint: disable=pointless-statement
+    index_rate = rounds * len(keys) / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for cat, subcat in keys:
+        _scan(ipdb, cat, subcat)
+    scan_rate = len(keys) / (time.perf_counter() - start)
+    _LOGGER.info('IPDB %d keys: %.0f lookups/s indexed, '
+                 '%.0f lookups/s by scan', len(keys), index_rate, scan_rate)
@@ -1,9 +1,43 @@
 """Test insteonplm LinkedDevices Class."""
+import asyncio
+import json
+import logging
+import time
+import tracemalloc
+
 from insteonplm.address import Address
-from insteonplm.linkedDevices import LinkedDevices
+from insteonplm.devicestore import (DEVICE_INFO_FILE, DEVICE_STORE_FILE,
+                                    DeviceInfoStore)
+from insteonplm.linkedDevices import LinkedDevices, SAVE_DEVICE_INFO_DELAY
 from insteonplm.devices.switchedLightingControl import SwitchedLightingControl
 from .mockPLM import MockPLM
 
+_LOGGER = logging.getLogger(__name__)
+
+
+def _synthetic_devices(count, records=10):
+    """Return device info for count dimmers with ALDB records."""
+    devices = []
+    for index in range(count):
+        addr = '{:06x}'.format(0x100000 + index)
+        aldb = {}
+        for rec in range(records):
+            mem = 0x0fff - rec * 8
+            aldb[mem] = {'memory': mem, 'control_flags': 0xe2, 'group': 1,
+                         'address': '4d5e6f', 'data1': 0xff, 'data2': 0x1c,
+                         'data3': 0x01}
+        devices.append({'address': addr, 'cat': 0x01, 'subcat': 0x20,
+                        'product_key': 0, 'aldb_status': 2, 'aldb': aldb})
+    return devices
+
+
+def _wait_aldb_loads(loop, linkedDevices):
+    """Wait for the saved ALDB records of fetched devices to load."""
+    # pylint: disable=protected-access
+    tasks = list(linkedDevices._aldb_load_tasks)
+    assert tasks
+    loop.run_until_complete(asyncio.wait(tasks, loop=loop))
+
 
 def test_create_device_from_category():
     """Test device created from cateogory."""
@@ -43,3 +77,145 @@ def test_create_device_from_category_generic_device():
     assert dev.subcat == subcat
     assert dev.description == description
     assert dev.model == model
+
+
+def test_save_device_info(tmpdir):
+    """Test a burst of new devices is written once and loaded again."""
+    loop = asyncio.get_event_loop()
+    plm = MockPLM(loop)
+    linkedDevices = LinkedDevices(loop, str(tmpdir))
+    writes = []
+    store_write = linkedDevices._store.write
+
+    def count_writes(devices):
+        """Count the writes to the device info store."""
+        writes.append(len(devices))
+        return store_write(devices)
+
+    linkedDevices._store.write = count_writes
+    for addr in ['1a2b3c', '2b3c4d', '3c4d5e']:
+        linkedDevices[addr] = linkedDevices.create_device_from_category(
+            plm, addr, 0x02, 0x13)
+        linkedDevices.save_device_info()
+    loop.run_until_complete(asyncio.sleep(SAVE_DEVICE_INFO_DELAY + .2))
+    assert writes == [3]
+
+    # Only the changed device is written again
+    linkedDevices.save_device_info('2b3c4d')
+    loop.run_until_complete(linkedDevices.flush_device_info())
+    assert writes == [3, 1]
+
+    savedDevices = LinkedDevices(loop, str(tmpdir))
+    loop.run_until_complete(savedDevices.load_saved_device_info())
+    assert sorted(savedDevices.saved_devices) == ['1a2b3c', '2b3c4d',
+                                                  '3c4d5e']
+    saved = savedDevices.saved_devices['1a2b3c']
+    assert saved['cat'] == 0x02
+    assert saved['subcat'] == 0x13
+
+
+def test_save_device_info_retry(tmpdir):
+    """Test devices are saved again after a failed write."""
+    loop = asyncio.get_event_loop()
+    plm = MockPLM(loop)
+    linkedDevices = LinkedDevices(loop, str(tmpdir))
+    writes = []
+    store_write = linkedDevices._store.write
+
+    def fail_first_write(devices):
+        """Fail the first write to the device info store."""
+        writes.append(len(devices))
+        if len(writes) == 1:
+            return False
+        return store_write(devices)
+
+    linkedDevices._store.write = fail_first_write
+    for addr in ['1a2b3c', '2b3c4d']:
+        linkedDevices[addr] = linkedDevices.create_device_from_category(
+            plm, addr, 0x02, 0x13)
+    loop.run_until_complete(linkedDevices.flush_device_info())
+    assert writes == [2]
+    loop.run_until_complete(asyncio.sleep(SAVE_DEVICE_INFO_DELAY + .2))
+    assert writes == [2, 2]
+
+    savedDevices = LinkedDevices(loop, str(tmpdir))
+    loop.run_until_complete(savedDevices.load_saved_device_info())
+    assert sorted(savedDevices.saved_devices) == ['1a2b3c', '2b3c4d']
+
+
+def test_load_legacy_device_info(tmpdir):
+    """Test device info saved in the JSON device info file is imported."""
+    loop = asyncio.get_event_loop()
+    tmpdir.join(DEVICE_INFO_FILE).write(json.dumps([
+        {'address': '1a2b3c', 'cat': 2, 'subcat': 19, 'product_key': 0,
+         'aldb_status': 2,
+         'aldb': {'4095': {'memory': 4095, 'control_flags': 0xe2,
+                           'group': 1, 'address': '4d5e6f', 'data1': 0,
+                           'data2': 0, 'data3': 0}}}]))
+    linkedDevices = LinkedDevices(loop, str(tmpdir))
+    loop.run_until_complete(linkedDevices.load_saved_device_info())
+    assert linkedDevices.saved_devices['1a2b3c']['aldb_status'] == 2
+    assert tmpdir.join(DEVICE_STORE_FILE).check()
+
+    linkedDevices.add_known_devices(MockPLM(loop))
+    device = linkedDevices['1a2b3c']
+    _wait_aldb_loads(loop, linkedDevices)
+    assert device.aldb[4095].address.id == '4d5e6f'
+
+
+def test_lazy_known_devices(tmpdir):
+    """Test saved devices are created on first access or in the background."""
+    loop = asyncio.get_event_loop()
+    DeviceInfoStore(str(tmpdir)).write(_synthetic_devices(120))
+    linkedDevices = LinkedDevices(loop, str(tmpdir))
+    new_devices = []
+    linkedDevices.add_device_callback(new_devices.append)
+    loop.run_until_complete(linkedDevices.load_saved_device_info())
+    linkedDevices.add_known_devices(MockPLM(loop))
+    assert len(linkedDevices) == 120
+    assert not new_devices
+
+    device = linkedDevices['100005']
+    assert new_devices == [device]
+    # The saved records are read from the store in an executor
+    assert not device.aldb
+    _wait_aldb_loads(loop, linkedDevices)
+    assert len(device.aldb) == 10
+    assert '100005' in list(linkedDevices)
+
+    loop.run_until_complete(linkedDevices._hydrate_task)
+    assert len(new_devices) == 120
+    assert len(linkedDevices) == 120
+    assert linkedDevices['100077'].aldb[0x0fff].address.id == '4d5e6f'
+
+
+def test_known_devices_startup_benchmark(tmpdir):
+    """Log the startup time and peak memory of loading saved devices."""
+    loop = asyncio.get_event_loop()
+    for count in [50, 500, 5000]:
+        workdir = tmpdir.mkdir('devices{}'.format(count))
+        DeviceInfoStore(str(workdir)).write(_synthetic_devices(count))
+        linkedDevices = LinkedDevices(loop, str(workdir))
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        loop.run_until_complete(linkedDevices.load_saved_device_info())
+        linkedDevices.add_known_devices(MockPLM(loop))
+        startup = time.perf_counter() - start
+        _, startup_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        assert len(linkedDevices) == count
+        _LOGGER.info('%d devices: startup %.3f s peak %.0f kB', count,
+                     startup, startup_peak / 1024)
+
+        # Creating every device is only measured for the smaller installs
+        task = linkedDevices._hydrate_task
+        if count > 500:
+            task.cancel()
+            loop.run_until_complete(asyncio.wait([task], loop=loop))
+            continue
+        start = time.perf_counter()
+        loop.run_until_complete(task)
+        _LOGGER.info('%d devices: background creation %.3f s', count,
+                     time.perf_counter() - start)
@@ -222,3 +222,199 @@ def test_leading_unknown_messge():
     assert isinstance(msg, StandardReceive)
     assert msg.cmd1 == 0x11
     assert msg.cmd2 == 0x01
+
+
+def test_message_framer_split_frames():
+    """Test the message framer with frames split across reads."""
+    framer = insteonplm.messages.MessageFramer()
+    rawmessage = bytearray([0x02, 0x50, 0x46, 0xd0, 0xe6, 0x43, 0x6c, 0x15,
+                            0x40, 0x11, 0x01,
+                            0x02, 0x62, 0x1a, 0x2b, 0x3c, 0x10, 0x7d, 0x8e,
+                            0x9f, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+                            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x06])
+
+    msgs = framer.feed(rawmessage[0:5])
+    assert msgs == []
+    assert len(framer) == 5
+
+    msgs = framer.feed(rawmessage[5:20])
+    assert len(msgs) == 1
+    assert isinstance(msgs[0], StandardReceive)
+    assert msgs[0].cmd1 == 0x11
+    assert len(framer) == 9
+
+    msgs = framer.feed(rawmessage[20:])
+    assert len(msgs) == 1
+    assert isinstance(msgs[0], ExtendedSend)
+    assert msgs[0].isack
+    assert not framer
+
+
+def test_message_framer_garbage():
+    """Test the message framer skips garbage and unknown messages."""
+    framer = insteonplm.messages.MessageFramer()
+    rawmessage = bytearray([0x15, 0x15, 0x02, 0x00, 0x15, 0x02, 0x50, 0x46,
+                            0xd0, 0xe6, 0x43, 0x6c, 0x15, 0x40, 0x11, 0x01,
+                            0x99])
+    msgs = framer.feed(rawmessage)
+    assert len(msgs) == 1
+    assert isinstance(msgs[0], StandardReceive)
+    assert msgs[0].cmd2 == 0x01
+    assert not framer
+
+
+def test_message_framer_benchmark():
+    """Compare framer throughput with repeated calls to create."""
+    import logging
+    import time
+    frame = bytes([0x02, 0x50, 0x46, 0xd0, 0xe6, 0x43, 0x6c, 0x15,
+                   0x40, 0x11, 0x01])
+    frame_count = 2000
+    backlog = frame * frame_count
+
+    start = time.perf_counter()
+    buffer = bytearray(backlog)
+    create_count = 0
+    while len(buffer) >= 2:
+        msg, buffer = insteonplm.messages.create(buffer)
+        create_count += 1
+    create_rate = frame_count / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    framer = insteonplm.messages.MessageFramer()
+    msgs = framer.feed(backlog)
+    framer_rate = frame_count / (time.perf_counter() - start)
+
+    logging.getLogger(__name__).info(
+        'create: %d frames/sec, framer: %d frames/sec',
+        create_rate, framer_rate)
+    assert create_count == frame_count
+    assert len(msgs) == frame_count
+    assert all(isinstance(framed, StandardReceive) and framed.cmd2 == 0x01
+               for framed in msgs)
+
+
+def test_register_msg_class():
+    """Test registering a message class for a new message code."""
+    # pylint: disable=too-few-public-methods
+    class TestMessage(ButtonEventReport):
+        """Test message using an unassigned message code."""
+
+        _code = 0x7f
+
+        @classmethod
+        def from_raw_message(cls, rawmessage):
+            """Create message from raw byte stream."""
+            return TestMessage(rawmessage[2])
+
+    rawmessage = bytearray([0x02, 0x7f, 0x03])
+    msg, buffer = insteonplm.messages.create(rawmessage)
+    assert msg is None
+
+    insteonplm.messages.register_msg_class(0x7f, TestMessage)
+    try:
+        assert insteonplm.messages.iscomplete(rawmessage)
+        msg, buffer = insteonplm.messages.create(rawmessage)
+        assert isinstance(msg, TestMessage)
+        assert msg.event == 0x03
+        assert not buffer
+    finally:
+        insteonplm.messages.register_msg_class(0x7f, None)
+
+    msg, buffer = insteonplm.messages.create(rawmessage)
+    assert msg is None
+
+
+def test_message_equality_and_hash():
+    """Test messages compare and hash by their structural key."""
+    msg1 = StandardSend('1a2b3c', {'cmd1': 0x11, 'cmd2': 0xff})
+    msg2 = StandardSend('1a2b3c', {'cmd1': 0x11, 'cmd2': 0xff})
+    msg3 = StandardSend('1a2b3c', {'cmd1': 0x13, 'cmd2': 0x00})
+
+    assert msg1 == msg2
+    assert hash(msg1) == hash(msg2)
+    assert msg1 != msg3
+    assert msg1 < msg3
+    assert msg3 > msg1
+    assert len({msg1, msg2, msg3}) == 2
+
+    # A template wildcard is not the same as a zero value
+    template = StandardSend.template(address='1a2b3c')
+    zero = StandardSend('1a2b3c', {'cmd1': 0x00, 'cmd2': 0x00}, flags=0x00)
+    assert template != zero
+
+
+def test_message_sort_with_template():
+    """Test a template sorts together with messages of the same class."""
+    template = StandardSend.template()
+    msg = StandardSend('1a2b3c', {'cmd1': 0x11, 'cmd2': 0xff})
+    assert template < msg
+    assert msg > template
+    assert sorted([msg, template]) == [template, msg]
+
+
+def test_message_bytes_cache_cleared_on_change():
+    """Test the cached bytes follow changes to the message."""
+    msg = ExtendedSend('1a2b3c', {'cmd1': 0x2e, 'cmd2': 0x00},
+                       {'d1': 0x01})
+    before = msg.bytes
+    msg.set_checksum()
+    assert msg.bytes != before
+    assert msg.bytes[-1] == msg.userdata['d14']
+    assert msg.hex == msg.bytes.hex()
+
+    msg.acknak = 0x06
+    assert msg.bytes[-1] == 0x06
+
+
+def test_lazy_receive_message_fields():
+    """Test fields decoded on demand match an eagerly built message."""
+    rawmessage = bytearray([0x02, 0x51, 0x01, 0x02, 0x03, 0x04, 0x05, 0x06,
+                            0x1f, 0x2e, 0x00, 0x11, 0x22, 0x33, 0x44, 0x55,
+                            0x66, 0x77, 0x88, 0x99, 0xaa, 0xbb, 0xcc, 0xdd,
+                            0xee])
+    msg = ExtendedReceive.from_raw_message(rawmessage)
+    eager = ExtendedReceive('010203', '040506',
+                            {'cmd1': 0x2e, 'cmd2': 0x00},
+                            rawmessage[11:25], flags=0x1f)
+
+    assert not hasattr(msg, '__dict__')
+    assert msg.bytes == bytes(rawmessage)
+    assert msg == eager
+    assert hash(msg) == hash(eager)
+    assert msg.flags.isExtended
+    assert msg.userdata['d14'] == 0xee
+
+
+def test_receive_message_memory_benchmark():
+    """Compare memory held by lazy and eagerly decoded receive messages."""
+    import logging
+    import tracemalloc
+    from insteonplm.messages.userdata import Userdata
+    frame = bytes([0x02, 0x51, 0x46, 0xd0, 0xe6, 0x43, 0x6c, 0x15, 0x10,
+                   0x2e, 0x00, 0x01, 0x02, 0x03, 0x04, 0x05, 0x06, 0x07,
+                   0x08, 0x09, 0x0a, 0x0b, 0x0c, 0x0d, 0x0e])
+    frame_count = 1000
+
+    tracemalloc.start()
+    try:
+        start = tracemalloc.get_traced_memory()[0]
+        lazy = [ExtendedReceive.from_raw_message(frame)
+                for _ in range(frame_count)]
+        lazy_size = tracemalloc.get_traced_memory()[0] - start
+
+        start = tracemalloc.get_traced_memory()[0]
+        eager = [ExtendedReceive(frame[2:5], frame[5:8],
+                                 {'cmd1': frame[9], 'cmd2': frame[10]},
+                                 Userdata.from_raw_message(frame[11:25]),
+                                 flags=frame[8])
+                 for _ in range(frame_count)]
+        eager_size = tracemalloc.get_traced_memory()[0] - start
+    finally:
+        tracemalloc.stop()
+
+    logging.getLogger(__name__).info(
+        'lazy: %d bytes/frame, eager: %d bytes/frame',
+        lazy_size / frame_count, eager_size / frame_count)
+    assert len(lazy) == len(eager) == frame_count
+    assert lazy_size < eager_size
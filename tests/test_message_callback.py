@@ -198,3 +198,68 @@ def test_extended_ack():
 
     assert result2 == [callbacks.callbackvalue2]
     assert result1 == [callbacks.callbackvalue1]
+
+
+def test_remove_callback_from_index():
+    """Test removed templates are no longer matched."""
+    callbacks = MessageCallback()
+    template = StandardReceive.template(
+        address='1a2b3c', commandtuple=COMMAND_LIGHT_ON_0X11_NONE)
+    callbacks.add(template, "callback 1")
+    callbacks.add(template, "callback 2")
+    msg = StandardReceive('1a2b3c', '4d5e6f', COMMAND_LIGHT_ON_0X11_NONE,
+                          cmd2=0xff)
+
+    callbacks.remove(template, "callback 1")
+    assert callbacks.get_callbacks_from_message(msg) == ["callback 2"]
+
+    callbacks.remove(template, None)
+    assert not callbacks.get_callbacks_from_message(msg)
+    assert not callbacks
+
+
+# pylint: disable=too-many-locals
+def test_messagecallback_benchmark():
+    """Compare indexed lookups with a linear scan of all templates."""
+    import time
+    from insteonplm.messages.messageFlags import MessageFlags
+
+    def linear_scan(callbacks, msg):
+        found = []
+        for key in callbacks:
+            if key.matches_pattern(msg) and msg.matches_pattern(key):
+                found.extend(callbacks[key])
+        return found
+
+    for template_count in [50, 500, 5000]:
+        callbacks = MessageCallback()
+        for num in range(template_count):
+            address = bytearray([0x1a, num >> 8, num & 0xff])
+            callbacks.add(StandardReceive.template(
+                address=address,
+                commandtuple={'cmd1': 0x11 + num % 12, 'cmd2': None},
+                flags=MessageFlags.template(messageType=num % 8)), num)
+        callbacks.add(StandardReceive.template(
+            commandtuple=COMMAND_LIGHT_ON_0X11_NONE), 'any')
+
+        msg = StandardReceive(bytearray([0x1a, 0x00, 0x0c]), '4d5e6f',
+                              COMMAND_LIGHT_ON_0X11_NONE, cmd2=0xff,
+                              flags=0x80)
+        assert callbacks.get_callbacks_from_message(msg) == [12, 'any']
+
+        start = time.perf_counter()
+        for _ in range(20):
+            linear = linear_scan(callbacks, msg)
+        linear_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(20):
+            indexed = callbacks.get_callbacks_from_message(msg)
+        indexed_time = time.perf_counter() - start
+
+        _LOGGER.info('%d templates: linear %.1f us, indexed %.1f us',
+                     template_count, linear_time / 20 * 1e6,
+                     indexed_time / 20 * 1e6)
+        assert indexed == linear
+        if template_count == 5000:
+            assert indexed_time < linear_time
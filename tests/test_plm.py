@@ -1,6 +1,7 @@
 """Test the INSTEON PLM device."""
 import asyncio
 import logging
+import time
 
 import insteonplm
 from insteonplm.constants import (COMMAND_LIGHT_ON_0X11_NONE,
@@ -11,15 +12,21 @@ from insteonplm.constants import (COMMAND_LIGHT_ON_0X11_NONE,
                                   MESSAGE_NAK,
                                   MESSAGE_ACK,
                                   X10_COMMAND_ON,
-                                  X10_COMMAND_OFF)
+                                  X10_COMMAND_OFF,
+                                  X10_COMMAND_PRE_SET_DIM)
 from insteonplm.address import Address
+from insteonplm.plm import (
+    ALL_LINK_NAK_BACKOFF_MAX, ALL_LINK_NAK_RETRIES, ALL_LINK_NAK_RETRY_WAIT,
+    SEND_GAP_MIN)
 from insteonplm.messages.standardSend import StandardSend
 from insteonplm.messages.standardReceive import StandardReceive
+from insteonplm.messages.sendAlllinkCommand import SendAllLinkCommand
 from insteonplm.messages.getIMInfo import GetImInfo
 from insteonplm.messages.getFirstAllLinkRecord import GetFirstAllLinkRecord
 from insteonplm.messages.getNextAllLinkRecord import GetNextAllLinkRecord
 from insteonplm.messages.allLinkRecordResponse import AllLinkRecordResponse
 from insteonplm.messages.x10received import X10Received
+from insteonplm.messages.x10send import X10Send
 
 from .mockConnection import MockConnection, wait_for_plm_command
 from .mockCallbacks import MockCallbacks
@@ -152,14 +159,13 @@ def do_plm(loop):
     _LOGGER.info('Testing device message ACK/NAK handling')
     _LOGGER.info('_______________________________________')
     plm.devices['4d5e6f'].states[0x01].on()
-    plm.devices['4d5e6f'].states[0x01].off()
-    plm.devices['4d5e6f'].states[0x01].set_level(0xbb)
 
     # Test that the first ON command is sent
     msg = StandardSend('4d5e6f', COMMAND_LIGHT_ON_0X11_NONE, cmd2=0xff)
     cmd_sent = yield from wait_for_plm_command(plm, msg, loop)
     if not cmd_sent:
         assert False
+    plm.devices['4d5e6f'].states[0x01].off()
 
     # ACK the ON command
     msg = StandardSend('4d5e6f', COMMAND_LIGHT_ON_0X11_NONE,
@@ -194,6 +200,7 @@ def do_plm(loop):
         assert False
 
     # ACK the OFF command and let the Direct ACK message expire
+    plm.devices['4d5e6f'].states[0x01].set_level(0xbb)
     msg = StandardSend('4d5e6f', COMMAND_LIGHT_OFF_0X13_0X00,
                        acknak=MESSAGE_ACK)
     plm.data_received(msg.bytes)
@@ -274,6 +281,26 @@ def do_plm_x10(loop):
     yield from asyncio.sleep(.1, loop=loop)
     assert cb.callbackvalue1 == 0x00
 
+    _LOGGER.info('Route a preset dim ACK to the addressed X10 device')
+    _LOGGER.info('__________________________________________________')
+    plm.add_x10_device('A', 3, 'Dimmable')
+    state = plm.devices[Address.x10('A', 3).id].states[0x01]
+    state.preset_dim = True
+    state.set_level(64)
+    yield from asyncio.sleep(.1, loop=loop)
+    unit_msg = X10Send.unit_code_msg('A', 3)
+    # pylint: disable=protected-access
+    plm._handle_x10_send_receive(
+        X10Send(unit_msg.rawX10, unit_msg.flag, MESSAGE_ACK))
+    yield from asyncio.sleep(.1, loop=loop)
+    # The preset dim level is carried in the house code nibble
+    preset_msg = X10Send.command_msg('C', X10_COMMAND_PRE_SET_DIM)
+    assert preset_msg.rawX10 >> 4 != unit_msg.rawX10 >> 4
+    plm._handle_x10_send_receive(
+        X10Send(preset_msg.rawX10, preset_msg.flag, MESSAGE_ACK))
+    yield from asyncio.sleep(.1, loop=loop)
+    assert state.level_change_time is not None
+
     yield from plm.close()
     _LOGGER.error('PLM closed in test_x10')
     yield from asyncio.sleep(0, loop=loop)
@@ -315,3 +342,163 @@ def test_plm_x10():
             _LOGGER.error('Task: %s', task)
         if not task.done():
             loop.run_until_complete(task)
+
+
+@asyncio.coroutine
+def do_plm_send_release(loop):
+    """Asyncio coroutine to test the send queue is released by direct ACK."""
+    conn = yield from MockConnection.create(loop=loop)
+    plm = conn.protocol
+    plm.transport = conn.transport
+    # pylint: disable=protected-access
+    plm._restart_writer = True
+    plm.restart_writing()
+
+    msg_on = StandardSend('4d5e6f', COMMAND_LIGHT_ON_0X11_NONE, cmd2=0xff)
+    msg_off = StandardSend('7a8b9c', COMMAND_LIGHT_OFF_0X13_0X00)
+    plm.send_msg(msg_on)
+    plm.send_msg(msg_off)
+    assert plm.send_queue_stats['queue_depth'] == 2
+
+    cmd_sent = yield from wait_for_plm_command(plm, msg_on, loop)
+    assert cmd_sent
+    msg = StandardSend('4d5e6f', COMMAND_LIGHT_ON_0X11_NONE, cmd2=0xff,
+                       acknak=MESSAGE_ACK)
+    plm.data_received(msg.bytes)
+    yield from asyncio.sleep(RECV_MSG_WAIT, loop=loop)
+
+    # Direct ACK with one hop used
+    start = loop.time()
+    msg = StandardReceive('4d5e6f', '1a2b3c', COMMAND_LIGHT_ON_0X11_NONE,
+                          cmd2=0xff, flags=0x2b)
+    plm.data_received(msg.bytes)
+    cmd_sent = yield from wait_for_plm_command(plm, msg_off, loop)
+    assert cmd_sent
+    assert loop.time() - start < 1
+
+    stats = plm.send_queue_stats
+    assert stats['queue_depth'] == 0
+    assert stats['sent'] == 2
+    assert stats['avg_hops'] > 0
+    assert stats['send_gap'] > 0.1
+
+    yield from plm.close()
+
+
+def test_plm_send_release():
+    """Test the next message is sent once the direct ACK is received."""
+    loop = asyncio.get_event_loop()
+    loop.run_until_complete(do_plm_send_release(loop))
+
+
+@asyncio.coroutine
+def do_plm_all_link_command_gap(loop):
+    """Asyncio coroutine to test the gap after an All-Link command."""
+    conn = yield from MockConnection.create(loop=loop)
+    plm = conn.protocol
+    plm.transport = conn.transport
+    # pylint: disable=protected-access
+    plm._restart_writer = True
+    plm.restart_writing()
+
+    written = []
+    write = conn.transport.write
+    sent = asyncio.Event(loop=loop)
+
+    def modem_write(data):
+        """Record the time each message is written."""
+        write(data)
+        written.append((data[1], loop.time()))
+        if data[1] == GetImInfo.code:
+            sent.set()
+
+    conn.transport.write = modem_write
+    plm.send_msg(SendAllLinkCommand(0x01, 0x11, 0x00), wait_nak=False)
+    plm.send_msg(GetImInfo())
+    yield from asyncio.wait_for(sent.wait(), 5, loop=loop)
+
+    # The All-Link broadcast is sent on the powerline
+    (_code, broadcast), (code, next_sent) = written
+    assert code == GetImInfo.code
+    assert next_sent - broadcast >= SEND_GAP_MIN
+    yield from plm.close()
+
+
+def test_plm_all_link_command_gap():
+    """Test an All-Link command is followed by the powerline send gap."""
+    loop = asyncio.get_event_loop()
+    loop.run_until_complete(do_plm_all_link_command_gap(loop))
+
+
+@asyncio.coroutine
+def do_plm_all_link_enumeration(loop, record_count, nak_backoff=None):
+    """Enumerate the modem ALDB from a simulated modem."""
+    conn = yield from MockConnection.create(loop=loop)
+    plm = conn.protocol
+    plm.transport = conn.transport
+    # pylint: disable=protected-access
+    plm._restart_writer = True
+    plm.restart_writing()
+    plm._poll_devices = False
+    if nak_backoff is not None:
+        plm._all_link_nak_backoff = nak_backoff
+
+    requests = []
+    write = conn.transport.write
+
+    def modem_write(data):
+        """Answer the All-Link record requests like a modem."""
+        write(data)
+        if data[1] not in [GetFirstAllLinkRecord.code,
+                           GetNextAllLinkRecord.code]:
+            return
+        requests.append(data[1])
+        msg_class = (GetFirstAllLinkRecord
+                     if data[1] == GetFirstAllLinkRecord.code
+                     else GetNextAllLinkRecord)
+        records = len(plm.aldb)
+        if records < record_count and len(requests) % 50 != 25:
+            loop.call_soon(plm.data_received, msg_class(MESSAGE_ACK).bytes)
+            msg = AllLinkRecordResponse(
+                flags=0xe2, group=records // 10,
+                address='4d5e{:02x}'.format(records % 10),
+                linkdata1=0x01, linkdata2=0x0b, linkdata3=0x50)
+            loop.call_soon(plm.data_received, msg.bytes)
+        else:
+            # The last record was read or the modem is busy
+            loop.call_soon(plm.data_received, msg_class(MESSAGE_NAK).bytes)
+
+    conn.transport.write = modem_write
+    loaded = asyncio.Event(loop=loop)
+    plm.add_all_link_done_callback(loaded.set)
+    started = time.monotonic()
+    plm._load_all_link_database()
+    yield from asyncio.wait_for(loaded.wait(), 20, loop=loop)
+    elapsed = time.monotonic() - started
+
+    stats = plm.all_link_load_stats
+    assert len(plm.aldb) == record_count
+    assert stats['records'] == record_count
+    assert stats['nak_retries'] >= ALL_LINK_NAK_RETRIES
+    _LOGGER.info('Modem ALDB enumeration: %d records at %.0f records/s, '
+                 '%d NAK retries', record_count, stats['rate'],
+                 stats['nak_retries'])
+    yield from plm.close()
+    return stats, elapsed
+
+
+def test_plm_all_link_enumeration():
+    """Test the modem ALDB is read without waiting between records."""
+    loop = asyncio.get_event_loop()
+    loop.run_until_complete(do_plm_all_link_enumeration(loop, 300))
+
+
+def test_plm_all_link_enumeration_end():
+    """Test the end of the modem ALDB is not counted in the load time."""
+    loop = asyncio.get_event_loop()
+    stats, elapsed = loop.run_until_complete(
+        do_plm_all_link_enumeration(loop, 10, ALL_LINK_NAK_BACKOFF_MAX))
+    # Only the first NAK after the last record waits the busy back-off
+    tail = elapsed - stats['seconds']
+    assert tail >= (ALL_LINK_NAK_RETRIES - 1) * ALL_LINK_NAK_RETRY_WAIT
+    assert tail < 2 * ALL_LINK_NAK_BACKOFF_MAX
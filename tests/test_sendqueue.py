@@ -0,0 +1,106 @@
+"""Test the Insteon Modem send queue."""
+import asyncio
+import time
+
+from insteonplm.constants import (COMMAND_ID_REQUEST_0X10_0X00,
+                                  COMMAND_LIGHT_OFF_0X13_0X00,
+                                  COMMAND_LIGHT_ON_0X11_NONE,
+                                  COMMAND_LIGHT_STATUS_REQUEST_0X19_0X00)
+from insteonplm.messages.getNextAllLinkRecord import GetNextAllLinkRecord
+from insteonplm.messages.standardSend import StandardSend
+from insteonplm.sendqueue import (SendQueue, coalesce_key, message_priority,
+                                  PRIORITY_BULK,
+                                  PRIORITY_INTERACTIVE,
+                                  PRIORITY_STATUS)
+
+
+def test_message_priority():
+    """Test messages are assigned to the expected lanes."""
+    msg_on = StandardSend('1a2b3c', COMMAND_LIGHT_ON_0X11_NONE, cmd2=0xff)
+    msg_status = StandardSend('1a2b3c',
+                              COMMAND_LIGHT_STATUS_REQUEST_0X19_0X00)
+    msg_id = StandardSend('1a2b3c', COMMAND_ID_REQUEST_0X10_0X00)
+
+    assert message_priority(msg_on) == PRIORITY_INTERACTIVE
+    assert message_priority(msg_status) == PRIORITY_STATUS
+    assert message_priority(msg_id) == PRIORITY_BULK
+    assert message_priority(GetNextAllLinkRecord()) == PRIORITY_BULK
+
+
+def test_send_queue_lanes():
+    """Test higher priority lanes are served first."""
+    loop = asyncio.get_event_loop()
+    queue = SendQueue(loop=loop)
+    queue.put_nowait('bulk 1', PRIORITY_BULK)
+    queue.put_nowait('status 1', PRIORITY_STATUS)
+    queue.put_nowait('bulk 2', PRIORITY_BULK)
+    queue.put_nowait('on 1', PRIORITY_INTERACTIVE)
+    queue.put_nowait('on 2')
+
+    items = [loop.run_until_complete(queue.get()) for _ in range(5)]
+
+    assert items == ['on 1', 'on 2', 'status 1', 'bulk 1', 'bulk 2']
+    assert queue.empty()
+    stats = queue.stats()
+    assert stats['bulk']['sent'] == 2
+    assert stats['interactive']['queued'] == 2
+    assert stats['status']['depth'] == 0
+
+
+def test_send_queue_starvation():
+    """Test a starved lower priority lane is served."""
+    loop = asyncio.get_event_loop()
+    queue = SendQueue(loop=loop, starvation_timeout=0)
+    queue.put_nowait('bulk 1', PRIORITY_BULK)
+    queue.put_nowait('on 1', PRIORITY_INTERACTIVE)
+
+    assert queue.get_nowait() == 'bulk 1'
+    assert queue.get_nowait() == 'on 1'
+    assert queue.stats()['bulk']['promoted'] == 1
+
+
+def test_send_queue_starved_backlog():
+    """Test an old backlog is not sent ahead of interactive commands."""
+    loop = asyncio.get_event_loop()
+    queue = SendQueue(loop=loop, starvation_timeout=.05)
+    for index in range(5):
+        queue.put_nowait('bulk {}'.format(index), PRIORITY_BULK)
+    time.sleep(.1)
+    for index in range(3):
+        queue.put_nowait('on {}'.format(index), PRIORITY_INTERACTIVE)
+
+    sent = [queue.get_nowait() for _ in range(8)]
+    assert sent[:4] == ['bulk 0', 'on 0', 'on 1', 'on 2']
+    assert queue.stats()['bulk']['promoted'] == 1
+
+
+def test_send_queue_get_waits():
+    """Test get waits for an item to be queued."""
+    loop = asyncio.get_event_loop()
+    queue = SendQueue(loop=loop)
+    loop.call_later(.05, queue.put_nowait, 'status 1', PRIORITY_STATUS)
+
+    assert loop.run_until_complete(queue.get()) == 'status 1'
+
+
+def test_send_queue_coalesce():
+    """Test superseded commands and repeated status requests coalesce."""
+    queue = SendQueue(loop=asyncio.get_event_loop())
+    msg_on = StandardSend('1a2b3c', COMMAND_LIGHT_ON_0X11_NONE, cmd2=0xff)
+    msg_off = StandardSend('1a2b3c', COMMAND_LIGHT_OFF_0X13_0X00)
+    msg_other = StandardSend('4d5e6f', COMMAND_LIGHT_OFF_0X13_0X00)
+    msg_status = StandardSend('1a2b3c',
+                              COMMAND_LIGHT_STATUS_REQUEST_0X19_0X00)
+
+    for msg in [msg_on, msg_status, msg_other, msg_off, msg_status]:
+        queue.put_nowait(msg, message_priority(msg), coalesce_key(msg))
+
+    assert queue.coalesced == 2
+    assert queue.get_nowait() is msg_off
+    assert queue.get_nowait() is msg_other
+    assert queue.get_nowait() is msg_status
+    assert queue.empty()
+
+    # A status request with a different callback is not a duplicate
+    assert coalesce_key(msg_status, 'callback 1') != coalesce_key(
+        msg_status, 'callback 2')
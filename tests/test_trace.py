@@ -0,0 +1,98 @@
+"""Test the modem frame trace and the cost of receive path logging."""
+import asyncio
+import logging
+import time
+
+from insteonplm.constants import (COMMAND_LIGHT_ON_0X11_NONE,
+                                  MESSAGE_FLAG_BROADCAST_0X80)
+from insteonplm.messages.standardReceive import StandardReceive
+from insteonplm.plm import PLM
+from insteonplm.trace import TRACE_RX, TRACE_TX, FrameTrace
+
+_LOGGER = logging.getLogger(__name__)
+_INSTEON_LOGGER = logging.getLogger('insteonplm')
+
+
+class _FormatHandler(logging.Handler):
+    """Handler formatting the records it is given and discarding them."""
+
+    def emit(self, record):
+        """Format the record."""
+        self.format(record)
+
+
+def test_frame_trace():
+    """Test the trace keeps the last frames in order."""
+    trace = FrameTrace(3)
+    for byte in range(5):
+        trace.add(TRACE_RX, bytearray([0x02, 0x50, byte]))
+    trace.add(TRACE_TX, b'\x02\x62')
+
+    assert len(trace) == 3
+    assert trace.size == 3
+    assert [(direction, data) for _, direction, data in trace] == [
+        (TRACE_RX, b'\x02\x50\x03'),
+        (TRACE_RX, b'\x02\x50\x04'),
+        (TRACE_TX, b'\x02\x62')]
+    assert trace.dump()[-1].endswith(' TX 0262')
+    trace.clear()
+    assert not trace
+
+
+def test_frame_trace_received_frames():
+    """Test the modem traces whole frames, not the chunks received."""
+    loop = asyncio.new_event_loop()
+    plm = PLM(loop=loop)
+    frame = StandardReceive('1a2b3c', '000001', COMMAND_LIGHT_ON_0X11_NONE,
+                            cmd2=0xff,
+                            flags=MESSAGE_FLAG_BROADCAST_0X80).bytes
+    trace = plm.start_frame_trace()
+    try:
+        plm.data_received(frame + frame[:4])
+        plm.data_received(frame[4:])
+    finally:
+        loop.close()
+
+    assert [(direction, data) for _, direction, data in trace] == [
+        (TRACE_RX, bytes(frame)), (TRACE_RX, bytes(frame))]
+
+
+def _receive_rate(plm, data, count):
+    """Return the frames per second passed through data_received."""
+    start = time.perf_counter()
+    for _ in range(count):
+        plm.data_received(data)
+    return count / (time.perf_counter() - start)
+
+
+def test_receive_logging_benchmark():
+    """Log the receive rate with debug logging off, on and frame trace."""
+    loop = asyncio.new_event_loop()
+    plm = PLM(loop=loop)
+    data = StandardReceive('1a2b3c', '000001', COMMAND_LIGHT_ON_0X11_NONE,
+                           cmd2=0xff,
+                           flags=MESSAGE_FLAG_BROADCAST_0X80).bytes
+    count = 2000
+    handler = _FormatHandler()
+    level = _INSTEON_LOGGER.level
+    _INSTEON_LOGGER.addHandler(handler)
+    try:
+        _INSTEON_LOGGER.setLevel(logging.INFO)
+        info_rate = _receive_rate(plm, data, count)
+        trace = plm.start_frame_trace()
+        trace_rate = _receive_rate(plm, data, count)
+        plm.stop_frame_trace()
+        _INSTEON_LOGGER.setLevel(logging.DEBUG)
+        debug_rate = _receive_rate(plm, data, count)
+    finally:
+        _INSTEON_LOGGER.removeHandler(handler)
+        _INSTEON_LOGGER.setLevel(level)
+        loop.close()
+
+    assert len(trace) == trace.size
+    assert all(direction == TRACE_RX and frame == data
+               for _, direction, frame in trace)
+    assert plm.frame_trace is None
+    _LOGGER.info('Receive: %.0f frames/s at INFO, %.0f frames/s with '
+                 'frame trace, %.0f frames/s at DEBUG',
+                 info_rate, trace_rate, debug_rate)
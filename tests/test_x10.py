@@ -12,6 +12,7 @@ from insteonplm.devices.x10 import (X10OnOff,
                                     X10AllLightsOn)
 from insteonplm.messages.x10send import X10Send
 from insteonplm.messages.x10received import X10Received
+from insteonplm.states.x10 import X10_STEP_WAIT
 from .mockCallbacks import MockCallbacks
 from .mockPLM import MockPLM
 
@@ -112,6 +113,88 @@ def test_dimmable():
             loop.run_until_complete(task)
 
 
+def test_dimmable_batched():
+    """Test X10 dim steps are sent after addressing the unit once."""
+    @asyncio.coroutine
+    def run_test(loop):
+        plm = MockPLM(loop)
+        cb = MockCallbacks()
+        device = X10Dimmable(plm, 'C', 9)
+        state = device.states[0x01]
+        state.register_updates(cb.callbackmethod1)
+        plm.devices[device.address.id] = device
+
+        state.set_level(128)
+        yield from asyncio.sleep(.1, loop=loop)
+        assert [msg.rawX10 for msg, _ in plm.sentmessages] == [0x27]
+        device.receive_message(X10Send(0x27, 0x00, 0x06))
+        yield from asyncio.sleep(.1, loop=loop)
+        commands = plm.sentmessages[1:]
+        assert len(commands) == 11
+        assert all(msg.rawX10 == 0x25 and msg.flag == 0x80 and
+                   wait_timeout == X10_STEP_WAIT
+                   for msg, wait_timeout in commands)
+        assert cb.callbackvalue1 == 128
+
+        assert state.level_change_time is None
+        for _ in commands:
+            device.receive_message(X10Send(0x25, 0x80, 0x06))
+        yield from asyncio.sleep(.1, loop=loop)
+        assert state.level_change_time is not None
+        _LOGGER.info('X10 level change: %d messages instead of %d',
+                     len(plm.sentmessages), 2 * len(commands))
+
+        # A preset dim module is set with one command
+        plm.sentmessages.clear()
+        state.preset_dim = True
+        state.set_level(64)
+        yield from asyncio.sleep(.1, loop=loop)
+        device.receive_message(X10Send(0x27, 0x00, 0x06))
+        yield from asyncio.sleep(.1, loop=loop)
+        assert [msg.rawX10 for msg, _ in plm.sentmessages] == [0x27, 0x2a]
+        assert cb.callbackvalue1 == 68
+
+    loop = asyncio.get_event_loop()
+    loop.run_until_complete(run_test(loop))
+
+
+def test_dimmable_level_change_replaced():
+    """Test the ACKs of a replaced level change are not counted."""
+    @asyncio.coroutine
+    def run_test(loop):
+        plm = MockPLM(loop)
+        device = X10Dimmable(plm, 'C', 9)
+        state = device.states[0x01]
+        plm.devices[device.address.id] = device
+
+        state.set_level(128)
+        yield from asyncio.sleep(.1, loop=loop)
+        device.receive_message(X10Send(0x27, 0x00, 0x06))
+        yield from asyncio.sleep(.1, loop=loop)
+        first = len(plm.sentmessages) - 1
+
+        # A second level change before the first one is acknowledged
+        state.set_level(64)
+        yield from asyncio.sleep(.1, loop=loop)
+        device.receive_message(X10Send(0x27, 0x00, 0x06))
+        yield from asyncio.sleep(.1, loop=loop)
+        second = len(plm.sentmessages) - first - 2
+        assert second > 0
+
+        for _ in range(first):
+            device.receive_message(X10Send(0x25, 0x80, 0x06))
+        yield from asyncio.sleep(.1, loop=loop)
+        assert state.level_change_time is None
+
+        for _ in range(second):
+            device.receive_message(X10Send(0x24, 0x80, 0x06))
+        yield from asyncio.sleep(.1, loop=loop)
+        assert state.level_change_time is not None
+
+    loop = asyncio.get_event_loop()
+    loop.run_until_complete(run_test(loop))
+
+
 def test_on_received():
     """Test X10 on message received."""
     @asyncio.coroutine